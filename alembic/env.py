@@ -7,7 +7,7 @@ from sqlalchemy import engine_from_config, pool
 
 from backend.app.core.config import get_settings
 from backend.app.db.base import Base
-from backend.app.models import anomaly_flag, cell_aggregate, event, h3_cell, risk_score, user
+from backend.app.models import analytics_run, anomaly_baseline, anomaly_flag, cell_aggregate, cell_weekly_rollup, event, gi_star_score, h3_cell, hotspot, ingest_batch, ingest_checkpoint, risk_forecast, risk_score, user
 
 config = context.config
 settings = get_settings()
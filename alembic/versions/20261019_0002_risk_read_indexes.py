@@ -0,0 +1,26 @@
+"""Risk read-path indexes on mv_daily_risk."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0002"
+down_revision: Union[str, Sequence[str], None] = "20260223_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Serve per-day top-N and score-keyset pagination from one index range scan."""
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_time_score
+        ON mv_daily_risk (time_bucket, risk_score DESC, h3_index DESC)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop risk read-path indexes."""
+    op.execute("DROP INDEX IF EXISTS idx_mv_daily_risk_time_score")
@@ -0,0 +1,40 @@
+"""Precomputed ranked hotspot table."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0003"
+down_revision: Union[str, Sequence[str], None] = "20261019_0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create per-day ranked hotspots materialized by the analytics pipeline."""
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS hotspots (
+            id BIGSERIAL PRIMARY KEY,
+            h3_index VARCHAR(32) NOT NULL,
+            time_bucket DATE NOT NULL,
+            rank INTEGER NOT NULL,
+            risk_score DOUBLE PRECISION NOT NULL,
+            risk_level risk_level NOT NULL,
+            growth_rate DOUBLE PRECISION NOT NULL,
+            anomaly_flagged BOOLEAN NOT NULL DEFAULT FALSE,
+            reasons TEXT[] NOT NULL,
+            geom GEOMETRY(Polygon, 4326) NOT NULL,
+            CONSTRAINT uq_hotspots_h3_time UNIQUE (h3_index, time_bucket),
+            CONSTRAINT fk_hotspots_h3 FOREIGN KEY (h3_index) REFERENCES h3_cells(h3_index)
+        );
+        """
+    )
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_hotspots_time_rank ON hotspots (time_bucket DESC, rank)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_hotspots_geom_gist ON hotspots USING GIST (geom)")
+
+
+def downgrade() -> None:
+    """Drop hotspot table."""
+    op.execute("DROP TABLE IF EXISTS hotspots")
@@ -0,0 +1,21 @@
+"""User token version for stateless JWT revocation."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0004"
+down_revision: Union[str, Sequence[str], None] = "20261019_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a per-user token version embedded in JWTs; bumping it revokes outstanding tokens."""
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0")
+
+
+def downgrade() -> None:
+    """Drop user token version."""
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS token_version")
@@ -0,0 +1,34 @@
+"""Checkpoints for resumable bulk event loads."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0005"
+down_revision: Union[str, Sequence[str], None] = "20261019_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Track the committed offset of each shard of a bulk load, written in the same transaction as its rows."""
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+            load_id VARCHAR(64) NOT NULL,
+            shard INTEGER NOT NULL,
+            committed_offset BIGINT NOT NULL,
+            inserted BIGINT NOT NULL DEFAULT 0,
+            rejected BIGINT NOT NULL DEFAULT 0,
+            completed BOOLEAN NOT NULL DEFAULT FALSE,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (load_id, shard)
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop bulk load checkpoints."""
+    op.execute("DROP TABLE IF EXISTS ingest_checkpoints")
@@ -0,0 +1,29 @@
+"""Idempotency keys on events."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0006"
+down_revision: Union[str, Sequence[str], None] = "20261019_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add an optional event key, unique per chunk together with the partitioning column."""
+    op.execute("ALTER TABLE events ADD COLUMN IF NOT EXISTS event_key VARCHAR(64)")
+    op.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_events_key
+        ON events (event_key, event_timestamp)
+        WHERE event_key IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop event keys."""
+    op.execute("DROP INDEX IF EXISTS uq_events_key")
+    op.execute("ALTER TABLE events DROP COLUMN IF EXISTS event_key")
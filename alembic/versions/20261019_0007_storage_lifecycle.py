@@ -0,0 +1,133 @@
+"""Compression, time partitioning and downsampling for events and derived tables."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0007"
+down_revision: Union[str, Sequence[str], None] = "20261019_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DERIVED_TABLES = ("cell_aggregates", "risk_scores", "anomaly_flags")
+
+
+def upgrade() -> None:
+    """Enable native compression and turn derived cell-day tables into monthly hypertables."""
+    op.execute(
+        """
+        ALTER TABLE events SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'event_type',
+            timescaledb.compress_orderby = 'event_timestamp DESC, id DESC'
+        )
+        """
+    )
+
+    for table in DERIVED_TABLES:
+        # Hypertable unique keys must include the partitioning column, so (h3_index, time_bucket)
+        # replaces the surrogate id; it also covers h3_index lookups, making that index redundant.
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_pkey")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS id")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS uq_{table}_h3_time")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT pk_{table} PRIMARY KEY (h3_index, time_bucket)")
+        op.execute(f"DROP INDEX IF EXISTS idx_{table}_h3_index")
+        op.execute(
+            f"""
+            SELECT create_hypertable(
+                '{table}',
+                by_range('time_bucket', INTERVAL '1 month'),
+                create_default_indexes => FALSE,
+                migrate_data => TRUE,
+                if_not_exists => TRUE
+            )
+            """
+        )
+        op.execute(
+            f"""
+            ALTER TABLE {table} SET (
+                timescaledb.compress,
+                timescaledb.compress_segmentby = '',
+                timescaledb.compress_orderby = 'h3_index, time_bucket DESC'
+            )
+            """
+        )
+
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cell_weekly_rollups (
+            h3_index VARCHAR(32) NOT NULL,
+            week_bucket DATE NOT NULL,
+            event_count BIGINT NOT NULL,
+            active_days INTEGER NOT NULL,
+            risk_score_sum DOUBLE PRECISION NOT NULL,
+            max_risk_score DOUBLE PRECISION NOT NULL,
+            flagged_days INTEGER NOT NULL,
+            CONSTRAINT pk_cell_weekly_rollups PRIMARY KEY (h3_index, week_bucket),
+            CONSTRAINT fk_cell_weekly_rollups_h3 FOREIGN KEY (h3_index) REFERENCES h3_cells(h3_index)
+        );
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_cell_weekly_rollups_week ON cell_weekly_rollups (week_bucket DESC)")
+
+
+def downgrade() -> None:
+    """Decompress and return derived tables to plain heap tables with surrogate ids."""
+    op.execute("DROP TABLE IF EXISTS cell_weekly_rollups")
+    op.execute("SELECT decompress_chunk(chunk, if_compressed => TRUE) FROM show_chunks('events') AS chunk")
+    op.execute("ALTER TABLE events SET (timescaledb.compress = FALSE)")
+
+    for table in DERIVED_TABLES:
+        # Hypertables cannot be converted back in place; copy rows into a fresh heap table.
+        op.execute(f"CREATE TABLE {table}_heap (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"INSERT INTO {table}_heap SELECT * FROM {table}")
+        op.execute(f"DROP TABLE {table} CASCADE")
+        op.execute(f"ALTER TABLE {table}_heap RENAME TO {table}")
+        op.execute(f"ALTER TABLE {table} ADD COLUMN id BIGSERIAL PRIMARY KEY")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT uq_{table}_h3_time UNIQUE (h3_index, time_bucket)")
+        op.execute(
+            f"""
+            ALTER TABLE {table} ADD CONSTRAINT fk_{table}_h3
+            FOREIGN KEY (h3_index) REFERENCES h3_cells(h3_index)
+            """
+        )
+        op.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_h3_index ON {table} (h3_index)")
+        op.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_time_bucket ON {table} (time_bucket DESC)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_risk_scores_level ON risk_scores (risk_level)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_anomaly_flags_flagged ON anomaly_flags (flagged)")
+
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_risk AS
+        SELECT
+            rs.h3_index,
+            rs.time_bucket,
+            rs.risk_score,
+            rs.risk_level,
+            ca.event_count,
+            ca.rolling_7d_avg,
+            ca.growth_rate,
+            COALESCE(af.flagged, false) AS flagged,
+            h3.geom
+        FROM risk_scores rs
+        JOIN cell_aggregates ca
+          ON ca.h3_index = rs.h3_index
+         AND ca.time_bucket = rs.time_bucket
+        JOIN h3_cells h3
+          ON h3.h3_index = rs.h3_index
+        LEFT JOIN anomaly_flags af
+          ON af.h3_index = rs.h3_index
+         AND af.time_bucket = rs.time_bucket;
+        """
+    )
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_daily_risk_h3_time ON mv_daily_risk (h3_index, time_bucket)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_geom_gist ON mv_daily_risk USING GIST (geom)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_time ON mv_daily_risk (time_bucket DESC)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_level ON mv_daily_risk (risk_level)")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_time_score
+        ON mv_daily_risk (time_bucket, risk_score DESC, h3_index DESC)
+        """
+    )
@@ -0,0 +1,97 @@
+"""Store H3 cell indexes as 64-bit integers instead of hex strings."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0008"
+down_revision: Union[str, Sequence[str], None] = "20261019_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HYPERTABLES = ("cell_aggregates", "risk_scores", "anomaly_flags")
+REFERENCING_TABLES = (*HYPERTABLES, "hotspots", "cell_weekly_rollups")
+
+# H3 cell ids are 15 hex digits with the reserved top bit clear, so they fit a signed BIGINT.
+TO_BIGINT = "('x' || lpad(h3_index, 16, '0'))::bit(64)::bigint"
+TO_HEX = "to_hex(h3_index)"
+
+
+def _create_daily_risk_view() -> None:
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_risk AS
+        SELECT
+            rs.h3_index,
+            rs.time_bucket,
+            rs.risk_score,
+            rs.risk_level,
+            ca.event_count,
+            ca.rolling_7d_avg,
+            ca.growth_rate,
+            COALESCE(af.flagged, false) AS flagged,
+            h3.geom
+        FROM risk_scores rs
+        JOIN cell_aggregates ca
+          ON ca.h3_index = rs.h3_index
+         AND ca.time_bucket = rs.time_bucket
+        JOIN h3_cells h3
+          ON h3.h3_index = rs.h3_index
+        LEFT JOIN anomaly_flags af
+          ON af.h3_index = rs.h3_index
+         AND af.time_bucket = rs.time_bucket;
+        """
+    )
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_daily_risk_h3_time ON mv_daily_risk (h3_index, time_bucket)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_geom_gist ON mv_daily_risk USING GIST (geom)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_time ON mv_daily_risk (time_bucket DESC)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_level ON mv_daily_risk (risk_level)")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_time_score
+        ON mv_daily_risk (time_bucket, risk_score DESC, h3_index DESC)
+        """
+    )
+
+
+def _convert(column_type: str, using: str) -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_daily_risk")
+    for table in REFERENCING_TABLES:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS fk_{table}_h3")
+
+    # Column types of compressed hypertables cannot change in place; decompress, convert, re-enable.
+    for table in HYPERTABLES:
+        op.execute(f"SELECT decompress_chunk(chunk, if_compressed => TRUE) FROM show_chunks('{table}') AS chunk")
+        op.execute(f"ALTER TABLE {table} SET (timescaledb.compress = FALSE)")
+    for table in ("h3_cells", *REFERENCING_TABLES):
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN h3_index TYPE {column_type} USING {using}")
+    for table in HYPERTABLES:
+        op.execute(
+            f"""
+            ALTER TABLE {table} SET (
+                timescaledb.compress,
+                timescaledb.compress_segmentby = '',
+                timescaledb.compress_orderby = 'h3_index, time_bucket DESC'
+            )
+            """
+        )
+
+    for table in REFERENCING_TABLES:
+        op.execute(
+            f"""
+            ALTER TABLE {table} ADD CONSTRAINT fk_{table}_h3
+            FOREIGN KEY (h3_index) REFERENCES h3_cells(h3_index)
+            """
+        )
+    _create_daily_risk_view()
+
+
+def upgrade() -> None:
+    """Convert h3_index to BIGINT on cells, derived tables, hotspots, rollups and mv_daily_risk."""
+    _convert("BIGINT", TO_BIGINT)
+
+
+def downgrade() -> None:
+    """Convert h3_index back to lowercase hex VARCHAR."""
+    _convert("VARCHAR(32)", TO_HEX)
@@ -0,0 +1,39 @@
+"""Persisted run records for the checkpointed analytics pipeline."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0009"
+down_revision: Union[str, Sequence[str], None] = "20261019_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Track each pipeline run's window and the stages committed so far, updated in each stage's transaction."""
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS analytics_runs (
+            id BIGSERIAL PRIMARY KEY,
+            start_datetime TIMESTAMPTZ NOT NULL,
+            end_datetime TIMESTAMPTZ NOT NULL,
+            resolution INTEGER NOT NULL,
+            status VARCHAR(16) NOT NULL DEFAULT 'pending',
+            completed_stages TEXT[] NOT NULL DEFAULT '{}',
+            row_counts JSONB NOT NULL DEFAULT '{}',
+            newly_flagged JSONB NOT NULL DEFAULT '[]',
+            last_error TEXT,
+            failed_attempts INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_analytics_runs_status ON analytics_runs (status, created_at DESC)")
+
+
+def downgrade() -> None:
+    """Drop analytics run records."""
+    op.execute("DROP TABLE IF EXISTS analytics_runs")
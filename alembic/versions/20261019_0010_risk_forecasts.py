@@ -0,0 +1,43 @@
+"""Short-horizon per-cell risk forecasts."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0010"
+down_revision: Union[str, Sequence[str], None] = "20261019_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store the latest projection per cell and target day, ranked for top-N reads."""
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS risk_forecasts (
+            h3_index BIGINT NOT NULL,
+            target_date DATE NOT NULL,
+            issued_on DATE NOT NULL,
+            horizon_days SMALLINT NOT NULL,
+            predicted_event_count DOUBLE PRECISION NOT NULL,
+            lower_event_count DOUBLE PRECISION NOT NULL,
+            upper_event_count DOUBLE PRECISION NOT NULL,
+            predicted_risk_score DOUBLE PRECISION NOT NULL,
+            predicted_risk_level risk_level NOT NULL,
+            CONSTRAINT pk_risk_forecasts PRIMARY KEY (h3_index, target_date),
+            CONSTRAINT fk_risk_forecasts_h3 FOREIGN KEY (h3_index) REFERENCES h3_cells(h3_index)
+        );
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_risk_forecasts_target_score
+        ON risk_forecasts (target_date, predicted_risk_score DESC, h3_index DESC)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop risk forecasts."""
+    op.execute("DROP TABLE IF EXISTS risk_forecasts")
@@ -0,0 +1,35 @@
+"""Getis-Ord Gi* scores per cell-day and on hotspots."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0011"
+down_revision: Union[str, Sequence[str], None] = "20261019_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store Gi* z-scores for active cell-days and carry them onto ranked hotspots."""
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS gi_star_scores (
+            h3_index BIGINT NOT NULL,
+            time_bucket DATE NOT NULL,
+            gi_zscore DOUBLE PRECISION NOT NULL,
+            neighbor_count SMALLINT NOT NULL,
+            CONSTRAINT pk_gi_star_scores PRIMARY KEY (h3_index, time_bucket),
+            CONSTRAINT fk_gi_star_scores_h3 FOREIGN KEY (h3_index) REFERENCES h3_cells(h3_index)
+        );
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_gi_star_scores_time_bucket ON gi_star_scores (time_bucket)")
+    op.execute("ALTER TABLE hotspots ADD COLUMN IF NOT EXISTS gi_zscore DOUBLE PRECISION")
+
+
+def downgrade() -> None:
+    """Drop Gi* scores."""
+    op.execute("ALTER TABLE hotspots DROP COLUMN IF EXISTS gi_zscore")
+    op.execute("DROP TABLE IF EXISTS gi_star_scores")
@@ -0,0 +1,137 @@
+"""Per-event-type dimension on derived cell-day tables, hotspots and mv_daily_risk."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0012"
+down_revision: Union[str, Sequence[str], None] = "20261019_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HYPERTABLES = ("cell_aggregates", "risk_scores", "anomaly_flags")
+# Existing rows count every event type, so they become the 'all' rollup.
+ALL_EVENT_TYPES = "all"
+# Events ingested with the now-reserved type keep their data under this name.
+RENAMED_ALL_EVENT_TYPE = "all_legacy"
+
+
+def _create_daily_risk_view(with_event_type: bool) -> None:
+    event_type_column = "rs.event_type," if with_event_type else ""
+    event_type_join = "AND {alias}.event_type = rs.event_type" if with_event_type else ""
+    op.execute(
+        f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_daily_risk AS
+        SELECT
+            rs.h3_index,
+            {event_type_column}
+            rs.time_bucket,
+            rs.risk_score,
+            rs.risk_level,
+            ca.event_count,
+            ca.rolling_7d_avg,
+            ca.growth_rate,
+            COALESCE(af.flagged, false) AS flagged,
+            h3.geom
+        FROM risk_scores rs
+        JOIN cell_aggregates ca
+          ON ca.h3_index = rs.h3_index
+         AND ca.time_bucket = rs.time_bucket
+         {event_type_join.format(alias="ca")}
+        JOIN h3_cells h3
+          ON h3.h3_index = rs.h3_index
+        LEFT JOIN anomaly_flags af
+          ON af.h3_index = rs.h3_index
+         AND af.time_bucket = rs.time_bucket
+         {event_type_join.format(alias="af")};
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_geom_gist ON mv_daily_risk USING GIST (geom)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_level ON mv_daily_risk (risk_level)")
+    if with_event_type:
+        op.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_daily_risk_h3_type_time
+            ON mv_daily_risk (h3_index, event_type, time_bucket)
+            """
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_type_time ON mv_daily_risk (event_type, time_bucket DESC)"
+        )
+        op.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_type_time_score
+            ON mv_daily_risk (event_type, time_bucket, risk_score DESC, h3_index DESC)
+            """
+        )
+    else:
+        op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_daily_risk_h3_time ON mv_daily_risk (h3_index, time_bucket)")
+        op.execute("CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_time ON mv_daily_risk (time_bucket DESC)")
+        op.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_mv_daily_risk_time_score
+            ON mv_daily_risk (time_bucket, risk_score DESC, h3_index DESC)
+            """
+        )
+
+
+def _rekey(key_columns: str, segmentby: str, drop_event_type: bool = False) -> None:
+    # Primary keys of compressed hypertables cannot change in place; decompress, rekey, re-enable.
+    for table in HYPERTABLES:
+        op.execute(f"SELECT decompress_chunk(chunk, if_compressed => TRUE) FROM show_chunks('{table}') AS chunk")
+        op.execute(f"ALTER TABLE {table} SET (timescaledb.compress = FALSE)")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS pk_{table}")
+        if drop_event_type:
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS event_type")
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT pk_{table} PRIMARY KEY ({key_columns})")
+        op.execute(
+            f"""
+            ALTER TABLE {table} SET (
+                timescaledb.compress,
+                timescaledb.compress_segmentby = '{segmentby}',
+                timescaledb.compress_orderby = 'h3_index, time_bucket DESC'
+            )
+            """
+        )
+
+
+def upgrade() -> None:
+    """Key derived rows, hotspots and the daily risk view by event type; existing rows are the 'all' rollup."""
+    op.execute(
+        f"UPDATE events SET event_type = '{RENAMED_ALL_EVENT_TYPE}' WHERE event_type = '{ALL_EVENT_TYPES}'"
+    )
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_daily_risk")
+    for table in (*HYPERTABLES, "hotspots"):
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS event_type VARCHAR(64) NOT NULL DEFAULT '{ALL_EVENT_TYPES}'"
+        )
+    # Few distinct event types, so segmenting compressed chunks by type keeps per-type reads selective.
+    _rekey("h3_index, event_type, time_bucket", "event_type")
+
+    op.execute("ALTER TABLE hotspots DROP CONSTRAINT IF EXISTS uq_hotspots_h3_time")
+    op.execute("ALTER TABLE hotspots ADD CONSTRAINT uq_hotspots_h3_type_time UNIQUE (h3_index, event_type, time_bucket)")
+    op.execute("DROP INDEX IF EXISTS uq_hotspots_time_rank")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_hotspots_type_time_rank ON hotspots (event_type, time_bucket DESC, rank)"
+    )
+    _create_daily_risk_view(with_event_type=True)
+
+
+def downgrade() -> None:
+    """Keep only the 'all' rollup and drop the event type dimension.
+
+    Renamed events keep their new type: it cannot be told apart from events ingested as it later.
+    """
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_daily_risk")
+    for table in (*HYPERTABLES, "hotspots"):
+        op.execute(f"DELETE FROM {table} WHERE event_type <> '{ALL_EVENT_TYPES}'")
+
+    op.execute("DROP INDEX IF EXISTS uq_hotspots_type_time_rank")
+    op.execute("ALTER TABLE hotspots DROP CONSTRAINT IF EXISTS uq_hotspots_h3_type_time")
+    op.execute("ALTER TABLE hotspots ADD CONSTRAINT uq_hotspots_h3_time UNIQUE (h3_index, time_bucket)")
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_hotspots_time_rank ON hotspots (time_bucket DESC, rank)")
+    op.execute("ALTER TABLE hotspots DROP COLUMN IF EXISTS event_type")
+
+    _rekey("h3_index, time_bucket", "", drop_event_type=True)
+    _create_daily_risk_view(with_event_type=False)
@@ -0,0 +1,40 @@
+"""Online per-series anomaly baselines and per-day baseline checkpoints."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0013"
+down_revision: Union[str, Sequence[str], None] = "20261019_0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Keep decayed Welford state per (cell, event type) and the state after each scored day."""
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS anomaly_baselines (
+            h3_index BIGINT NOT NULL,
+            event_type VARCHAR(64) NOT NULL,
+            through_bucket DATE NOT NULL,
+            weight DOUBLE PRECISION NOT NULL,
+            mean DOUBLE PRECISION NOT NULL,
+            m2 DOUBLE PRECISION NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            CONSTRAINT pk_anomaly_baselines PRIMARY KEY (h3_index, event_type),
+            CONSTRAINT fk_anomaly_baselines_h3 FOREIGN KEY (h3_index) REFERENCES h3_cells(h3_index)
+        );
+        """
+    )
+    # Nullable columns can be added to compressed hypertables in place; older rows have no checkpoint.
+    for column in ("baseline_weight", "baseline_mean", "baseline_m2"):
+        op.execute(f"ALTER TABLE anomaly_flags ADD COLUMN IF NOT EXISTS {column} DOUBLE PRECISION")
+
+
+def downgrade() -> None:
+    """Drop anomaly baselines and their checkpoints."""
+    for column in ("baseline_weight", "baseline_mean", "baseline_m2"):
+        op.execute(f"ALTER TABLE anomaly_flags DROP COLUMN IF EXISTS {column}")
+    op.execute("DROP TABLE IF EXISTS anomaly_baselines")
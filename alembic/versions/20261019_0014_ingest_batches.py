@@ -0,0 +1,31 @@
+"""Durable record of committed ingest batches awaiting an analytics run."""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0014"
+down_revision: Union[str, Sequence[str], None] = "20261019_0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Keep one row per committed ingest batch until the analytics scheduler has dispatched it."""
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_batches (
+            id BIGSERIAL PRIMARY KEY,
+            min_event_timestamp TIMESTAMPTZ NOT NULL,
+            max_event_timestamp TIMESTAMPTZ NOT NULL,
+            event_count INTEGER NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the ingest batch log."""
+    op.execute("DROP TABLE IF EXISTS ingest_batches")
@@ -0,0 +1,119 @@
+"""Online anomaly baselines: exponentially decayed Welford statistics per series.
+
+Each (cell, event type) series keeps a running weight, mean and M2 (weighted sum
+of squared deviations) through the last day folded into it. A new day is scored
+against that state and then folded in, so a daily run costs O(series touched)
+however much history the baseline covers. Days without a row are zero counts;
+a gap of ``g`` of them is merged in one closed-form step. With a per-day decay
+``d < 1`` older days lose weight geometrically, which makes the baseline a
+trailing one with an effective memory of ``1 / (1 - d)`` days.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+# Recursive and closed-form weights of the same days differ by rounding only.
+WEIGHT_TOLERANCE = 1e-9
+
+
+@dataclass
+class RunningStats:
+    """Decayed Welford state per series; ``through`` is the last folded day as days since the epoch."""
+
+    through: IntArray
+    weight: FloatArray
+    mean: FloatArray
+    m2: FloatArray
+
+    @classmethod
+    def empty(cls, size: int) -> RunningStats:
+        """State for ``size`` series with nothing folded in yet."""
+        return cls(
+            through=np.zeros(size, dtype=np.int64),
+            weight=np.zeros(size, dtype=np.float64),
+            mean=np.zeros(size, dtype=np.float64),
+            m2=np.zeros(size, dtype=np.float64),
+        )
+
+
+def decay_factor(half_life_days: float | None) -> float:
+    """Per-day weight multiplier for a baseline half-life; None weighs every day equally."""
+    return 1.0 if half_life_days is None else 0.5 ** (1.0 / half_life_days)
+
+
+def window_weight(days: IntArray | int, decay: float) -> FloatArray:
+    """Total weight of ``days`` consecutive days: ``1 + d + ... + d^(days - 1)``."""
+    counts: FloatArray = np.asarray(days, dtype=np.float64)
+    if decay == 1.0:
+        return counts
+    return np.asarray((1.0 - decay**counts) / (1.0 - decay), dtype=np.float64)
+
+
+def skip_zero_days(stats: RunningStats, rows: IntArray, gaps: IntArray, decay: float) -> None:
+    """Fold ``gaps`` zero-count days into each series in ``rows`` at once (Chan's merge with an all-zero batch)."""
+    carried = decay**gaps
+    prior = stats.weight[rows] * carried
+    added = window_weight(gaps, decay)
+    total = prior + added
+    mean = stats.mean[rows]
+    share = np.divide(prior * added, total, out=np.zeros_like(total), where=total > 0)
+    stats.m2[rows] = stats.m2[rows] * carried + mean**2 * share
+    stats.mean[rows] = np.divide(mean * prior, total, out=np.zeros_like(total), where=total > 0)
+    stats.weight[rows] = total
+
+
+def fold(stats: RunningStats, rows: IntArray, values: FloatArray, decay: float) -> None:
+    """Decay each series in ``rows`` by one day and add one observation (West's weighted update)."""
+    weight = stats.weight[rows] * decay + 1.0
+    delta = values - stats.mean[rows]
+    mean = stats.mean[rows] + delta / weight
+    stats.m2[rows] = stats.m2[rows] * decay + delta * (values - mean)
+    stats.mean[rows] = mean
+    stats.weight[rows] = weight
+
+
+def score_days(
+    stats: RunningStats,
+    series: IntArray,
+    days: IntArray,
+    values: FloatArray,
+    decay: float,
+    min_days: int,
+) -> tuple[FloatArray, RunningStats]:
+    """Score (series, day, value) rows against their series' baselines, folding each day in after scoring.
+
+    Days run in ascending order, and each step is one NumPy operation over the
+    series observed that day; a series has at most one row per day and its
+    state must end before its first row. A row scores 0 until its baseline
+    holds ``min_days`` days or when the baseline has no spread. ``stats`` is
+    updated in place; returns the z-scores and each row's state after its day.
+    """
+    zscores = np.zeros(values.size, dtype=np.float64)
+    after = RunningStats(
+        through=days.copy(), weight=np.empty_like(values), mean=np.empty_like(values), m2=np.empty_like(values)
+    )
+    min_weight = float(window_weight(min_days, decay)) - WEIGHT_TOLERANCE
+    order = np.argsort(days, kind="stable")
+    for chunk in np.split(order, np.flatnonzero(np.diff(days[order])) + 1):
+        if chunk.size == 0:
+            continue
+        rows = series[chunk]
+        day = days[chunk[0]]
+        gaps = np.where(stats.weight[rows] > 0, np.maximum(day - stats.through[rows] - 1, 0), 0)
+        skip_zero_days(stats, rows, gaps, decay)
+        weight = stats.weight[rows]
+        spread = np.sqrt(np.divide(stats.m2[rows], weight, out=np.zeros_like(weight), where=weight > 0))
+        ready = (weight >= min_weight) & (spread > 0)
+        zscores[chunk] = np.divide(values[chunk] - stats.mean[rows], spread, out=np.zeros_like(spread), where=ready)
+        fold(stats, rows, values[chunk], decay)
+        stats.through[rows] = day
+        after.weight[chunk] = stats.weight[rows]
+        after.mean[chunk] = stats.mean[rows]
+        after.m2[chunk] = stats.m2[rows]
+    return zscores, after
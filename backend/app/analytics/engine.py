@@ -1,54 +1,269 @@
-"""Spatial-temporal analytics pipeline. Computes H3 aggregates, risk scores, anomalies."""
+"""Spatial-temporal analytics pipeline. Computes H3 aggregates, risk scores, anomalies.
+
+Cells are handled as 64-bit H3 integers throughout, matching the BIGINT ``h3_index`` columns.
+"""
 
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import date, datetime
-from statistics import mean, pstdev
+from datetime import date, datetime, timedelta
+from typing import Any, cast
 
-import h3
+import numpy as np
+import numpy.typing as npt
+import psycopg
+from h3.api import basic_int as h3_int
 from shapely.geometry import Polygon
-from sqlalchemy import text
+from sqlalchemy import CursorResult, text
 from sqlalchemy.orm import Session
 
+from backend.app.analytics.baselines import RunningStats, decay_factor, score_days
+from backend.app.analytics.forecast import (
+    FloatMatrix,
+    dense_matrix,
+    forecast_cells,
+    normalize_scores,
+    risk_levels,
+)
+from backend.app.analytics.spatial_stats import gi_star
+from backend.app.models.event import ALL_EVENT_TYPES
+
+EVENTS_IN_WINDOW_SQL = text(
+    """
+    SELECT
+        id,
+        event_type,
+        date_trunc('day', event_timestamp)::date AS day_bucket,
+        ST_Y(geom::geometry) AS latitude,
+        ST_X(geom::geometry) AS longitude
+    FROM events
+    WHERE event_timestamp >= :start_dt
+      AND event_timestamp < :end_dt
+    """
+)
+CELL_COUNTS_IN_WINDOW_SQL = text(
+    """
+    SELECT h3_index, event_type, time_bucket, event_count
+    FROM cell_aggregates
+    WHERE time_bucket >= :start_date
+      AND time_bucket <= :end_date
+    ORDER BY h3_index, event_type, time_bucket
+    """
+)
+# Stored baselines of the window's series. A series already folded into the window is rewound
+# to its checkpoint on the last flagged day before the window (or restarted when there is none).
+ANOMALY_BASELINES_SQL = text(
+    """
+    SELECT
+        k.position,
+        b.through_bucket AS stored_through,
+        CASE WHEN b.through_bucket < :start_date THEN b.through_bucket ELSE f.time_bucket END AS through_bucket,
+        CASE WHEN b.through_bucket < :start_date THEN b.weight ELSE f.baseline_weight END AS weight,
+        CASE WHEN b.through_bucket < :start_date THEN b.mean ELSE f.baseline_mean END AS mean,
+        CASE WHEN b.through_bucket < :start_date THEN b.m2 ELSE f.baseline_m2 END AS m2
+    FROM unnest(CAST(:cells AS BIGINT[]), CAST(:event_types AS VARCHAR[])) WITH ORDINALITY
+        AS k (h3_index, event_type, position)
+    JOIN anomaly_baselines b
+      ON b.h3_index = k.h3_index
+     AND b.event_type = k.event_type
+    LEFT JOIN LATERAL (
+        SELECT time_bucket, baseline_weight, baseline_mean, baseline_m2
+        FROM anomaly_flags f
+        WHERE b.through_bucket >= :start_date
+          AND f.h3_index = k.h3_index
+          AND f.event_type = k.event_type
+          AND f.time_bucket < :start_date
+        ORDER BY f.time_bucket DESC
+        LIMIT 1
+    ) f ON TRUE
+    """
+)
+SERIES_COUNTS_SQL = text(
+    """
+    SELECT ca.h3_index, ca.event_type, ca.time_bucket, ca.event_count
+    FROM unnest(CAST(:cells AS BIGINT[]), CAST(:event_types AS VARCHAR[])) AS k (h3_index, event_type)
+    JOIN cell_aggregates ca
+      ON ca.h3_index = k.h3_index
+     AND ca.event_type = k.event_type
+    WHERE ca.time_bucket > :after_date
+      AND ca.time_bucket <= :end_date
+    """
+)
+UPSERT_ANOMALY_FLAGS_SQL = text(
+    """
+    INSERT INTO anomaly_flags (
+        h3_index, event_type, time_bucket, anomaly_score, flagged, baseline_weight, baseline_mean, baseline_m2
+    )
+    SELECT * FROM unnest(
+        CAST(:cells AS BIGINT[]), CAST(:event_types AS VARCHAR[]), CAST(:buckets AS DATE[]),
+        CAST(:scores AS DOUBLE PRECISION[]), CAST(:flagged AS BOOLEAN[]),
+        CAST(:weights AS DOUBLE PRECISION[]), CAST(:means AS DOUBLE PRECISION[]), CAST(:m2s AS DOUBLE PRECISION[])
+    )
+    ON CONFLICT (h3_index, event_type, time_bucket)
+    DO UPDATE SET
+        anomaly_score = EXCLUDED.anomaly_score,
+        flagged = EXCLUDED.flagged,
+        baseline_weight = EXCLUDED.baseline_weight,
+        baseline_mean = EXCLUDED.baseline_mean,
+        baseline_m2 = EXCLUDED.baseline_m2
+    """
+)
+UPSERT_ANOMALY_BASELINES_SQL = text(
+    """
+    INSERT INTO anomaly_baselines (h3_index, event_type, through_bucket, weight, mean, m2, updated_at)
+    SELECT *, NOW() FROM unnest(
+        CAST(:cells AS BIGINT[]), CAST(:event_types AS VARCHAR[]), CAST(:buckets AS DATE[]),
+        CAST(:weights AS DOUBLE PRECISION[]), CAST(:means AS DOUBLE PRECISION[]), CAST(:m2s AS DOUBLE PRECISION[])
+    )
+    ON CONFLICT (h3_index, event_type)
+    DO UPDATE SET
+        through_bucket = EXCLUDED.through_bucket,
+        weight = EXCLUDED.weight,
+        mean = EXCLUDED.mean,
+        m2 = EXCLUDED.m2,
+        updated_at = EXCLUDED.updated_at
+    """
+)
+# Per-type rows and the all-types rollup in one statement over the (cell, type, day) counts.
+# GROUPING() tells the rollup row apart; an event stored with the reserved type still counts
+# towards the rollup but gets no per-type row, which would collide with it on the conflict key.
+UPSERT_CELL_AGGREGATES_SQL = text(
+    """
+    INSERT INTO cell_aggregates (h3_index, event_type, time_bucket, event_count, rolling_7d_avg, growth_rate, created_at)
+    SELECT
+        h3_index,
+        CASE WHEN GROUPING(event_type) = 1 THEN :all_types ELSE event_type END,
+        time_bucket,
+        SUM(event_count),
+        0,
+        0,
+        NOW()
+    FROM unnest(
+        CAST(:cells AS BIGINT[]), CAST(:event_types AS VARCHAR[]), CAST(:buckets AS DATE[]), CAST(:counts AS INTEGER[])
+    ) AS grouped (h3_index, event_type, time_bucket, event_count)
+    GROUP BY GROUPING SETS ((h3_index, event_type, time_bucket), (h3_index, time_bucket))
+    HAVING GROUPING(event_type) = 1 OR event_type <> :all_types
+    ON CONFLICT (h3_index, event_type, time_bucket)
+    DO UPDATE SET event_count = EXCLUDED.event_count
+    """
+)
+
+# Fixed-width binary COPY rows: field count, then (length, value) for h3_index, day offset and event count.
+CELL_DAY_COUNTS_COPY_SQL = """
+    COPY (
+        SELECT h3_index, time_bucket - CAST(%(start_date)s AS DATE), event_count
+        FROM cell_aggregates
+        WHERE time_bucket BETWEEN %(start_date)s AND %(end_date)s
+          AND event_type = %(event_type)s
+    ) TO STDOUT (FORMAT BINARY)
+"""
+CELL_DAY_COUNT_ROW = np.dtype(
+    [
+        ("fields", ">i2"),
+        ("h3_length", ">i4"),
+        ("h3_index", ">i8"),
+        ("day_length", ">i4"),
+        ("day", ">i4"),
+        ("count_length", ">i4"),
+        ("event_count", ">i4"),
+    ]
+)
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + bytes(8)
+COPY_BINARY_TRAILER = b"\xff\xff"
+POSTGRES_EPOCH = date(2000, 1, 1)
+GI_STAR_ROW = np.dtype(
+    [
+        ("fields", ">i2"),
+        ("h3_length", ">i4"),
+        ("h3_index", ">i8"),
+        ("day_length", ">i4"),
+        ("time_bucket", ">i4"),
+        ("zscore_length", ">i4"),
+        ("gi_zscore", ">f8"),
+        ("neighbors_length", ">i4"),
+        ("neighbor_count", ">i2"),
+    ]
+)
+COPY_GI_STAR_SQL = "COPY gi_star_scores (h3_index, time_bucket, gi_zscore, neighbor_count) FROM STDIN (FORMAT BINARY)"
+RAW_SCORE_BOUNDS_SQL = text(
+    """
+    SELECT
+        COALESCE(MIN((event_count * 0.5) + (growth_rate * 0.3) + (rolling_7d_avg * 0.2)), 0) AS min_raw,
+        COALESCE(MAX((event_count * 0.5) + (growth_rate * 0.3) + (rolling_7d_avg * 0.2)), 0) AS max_raw
+    FROM cell_aggregates
+    WHERE time_bucket BETWEEN :start_date AND :end_date
+      AND event_type = :event_type
+    """
+)
+COPY_FORECASTS_SQL = """
+    COPY risk_forecasts (
+        h3_index, target_date, issued_on, horizon_days, predicted_event_count,
+        lower_event_count, upper_event_count, predicted_risk_score, predicted_risk_level
+    ) FROM STDIN
+"""
+
 
 class AnalyticsEngine:
-    """Computes H3 aggregates, risk score, and anomalies."""
+    """Computes H3 aggregates, risk score, and anomalies.
+
+    Stage methods write in the caller's transaction and return the rows they wrote,
+    so a stage can be committed together with its checkpoint. Aggregates, scores,
+    anomalies and hotspots are kept per event type plus the ``ALL_EVENT_TYPES``
+    rollup; Gi* and forecasts use the rollup.
+    """
+
+    hotspot_growth_threshold = 1.0
+    # Gi* neighborhood radius in H3 rings and the z-score (95%, two-sided) that marks a spatial cluster.
+    gi_star_rings = 1
+    hotspot_gi_zscore_threshold = 1.96
+    # Days before a bucket that its rolling average and growth rate read.
+    rolling_lookback_days = 7
+    # Trailing days, ending on each scored day, whose raw scores set that day's min-max normalization.
+    risk_normalization_days = 28
+    # Anomaly baselines: half-life of a day's weight (None weighs all history equally) and warm-up.
+    anomaly_half_life_days: float | None = 28.0
+    anomaly_min_baseline_days = 7
+    anomaly_zscore_threshold = 2.0
+    forecast_horizon_days = 3
+    forecast_history_days = 56
+    forecast_alpha = 0.5
+    forecast_beta = 0.1
+    forecast_weekly_seasonality = True
 
     def run_pipeline(self, db: Session, start_dt: datetime, end_dt: datetime, resolution: int = 8) -> None:
-        """Run full analytics pipeline in deterministic order."""
+        """Run full analytics pipeline in deterministic order, committing after each stage."""
         self.aggregate_events(db, start_dt, end_dt, resolution=resolution)
+        db.commit()
         self.compute_risk_scores(db, start_dt.date(), end_dt.date())
+        db.commit()
         self.detect_anomalies(db, start_dt.date(), end_dt.date())
+        db.commit()
+        self.compute_gi_star(db, start_dt.date(), end_dt.date())
+        db.commit()
+        self.materialize_hotspots(db, start_dt.date(), end_dt.date())
+        db.commit()
         self.refresh_materialized_views(db)
+        db.commit()
+        self.forecast_risk(db, end_dt.date())
+        db.commit()
 
-    def aggregate_events(self, db: Session, start_dt: datetime, end_dt: datetime, resolution: int = 8) -> None:
-        """Aggregate events by day and H3 index."""
-        rows = db.execute(
-            text(
-                """
-                SELECT
-                    id,
-                    date_trunc('day', event_timestamp)::date AS day_bucket,
-                    ST_Y(geom::geometry) AS latitude,
-                    ST_X(geom::geometry) AS longitude
-                FROM events
-                WHERE event_timestamp >= :start_dt
-                  AND event_timestamp < :end_dt
-                """
-            ),
-            {"start_dt": start_dt, "end_dt": end_dt},
-        ).all()
+    def aggregate_events(self, db: Session, start_dt: datetime, end_dt: datetime, resolution: int = 8) -> int:
+        """Aggregate events by day, H3 index and event type plus the all-types rollup; returns rows written.
 
-        grouped: dict[tuple[str, date], int] = defaultdict(int)
-        h3_registry: set[str] = set()
+        Events are read and binned once; the per-type counts and the rollup come
+        from one ``GROUPING SETS`` insert.
+        """
+        rows = db.execute(EVENTS_IN_WINDOW_SQL, {"start_dt": start_dt, "end_dt": end_dt}).all()
+
+        grouped: dict[tuple[int, str, date], int] = defaultdict(int)
+        h3_registry: set[int] = set()
         for row in rows:
-            h3_idx = h3.latlng_to_cell(row.latitude, row.longitude, resolution)
-            grouped[(h3_idx, row.day_bucket)] += 1
+            h3_idx = h3_int.latlng_to_cell(row.latitude, row.longitude, resolution)
+            grouped[(h3_idx, row.event_type, row.day_bucket)] += 1
             h3_registry.add(h3_idx)
 
         for h3_idx in h3_registry:
-            cell_boundary = h3.cell_to_boundary(h3_idx)
+            cell_boundary = h3_int.cell_to_boundary(h3_idx)
             polygon = Polygon([(lng, lat) for lat, lng in cell_boundary])
             db.execute(
                 text(
@@ -61,38 +276,41 @@ class AnalyticsEngine:
                 {"h3_index": h3_idx, "resolution": resolution, "wkt": polygon.wkt},
             )
 
-        for (h3_idx, bucket), count in grouped.items():
+        written = cast(
+            CursorResult[Any],
             db.execute(
-                text(
-                    """
-                    INSERT INTO cell_aggregates (h3_index, time_bucket, event_count, rolling_7d_avg, growth_rate, created_at)
-                    VALUES (:h3_index, :time_bucket, :event_count, 0, 0, NOW())
-                    ON CONFLICT (h3_index, time_bucket)
-                    DO UPDATE SET event_count = EXCLUDED.event_count
-                    """
-                ),
-                {"h3_index": h3_idx, "time_bucket": bucket, "event_count": count},
-            )
+                UPSERT_CELL_AGGREGATES_SQL,
+                {
+                    "all_types": ALL_EVENT_TYPES,
+                    "cells": [h3_idx for h3_idx, _, _ in grouped],
+                    "event_types": [event_type for _, event_type, _ in grouped],
+                    "buckets": [bucket for _, _, bucket in grouped],
+                    "counts": list(grouped.values()),
+                },
+            ),
+        ).rowcount
 
         db.execute(
             text(
                 """
                 WITH metrics AS (
                     SELECT
-                        id,
+                        h3_index,
+                        event_type,
+                        time_bucket,
                         event_count,
                         AVG(event_count) OVER (
-                            PARTITION BY h3_index
+                            PARTITION BY h3_index, event_type
                             ORDER BY time_bucket
                             ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
                         ) AS rolling_avg,
                         AVG(event_count) OVER (
-                            PARTITION BY h3_index
+                            PARTITION BY h3_index, event_type
                             ORDER BY time_bucket
                             ROWS BETWEEN 7 PRECEDING AND 1 PRECEDING
                         ) AS prev_7d_avg
                     FROM cell_aggregates
-                    WHERE time_bucket >= :start_date
+                    WHERE time_bucket >= CAST(:start_date AS DATE) - CAST(:lookback_days AS INTEGER)
                       AND time_bucket <= :end_date
                 )
                 UPDATE cell_aggregates ca
@@ -102,37 +320,62 @@ class AnalyticsEngine:
                         ELSE (m.event_count - m.prev_7d_avg) / m.prev_7d_avg
                     END
                 FROM metrics m
-                WHERE ca.id = m.id
+                WHERE ca.h3_index = m.h3_index
+                  AND ca.event_type = m.event_type
+                  AND ca.time_bucket = m.time_bucket
+                  AND ca.time_bucket >= :start_date
+                  AND ca.time_bucket <= :end_date
                 """
             ),
-            {"start_date": start_dt.date(), "end_date": end_dt.date()},
+            {"start_date": start_dt.date(), "end_date": end_dt.date(), "lookback_days": self.rolling_lookback_days},
         )
-        db.commit()
+        return written
 
-    def compute_risk_scores(self, db: Session, start_date: date, end_date: date) -> None:
-        """Compute and normalize risk score from aggregate metrics."""
-        db.execute(
+    def compute_risk_scores(self, db: Session, start_date: date, end_date: date) -> int:
+        """Compute and normalize risk score from aggregate metrics; returns scores written.
+
+        Each day's scores are min-max normalized within each event type (and the rollup)
+        over the ``risk_normalization_days`` ending on that day, not over the run window,
+        so a narrow incremental run writes the same scores as a full-window run.
+        """
+        result = db.execute(
             text(
                 """
                 WITH base AS (
                     SELECT
                         h3_index,
+                        event_type,
                         time_bucket,
                         event_count,
                         growth_rate,
                         rolling_7d_avg,
                         ((event_count * 0.5) + (growth_rate * 0.3) + (rolling_7d_avg * 0.2))::float AS raw_score
                     FROM cell_aggregates
-                    WHERE time_bucket >= :start_date
+                    WHERE time_bucket >= CAST(:start_date AS DATE) - CAST(:normalization_days AS INTEGER) + 1
                       AND time_bucket <= :end_date
                 ),
-                bounds AS (
-                    SELECT COALESCE(MIN(raw_score), 0) AS min_score, COALESCE(MAX(raw_score), 0) AS max_score
+                daily_bounds AS (
+                    SELECT event_type, time_bucket, MIN(raw_score) AS min_score, MAX(raw_score) AS max_score
                     FROM base
+                    GROUP BY event_type, time_bucket
+                ),
+                bounds AS (
+                    SELECT
+                        event_type,
+                        time_bucket,
+                        MIN(min_score) OVER trailing AS min_score,
+                        MAX(max_score) OVER trailing AS max_score
+                    FROM daily_bounds
+                    WINDOW trailing AS (
+                        PARTITION BY event_type
+                        ORDER BY time_bucket
+                        RANGE BETWEEN make_interval(days => CAST(:normalization_days AS INTEGER) - 1) PRECEDING AND CURRENT ROW
+                    )
                 )
-                INSERT INTO risk_scores (h3_index, time_bucket, risk_score, risk_level)
+                INSERT INTO risk_scores (h3_index, event_type, time_bucket, risk_score, risk_level)
                 SELECT
                     b.h3_index,
+                    b.event_type,
                     b.time_bucket,
                     CASE
                         WHEN bo.max_score = bo.min_score THEN 0
@@ -151,64 +394,286 @@ class AnalyticsEngine:
                         ELSE 'critical'
                     END::risk_level
                 FROM base b
-                CROSS JOIN bounds bo
-                ON CONFLICT (h3_index, time_bucket)
+                JOIN bounds bo
+                  ON bo.event_type = b.event_type
+                 AND bo.time_bucket = b.time_bucket
+                WHERE b.time_bucket >= :start_date
+                ON CONFLICT (h3_index, event_type, time_bucket)
                 DO UPDATE SET
                     risk_score = EXCLUDED.risk_score,
                     risk_level = EXCLUDED.risk_level
                 """
             ),
-            {"start_date": start_date, "end_date": end_date},
+            {"start_date": start_date, "end_date": end_date, "normalization_days": self.risk_normalization_days},
         )
-        db.commit()
+        return cast(CursorResult[Any], result).rowcount
 
-    def detect_anomalies(self, db: Session, start_date: date, end_date: date) -> None:
-        """Detect anomalies using z-score over daily event count."""
+    def detect_anomalies(self, db: Session, start_date: date, end_date: date) -> int:
+        """Score the window's cell-days against online per-series baselines; returns flags written.
+
+        Each (cell, event type) series is scored against its decayed Welford state
+        (``anomaly_baselines``) before the day is folded in, so a run reads only the
+        window and the baselines of the series it touches. Days without events count
+        as zero. Every flag keeps the state after its day; a window overlapping days
+        already folded in restarts from the checkpoint before the window and refolds
+        through the stored state's last day, so re-runs are idempotent.
+        """
+        rows = list(db.execute(CELL_COUNTS_IN_WINDOW_SQL, {"start_date": start_date, "end_date": end_date}))
+        if not rows:
+            return 0
+        positions: dict[tuple[int, str], int] = {}
+        series = [positions.setdefault((row.h3_index, row.event_type), len(positions)) for row in rows]
+        keys = {"cells": [cell for cell, _ in positions], "event_types": [event_type for _, event_type in positions]}
+
+        stats = RunningStats.empty(len(positions))
+        read_end = end_date
+        for state in db.execute(ANOMALY_BASELINES_SQL, {**keys, "start_date": start_date}):
+            if state.stored_through >= start_date:
+                read_end = max(read_end, state.stored_through)
+            if state.weight is not None:
+                position = state.position - 1
+                stats.through[position] = np.datetime64(state.through_bucket, "D").astype(np.int64)
+                stats.weight[position] = state.weight
+                stats.mean[position] = state.mean
+                stats.m2[position] = state.m2
+        if read_end > end_date:
+            later = db.execute(SERIES_COUNTS_SQL, {**keys, "after_date": end_date, "end_date": read_end}).all()
+            rows.extend(later)
+            series.extend(positions[(row.h3_index, row.event_type)] for row in later)
+
+        days = np.array([row.time_bucket for row in rows], dtype="datetime64[D]")
+        zscores, after = score_days(
+            stats,
+            np.array(series, dtype=np.int64),
+            days.astype(np.int64),
+            np.array([row.event_count for row in rows], dtype=np.float64),
+            decay_factor(self.anomaly_half_life_days),
+            self.anomaly_min_baseline_days,
+        )
+        result = db.execute(
+            UPSERT_ANOMALY_FLAGS_SQL,
+            {
+                "cells": [row.h3_index for row in rows],
+                "event_types": [row.event_type for row in rows],
+                "buckets": days.tolist(),
+                "scores": zscores.tolist(),
+                "flagged": (zscores >= self.anomaly_zscore_threshold).tolist(),
+                "weights": after.weight.tolist(),
+                "means": after.mean.tolist(),
+                "m2s": after.m2.tolist(),
+            },
+        )
+        db.execute(
+            UPSERT_ANOMALY_BASELINES_SQL,
+            {
+                **keys,
+                "buckets": stats.through.astype("datetime64[D]").tolist(),
+                "weights": stats.weight.tolist(),
+                "means": stats.mean.tolist(),
+                "m2s": stats.m2.tolist(),
+            },
+        )
+        return cast(CursorResult[Any], result).rowcount
+
+    def flagged_cells(self, db: Session, start_date: date, end_date: date) -> set[tuple[int, date]]:
+        """Return (h3_index, day) pairs currently flagged as anomalous in the window."""
         rows = db.execute(
             text(
                 """
-                SELECT h3_index, time_bucket, event_count
-                FROM cell_aggregates
-                WHERE time_bucket >= :start_date
+                SELECT DISTINCT h3_index, time_bucket
+                FROM anomaly_flags
+                WHERE flagged
+                  AND time_bucket >= :start_date
                   AND time_bucket <= :end_date
-                ORDER BY h3_index, time_bucket
                 """
             ),
             {"start_date": start_date, "end_date": end_date},
         ).all()
+        return {(row.h3_index, row.time_bucket) for row in rows}
 
-        grouped: dict[str, list[tuple[date, int]]] = defaultdict(list)
-        for row in rows:
-            grouped[row.h3_index].append((row.time_bucket, row.event_count))
-
-        for h3_idx, series in grouped.items():
-            counts = [count for _, count in series]
-            mu = mean(counts) if counts else 0
-            sigma = pstdev(counts) if len(counts) > 1 else 0
-            for bucket, count in series:
-                z_score = 0.0 if sigma == 0 else (count - mu) / sigma
-                db.execute(
-                    text(
-                        """
-                        INSERT INTO anomaly_flags (h3_index, time_bucket, anomaly_score, flagged)
-                        VALUES (:h3_index, :time_bucket, :anomaly_score, :flagged)
-                        ON CONFLICT (h3_index, time_bucket)
-                        DO UPDATE SET
-                            anomaly_score = EXCLUDED.anomaly_score,
-                            flagged = EXCLUDED.flagged
-                        """
-                    ),
-                    {
-                        "h3_index": h3_idx,
-                        "time_bucket": bucket,
-                        "anomaly_score": z_score,
-                        "flagged": z_score >= 2.0,
-                    },
+    def materialize_hotspots(self, db: Session, start_date: date, end_date: date) -> int:
+        """Rebuild ranked daily hotspots per event type for the window; returns hotspots written.
+
+        A cell-day qualifies on elevated risk level, an anomaly flag, growth or (for
+        the all-types rollup) a significant Gi* z-score: its neighborhood is surging with it.
+        """
+        db.execute(
+            text("DELETE FROM hotspots WHERE time_bucket >= :start_date AND time_bucket <= :end_date"),
+            {"start_date": start_date, "end_date": end_date},
+        )
+        result = db.execute(
+            text(
+                """
+                INSERT INTO hotspots (
+                    h3_index, event_type, time_bucket, rank, risk_score, risk_level, growth_rate, anomaly_flagged,
+                    gi_zscore, reasons, geom
                 )
-        db.commit()
+                SELECT
+                    h3_index,
+                    event_type,
+                    time_bucket,
+                    ROW_NUMBER() OVER (PARTITION BY event_type, time_bucket ORDER BY risk_score DESC, h3_index) AS rank,
+                    risk_score,
+                    risk_level,
+                    growth_rate,
+                    anomaly_flagged,
+                    gi_zscore,
+                    reasons,
+                    geom
+                FROM (
+                    SELECT
+                        r.h3_index,
+                        r.event_type,
+                        r.time_bucket,
+                        r.risk_score,
+                        r.risk_level,
+                        c.growth_rate,
+                        COALESCE(a.flagged, false) AS anomaly_flagged,
+                        g.gi_zscore,
+                        array_remove(
+                            ARRAY[
+                                CASE WHEN r.risk_level IN ('high', 'critical') THEN 'elevated_risk' END,
+                                CASE WHEN COALESCE(a.flagged, false) THEN 'anomaly' END,
+                                CASE WHEN c.growth_rate >= :growth_threshold THEN 'growth' END,
+                                CASE WHEN g.gi_zscore >= :gi_zscore_threshold THEN 'spatial_cluster' END
+                            ],
+                            NULL
+                        ) AS reasons,
+                        h3.geom
+                    FROM risk_scores r
+                    JOIN cell_aggregates c
+                      ON c.h3_index = r.h3_index
+                     AND c.event_type = r.event_type
+                     AND c.time_bucket = r.time_bucket
+                    JOIN h3_cells h3
+                      ON h3.h3_index = r.h3_index
+                    LEFT JOIN anomaly_flags a
+                      ON a.h3_index = r.h3_index
+                     AND a.event_type = r.event_type
+                     AND a.time_bucket = r.time_bucket
+                    LEFT JOIN gi_star_scores g
+                      ON g.h3_index = r.h3_index
+                     AND g.time_bucket = r.time_bucket
+                     AND r.event_type = :all_types
+                    WHERE r.time_bucket >= :start_date
+                      AND r.time_bucket <= :end_date
+                ) candidates
+                WHERE cardinality(reasons) > 0
+                """
+            ),
+            {
+                "start_date": start_date,
+                "end_date": end_date,
+                "growth_threshold": self.hotspot_growth_threshold,
+                "gi_zscore_threshold": self.hotspot_gi_zscore_threshold,
+                "all_types": ALL_EVENT_TYPES,
+            },
+        )
+        return cast(CursorResult[Any], result).rowcount
+
+    def compute_gi_star(self, db: Session, start_date: date, end_date: date) -> int:
+        """Score every active cell-day with Getis-Ord Gi* over its H3 neighborhood; returns scores written.
+
+        Z-scores are computed over all cells seen in the window (zero on days without
+        events) and stored for the cell-days that have aggregates.
+        """
+        connection = self._driver_connection(db)
+        cells, matrix = self._cell_day_counts(connection, start_date, end_date)
+        db.execute(
+            text("DELETE FROM gi_star_scores WHERE time_bucket BETWEEN :start_date AND :end_date"),
+            {"start_date": start_date, "end_date": end_date},
+        )
+        if cells.size == 0:
+            return 0
+
+        zscores, degrees = gi_star(cells, matrix, self.gi_star_rings)
+        cell_rows, day_offsets = np.nonzero(matrix)
+        rows = np.empty(cell_rows.size, dtype=GI_STAR_ROW)
+        rows["fields"] = 4
+        rows["h3_length"], rows["day_length"], rows["zscore_length"], rows["neighbors_length"] = 8, 4, 8, 2
+        rows["h3_index"] = cells[cell_rows]
+        rows["time_bucket"] = (start_date - POSTGRES_EPOCH).days + day_offsets
+        rows["gi_zscore"] = zscores[cell_rows, day_offsets]
+        rows["neighbor_count"] = degrees[cell_rows]
+        with connection.cursor() as cursor, cursor.copy(COPY_GI_STAR_SQL) as copy:
+            copy.write(COPY_BINARY_HEADER)
+            copy.write(rows.tobytes())
+            copy.write(COPY_BINARY_TRAILER)
+        return int(rows.size)
 
     def refresh_materialized_views(self, db: Session) -> None:
         """Refresh precomputed reporting views used by APIs and tiles."""
         db.execute(text("REFRESH MATERIALIZED VIEW mv_daily_risk"))
-        db.commit()
 
+    def forecast_risk(self, db: Session, end_date: date) -> int:
+        """Project every active cell's counts and risk for the days after ``end_date``; returns forecasts written.
+
+        The history window is read with one binary COPY into a cells x days matrix and
+        fitted in NumPy; forecasts for the projected dates are replaced with one COPY.
+        """
+        start_date = end_date - timedelta(days=self.forecast_history_days - 1)
+        params = {"start_date": start_date, "end_date": end_date, "event_type": ALL_EVENT_TYPES}
+        connection = self._driver_connection(db)
+        cells, matrix = self._cell_day_counts(connection, start_date, end_date)
+        if cells.size == 0:
+            return 0
+
+        forecast = forecast_cells(
+            matrix,
+            start_date,
+            self.forecast_horizon_days,
+            self.forecast_alpha,
+            self.forecast_beta,
+            self.forecast_weekly_seasonality,
+        )
+        bounds = db.execute(RAW_SCORE_BOUNDS_SQL, params).one()
+        scores = normalize_scores(forecast.raw_scores, bounds.min_raw, bounds.max_raw)
+        levels = risk_levels(scores)
+        targets = forecast.target_dates()
+
+        db.execute(
+            text("DELETE FROM risk_forecasts WHERE target_date BETWEEN :first_target AND :last_target"),
+            {"first_target": targets[0], "last_target": targets[-1]},
+        )
+        cell_ids = cells.tolist()
+        with connection.cursor() as cursor, cursor.copy(COPY_FORECASTS_SQL) as copy:
+            for step, target in enumerate(targets):
+                for cell, count, lower, upper, score, level in zip(
+                    cell_ids,
+                    forecast.counts[:, step].tolist(),
+                    forecast.lower[:, step].tolist(),
+                    forecast.upper[:, step].tolist(),
+                    scores[:, step].tolist(),
+                    levels[:, step].tolist(),
+                    strict=True,
+                ):
+                    copy.write_row((cell, target, end_date, step + 1, count, lower, upper, score, level))
+        return len(cell_ids) * len(targets)
+
+    @staticmethod
+    def _driver_connection(db: Session) -> psycopg.Connection:
+        """The psycopg connection under the session's transaction, for COPY."""
+        return cast(psycopg.Connection, db.connection().connection.driver_connection)
+
+    @staticmethod
+    def _cell_day_counts(
+        connection: psycopg.Connection, start_date: date, end_date: date
+    ) -> tuple[npt.NDArray[np.int64], FloatMatrix]:
+        """Read the window's all-types aggregates with one binary COPY into a sorted cells x days count matrix."""
+        params = {"start_date": start_date, "end_date": end_date, "event_type": ALL_EVENT_TYPES}
+        with connection.cursor() as cursor:
+            with cursor.copy(CELL_DAY_COUNTS_COPY_SQL, params) as copy:
+                payload = b"".join(bytes(block) for block in copy)
+        row_bytes = max(len(payload) - len(COPY_BINARY_HEADER) - len(COPY_BINARY_TRAILER), 0)
+        rows = np.frombuffer(
+            payload,
+            dtype=CELL_DAY_COUNT_ROW,
+            count=row_bytes // CELL_DAY_COUNT_ROW.itemsize,
+            offset=len(COPY_BINARY_HEADER),
+        )
+        return dense_matrix(
+            rows["h3_index"].astype(np.int64),
+            rows["day"].astype(np.int32),
+            rows["event_count"].astype(np.int32),
+            (end_date - start_date).days + 1,
+        )
@@ -0,0 +1,151 @@
+"""Vectorized short-horizon event forecasting over a cells x days matrix.
+
+Holt's linear trend (double exponential smoothing) is fitted to every cell at
+once: the recursion runs over days, and each step is one NumPy operation
+across all cells. Optional additive day-of-week seasonality is estimated per
+cell from the same window (against a centered moving average) and removed
+before smoothing. Intervals come from each cell's one-step-ahead residuals,
+widened with the square root of the horizon.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+import numpy.typing as npt
+
+FloatMatrix = npt.NDArray[np.float64]
+RISK_LEVEL_THRESHOLDS = ((25.0, "low"), (50.0, "medium"), (75.0, "high"))
+RISK_WEIGHTS = (0.5, 0.3, 0.2)  # event count, growth rate, rolling 7-day average; as compute_risk_scores
+INTERVAL_Z = 1.96
+
+
+@dataclass(frozen=True)
+class Forecast:
+    """Per-cell projections for days ``first_target .. first_target + horizon - 1``."""
+
+    first_target: date
+    counts: FloatMatrix
+    lower: FloatMatrix
+    upper: FloatMatrix
+    raw_scores: FloatMatrix
+
+    @property
+    def horizon(self) -> int:
+        """Days projected per cell."""
+        return int(self.counts.shape[1])
+
+    def target_dates(self) -> list[date]:
+        """Calendar date of each forecast column."""
+        return [self.first_target + timedelta(days=offset) for offset in range(self.horizon)]
+
+
+def dense_matrix(
+    cell_ids: npt.NDArray[np.int64], day_offsets: npt.NDArray[np.int32], counts: npt.NDArray[np.int32], days: int
+) -> tuple[npt.NDArray[np.int64], FloatMatrix]:
+    """Scatter sparse (cell, day, count) rows into a zero-filled cells x days matrix; returns (cells, matrix)."""
+    cells, rows = np.unique(cell_ids, return_inverse=True)
+    matrix = np.zeros((cells.size, days), dtype=np.float64)
+    matrix[rows, day_offsets] = counts
+    return cells, matrix
+
+
+def weekday_profile(matrix: FloatMatrix, first_day: date) -> FloatMatrix:
+    """Additive day-of-week effect per cell (cells x 7, indexed by ``date.weekday()``), summing to zero.
+
+    Classical decomposition: each day is compared with the centered 7-day moving
+    average around it, so a trend is not mistaken for a weekday effect.
+    """
+    days = matrix.shape[1]
+    cumulative = np.concatenate([np.zeros((matrix.shape[0], 1)), np.cumsum(matrix, axis=1)], axis=1)
+    centered = (cumulative[:, 7:] - cumulative[:, :-7]) / 7.0
+    detrended = matrix[:, 3 : days - 3] - centered
+    weekdays = (np.arange(3, days - 3) + first_day.weekday()) % 7
+    profile = np.zeros((matrix.shape[0], 7), dtype=np.float64)
+    for weekday in range(7):
+        columns = weekdays == weekday
+        if columns.any():
+            profile[:, weekday] = detrended[:, columns].mean(axis=1)
+    return profile - profile.mean(axis=1, keepdims=True)
+
+
+def holt(
+    matrix: FloatMatrix, alpha: float, beta: float, horizon: int
+) -> tuple[FloatMatrix, npt.NDArray[np.float64]]:
+    """Fit Holt's linear trend to every row; returns (cells x horizon forecasts, one-step residual std per cell)."""
+    cells, days = matrix.shape
+    level = matrix[:, 0].copy()
+    trend = matrix[:, 1] - matrix[:, 0] if days > 1 else np.zeros(cells)
+    squared_error = np.zeros(cells)
+    for day in range(1, days):
+        observed = matrix[:, day]
+        predicted = level + trend
+        squared_error += (observed - predicted) ** 2
+        next_level = alpha * observed + (1 - alpha) * predicted
+        trend = beta * (next_level - level) + (1 - beta) * trend
+        level = next_level
+    residual_std = np.sqrt(squared_error / max(days - 1, 1))
+    steps = np.arange(1, horizon + 1, dtype=np.float64)
+    return level[:, None] + trend[:, None] * steps[None, :], residual_std
+
+
+def projected_raw_scores(matrix: FloatMatrix, projected: FloatMatrix) -> FloatMatrix:
+    """Risk raw scores for projected days: count, growth vs the prior 7 days and 7-day rolling average."""
+    series = np.concatenate([matrix, projected], axis=1)
+    cumulative = np.concatenate([np.zeros((series.shape[0], 1)), np.cumsum(series, axis=1)], axis=1)
+    history_days = matrix.shape[1]
+    scores = np.empty_like(projected)
+    for step in range(projected.shape[1]):
+        day = history_days + step
+        rolling = (cumulative[:, day + 1] - cumulative[:, max(day - 6, 0)]) / min(day + 1, 7)
+        previous = (cumulative[:, day] - cumulative[:, max(day - 7, 0)]) / max(min(day, 7), 1)
+        growth = np.divide(
+            series[:, day] - previous, previous, out=np.zeros_like(previous), where=previous > 0
+        )
+        count_weight, growth_weight, rolling_weight = RISK_WEIGHTS
+        scores[:, step] = count_weight * series[:, day] + growth_weight * growth + rolling_weight * rolling
+    return scores
+
+
+def forecast_cells(
+    matrix: FloatMatrix,
+    first_day: date,
+    horizon: int,
+    alpha: float,
+    beta: float,
+    weekly_seasonality: bool = True,
+) -> Forecast:
+    """Project each cell's daily counts ``horizon`` days past the end of the matrix."""
+    first_target = first_day + timedelta(days=matrix.shape[1])
+    season = np.zeros((matrix.shape[0], 7))
+    if weekly_seasonality and matrix.shape[1] >= 14:
+        season = weekday_profile(matrix, first_day)
+    weekdays = (np.arange(matrix.shape[1]) + first_day.weekday()) % 7
+    smoothed, residual_std = holt(matrix - season[:, weekdays], alpha, beta, horizon)
+    target_weekdays = (np.arange(horizon) + first_target.weekday()) % 7
+    counts = np.clip(smoothed + season[:, target_weekdays], 0.0, None)
+    spread = INTERVAL_Z * residual_std[:, None] * np.sqrt(np.arange(1, horizon + 1))[None, :]
+    return Forecast(
+        first_target=first_target,
+        counts=counts,
+        lower=np.clip(counts - spread, 0.0, None),
+        upper=counts + spread,
+        raw_scores=projected_raw_scores(matrix, counts),
+    )
+
+
+def normalize_scores(raw_scores: FloatMatrix, min_raw: float, max_raw: float) -> FloatMatrix:
+    """Map raw scores onto 0-100 with the history window's bounds, as ``compute_risk_scores`` does."""
+    if max_raw <= min_raw:
+        return np.zeros_like(raw_scores)
+    return np.clip((raw_scores - min_raw) / (max_raw - min_raw) * 100.0, 0.0, 100.0)
+
+
+def risk_levels(scores: FloatMatrix) -> npt.NDArray[np.str_]:
+    """Risk level labels for normalized scores, using the pipeline's thresholds."""
+    levels = np.full(scores.shape, "critical", dtype="<U8")
+    for threshold, label in reversed(RISK_LEVEL_THRESHOLDS):
+        levels[scores <= threshold] = label
+    return levels
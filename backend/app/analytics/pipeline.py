@@ -0,0 +1,170 @@
+"""Checkpointed analytics pipeline: a chain of stages recorded in ``analytics_runs``.
+
+Each stage locks its run row, skips itself when already completed, and commits
+its output together with the checkpoint (stage name and row count). A failed
+stage rolls back entirely, so retrying it is safe, and retries or manual
+resumes start at the first stage that has not committed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from backend.app.analytics.engine import AnalyticsEngine
+from backend.app.models.analytics_run import AnalyticsRun
+
+STAGES = ("aggregate", "score", "anomalies", "gi_star", "hotspots", "refresh", "forecast")
+
+
+class RunNotFoundError(LookupError):
+    """Raised when a run id has no ``analytics_runs`` row."""
+
+
+@dataclass(frozen=True)
+class StageResult:
+    """Outcome of one stage attempt."""
+
+    stage: str
+    skipped: bool
+    rows: int | None = None
+
+
+def _window(run: AnalyticsRun) -> tuple[date, date]:
+    return run.start_datetime.date(), run.end_datetime.date()
+
+
+def _aggregate(engine: AnalyticsEngine, db: Session, run: AnalyticsRun) -> int:
+    return engine.aggregate_events(db, run.start_datetime, run.end_datetime, resolution=run.resolution)
+
+
+def _score(engine: AnalyticsEngine, db: Session, run: AnalyticsRun) -> int:
+    return engine.compute_risk_scores(db, *_window(run))
+
+
+def _anomalies(engine: AnalyticsEngine, db: Session, run: AnalyticsRun) -> int:
+    # The before/after diff is taken inside the stage transaction so a retried stage reports the same cells.
+    flagged_before = engine.flagged_cells(db, *_window(run))
+    written = engine.detect_anomalies(db, *_window(run))
+    newly_flagged = engine.flagged_cells(db, *_window(run)) - flagged_before
+    run.newly_flagged = [[h3_index, bucket.isoformat()] for h3_index, bucket in sorted(newly_flagged)]
+    return written
+
+
+def _gi_star(engine: AnalyticsEngine, db: Session, run: AnalyticsRun) -> int:
+    return engine.compute_gi_star(db, *_window(run))
+
+
+def _hotspots(engine: AnalyticsEngine, db: Session, run: AnalyticsRun) -> int:
+    return engine.materialize_hotspots(db, *_window(run))
+
+
+def _refresh(engine: AnalyticsEngine, db: Session, run: AnalyticsRun) -> int:
+    engine.refresh_materialized_views(db)
+    start_date, end_date = _window(run)
+    return db.execute(
+        text("SELECT COUNT(*) FROM mv_daily_risk WHERE time_bucket BETWEEN :start_date AND :end_date"),
+        {"start_date": start_date, "end_date": end_date},
+    ).scalar_one()
+
+
+def _forecast(engine: AnalyticsEngine, db: Session, run: AnalyticsRun) -> int:
+    return engine.forecast_risk(db, run.end_datetime.date())
+
+
+STAGE_FUNCTIONS: dict[str, Callable[[AnalyticsEngine, Session, AnalyticsRun], int]] = {
+    "aggregate": _aggregate,
+    "score": _score,
+    "anomalies": _anomalies,
+    "gi_star": _gi_star,
+    "hotspots": _hotspots,
+    "refresh": _refresh,
+    "forecast": _forecast,
+}
+
+
+def create_run(db: Session, start_dt: datetime, end_dt: datetime, resolution: int = 8) -> int:
+    """Persist a pending run for a window and return its id."""
+    run = AnalyticsRun(start_datetime=start_dt, end_datetime=end_dt, resolution=resolution, status="pending")
+    db.add(run)
+    db.commit()
+    return run.id
+
+
+def get_run(db: Session, run_id: int, lock: bool = False) -> AnalyticsRun:
+    """Load a run, optionally locking its row for the rest of the transaction."""
+    statement = select(AnalyticsRun).where(AnalyticsRun.id == run_id)
+    if lock:
+        statement = statement.with_for_update().execution_options(populate_existing=True)
+    run = db.execute(statement).scalar_one_or_none()
+    if run is None:
+        raise RunNotFoundError(f"Analytics run {run_id} does not exist")
+    return run
+
+
+def pending_stages(run: AnalyticsRun) -> list[str]:
+    """Stages not yet committed, in pipeline order."""
+    return [stage for stage in STAGES if stage not in run.completed_stages]
+
+
+def run_stage(db: Session, run_id: int, stage: str, engine: AnalyticsEngine | None = None) -> StageResult:
+    """Run one stage and commit its output with the checkpoint; completed stages are skipped.
+
+    The run row stays locked until commit, so concurrent resumes of the same run
+    cannot execute a stage twice. Any error rolls the stage back and records it on the run.
+    """
+    if stage not in STAGE_FUNCTIONS:
+        raise ValueError(f"Unknown pipeline stage: {stage}")
+    run = get_run(db, run_id, lock=True)
+    if stage in run.completed_stages:
+        db.rollback()
+        return StageResult(stage=stage, skipped=True)
+
+    missing = [earlier for earlier in STAGES[: STAGES.index(stage)] if earlier not in run.completed_stages]
+    if missing:
+        db.rollback()
+        raise ValueError(f"Stage {stage} of run {run_id} needs {', '.join(missing)} first")
+
+    try:
+        run.status = "running"
+        rows = STAGE_FUNCTIONS[stage](engine or AnalyticsEngine(), db, run)
+        run.completed_stages = [*run.completed_stages, stage]
+        run.row_counts = {**run.row_counts, stage: rows}
+        run.last_error = None
+        run.status = "completed" if not pending_stages(run) else "running"
+        run.updated_at = datetime.now(UTC)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        mark_failed(db, run_id, f"{stage}: {exc}")
+        raise
+    return StageResult(stage=stage, skipped=False, rows=rows)
+
+
+def mark_failed(db: Session, run_id: int, error: str) -> None:
+    """Record a failed attempt outside the rolled-back stage transaction."""
+    db.execute(
+        text(
+            """
+            UPDATE analytics_runs
+            SET status = 'failed', last_error = :error, failed_attempts = failed_attempts + 1, updated_at = NOW()
+            WHERE id = :run_id
+            """
+        ),
+        {"run_id": run_id, "error": error[:2000]},
+    )
+    db.commit()
+
+
+def run_all(db: Session, run_id: int, engine: AnalyticsEngine | None = None) -> list[StageResult]:
+    """Run every remaining stage of a run in-process, in order."""
+    return [run_stage(db, run_id, stage, engine) for stage in STAGES]
+
+
+def newly_flagged_cells(run: AnalyticsRun) -> list[tuple[int, date]]:
+    """Cells the run's anomaly stage flagged that were not flagged before it."""
+    return [(int(h3_index), date.fromisoformat(bucket)) for h3_index, bucket in run.newly_flagged]
@@ -1,39 +1,54 @@
 """API dependency providers."""
 
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from pydantic import BaseModel
 
+from backend.app.core.revocation import is_token_active
 from backend.app.core.security import decode_access_token
-from backend.app.db.session import get_db
-from backend.app.models.user import User, UserRole
+from backend.app.models.user import UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/token")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Resolve currently authenticated user from JWT."""
+class AuthenticatedUser(BaseModel):
+    """Principal resolved from verified JWT claims."""
+
+    username: str
+    role: UserRole
+    jti: str
+    expires_at: datetime
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> AuthenticatedUser:
+    """Resolve currently authenticated user from JWT claims without a database round trip."""
     payload = decode_access_token(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
     username = payload.get("sub")
-    if not username:
+    role = payload.get("role")
+    jti = payload.get("jti")
+    if not username or not jti or role not in {member.value for member in UserRole}:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
 
-    user = db.scalar(select(User).where(User.username == username))
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    if not await is_token_active(username, jti, int(payload.get("ver", 0))):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    return AuthenticatedUser(
+        username=username,
+        role=UserRole(role),
+        jti=jti,
+        expires_at=datetime.fromtimestamp(payload["exp"], tz=UTC),
+    )
 
 
-def require_role(*allowed_roles: UserRole) -> Callable[[User], User]:
+def require_role(*allowed_roles: UserRole) -> Callable[[AuthenticatedUser], Awaitable[AuthenticatedUser]]:
     """Return dependency validating RBAC role membership."""
 
-    def role_guard(current_user: User = Depends(get_current_user)) -> User:
+    async def role_guard(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
         if current_user.role not in allowed_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
         return current_user
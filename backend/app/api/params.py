@@ -0,0 +1,110 @@
+"""Shared query-parameter parsing for list endpoints (cursors, spatial and event type filters)."""
+
+import base64
+import json
+import math
+from datetime import date, datetime
+from typing import Any
+
+import h3
+from fastapi import HTTPException, Query, status
+from shapely import wkt
+from shapely.errors import ShapelyError
+
+from backend.app.models.event import ALL_EVENT_TYPES
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset position values into an opaque URL-safe cursor."""
+    raw = json.dumps([value.isoformat() if hasattr(value, "isoformat") else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decode a cursor produced by ``encode_cursor``; raise 400 when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def cursor_datetime(value: Any) -> datetime:
+    """Parse a cursor's timezone-aware ISO timestamp; raise 400 otherwise."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+    if parsed.tzinfo is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return parsed
+
+
+def cursor_date(value: Any) -> date:
+    """Parse a cursor's ISO date; raise 400 otherwise."""
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def cursor_float(value: Any) -> float:
+    """Check a cursor's finite numeric position; raise 400 otherwise."""
+    if not isinstance(value, int | float) or isinstance(value, bool) or not math.isfinite(value):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return float(value)
+
+
+def cursor_int(value: Any) -> int:
+    """Check a cursor's integer position; raise 400 otherwise."""
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return value
+
+
+def event_type_query() -> Any:
+    """Query parameter selecting one event type's derived rows; defaults to the all-types rollup."""
+    return Query(
+        default=ALL_EVENT_TYPES,
+        min_length=2,
+        max_length=64,
+        description=f"Event type to read risk for; '{ALL_EVENT_TYPES}' (default) counts every type",
+    )
+
+
+def parse_h3_cell(h3_index: str, detail: str = "Invalid H3 cell") -> int:
+    """Validate a hex H3 cell from a request and return the 64-bit id stored in the database."""
+    if not h3.is_valid_cell(h3_index):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+    return h3.str_to_int(h3_index)
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """Parse 'min_lon,min_lat,max_lon,max_lat' into a validated WGS84 envelope."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in bbox.split(","))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="bbox must be 'min_lon,min_lat,max_lon,max_lat'",
+        ) from exc
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="bbox is out of range")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def parse_polygon_wkt(polygon: str) -> str:
+    """Validate a WGS84 (Multi)Polygon WKT filter and return it normalized."""
+    try:
+        shape = wkt.loads(polygon)
+    except ShapelyError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="polygon is not valid WKT") from exc
+    if shape.geom_type not in ("Polygon", "MultiPolygon") or not shape.is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="polygon must be a valid Polygon or MultiPolygon",
+        )
+    return str(shape.wkt)
@@ -0,0 +1,150 @@
+"""Response bodies for bulk reads: negotiated formats fed straight from DB rows.
+
+Rows are encoded from SQLAlchemy mappings without building a Pydantic model per
+row. JSON and NDJSON use orjson; MessagePack and Arrow IPC are optional
+dependencies and negotiate to 406 when they are not installed.
+"""
+
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping, TextClause
+
+from backend.app.db.session import AsyncSessionLocal
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+STREAM_BATCH_SIZE = 2000
+ARROW_END_OF_STREAM = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+JSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+_MEDIA_ALIASES = {"application/x-msgpack": MSGPACK_MEDIA_TYPE, "application/vnd.msgpack": MSGPACK_MEDIA_TYPE}
+
+
+def negotiate_media_type(accept: str) -> str:
+    """Pick the response format from an Accept header, defaulting to JSON."""
+    requested = [part.split(";")[0].strip().lower() for part in accept.split(",")]
+    for media_type in requested:
+        media_type = _MEDIA_ALIASES.get(media_type, media_type)
+        if media_type == MSGPACK_MEDIA_TYPE and msgpack is None:
+            raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail="MessagePack support not installed")
+        if media_type == ARROW_MEDIA_TYPE and pa is None:
+            raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail="Arrow support not installed")
+        if media_type in {NDJSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, ARROW_MEDIA_TYPE}:
+            return media_type
+    return JSON_MEDIA_TYPE
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def _record_batch(rows: Sequence[RowMapping], schema: Any = None) -> Any:
+    # Columns are gathered straight from the mappings; nested JSON stays a JSON string column.
+    columns: dict[str, list[Any]] = {key: [] for key in rows[0].keys()} if rows else {}
+    for row in rows:
+        for key, value in row.items():
+            columns[key].append(orjson.dumps(value).decode() if isinstance(value, dict) else value)
+    if schema is not None:
+        return pa.RecordBatch.from_pydict(columns, schema=schema)
+    batch = pa.RecordBatch.from_pydict(columns)
+    # An all-null first batch infers the null type; widen it so later batches can carry values.
+    fields = [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in batch.schema]
+    return batch.cast(pa.schema(fields))
+
+
+def encode_rows(rows: Sequence[RowMapping], media_type: str) -> bytes:
+    """Encode one page of rows in the negotiated format."""
+    if media_type == ARROW_MEDIA_TYPE:
+        sink = pa.BufferOutputStream()
+        batch = _record_batch(rows) if rows else None
+        with pa.ipc.new_stream(sink, batch.schema if batch is not None else pa.schema([])) as writer:
+            if batch is not None:
+                writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return b"".join(msgpack.packb(dict(row), default=_msgpack_default) for row in rows)
+    if media_type == NDJSON_MEDIA_TYPE:
+        return b"".join(orjson.dumps(dict(row), option=JSON_OPTIONS | orjson.OPT_APPEND_NEWLINE) for row in rows)
+    return orjson.dumps([dict(row) for row in rows], option=JSON_OPTIONS)
+
+
+def rows_response(rows: Sequence[RowMapping], media_type: str, headers: dict[str, str] | None = None) -> Response:
+    """Build a page response in the negotiated format."""
+    return Response(content=encode_rows(rows, media_type), media_type=media_type, headers=headers)
+
+
+async def _stream_partitions(statement: TextClause, params: dict[str, Any]) -> AsyncIterator[Sequence[RowMapping]]:
+    # The session is owned by the generator so it lives exactly as long as the response body.
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(statement.execution_options(yield_per=STREAM_BATCH_SIZE), params)
+        async for partition in result.mappings().partitions():
+            yield partition
+
+
+async def stream_ndjson(statement: TextClause, params: dict[str, Any]) -> AsyncIterator[bytes]:
+    """Stream rows as NDJSON, one batch per chunk."""
+    async for partition in _stream_partitions(statement, params):
+        yield encode_rows(partition, NDJSON_MEDIA_TYPE)
+
+
+async def stream_msgpack(statement: TextClause, params: dict[str, Any]) -> AsyncIterator[bytes]:
+    """Stream rows as a sequence of MessagePack maps, one batch per chunk."""
+    async for partition in _stream_partitions(statement, params):
+        yield encode_rows(partition, MSGPACK_MEDIA_TYPE)
+
+
+async def stream_json_array(statement: TextClause, params: dict[str, Any]) -> AsyncIterator[bytes]:
+    """Stream rows as one JSON array without materializing the result set."""
+    yield b"["
+    first = True
+    async for partition in _stream_partitions(statement, params):
+        chunk = b",".join(orjson.dumps(dict(row), option=JSON_OPTIONS) for row in partition)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
+
+
+async def stream_arrow(statement: TextClause, params: dict[str, Any]) -> AsyncIterator[bytes]:
+    """Stream rows as an Arrow IPC stream, one record batch per partition."""
+    schema = None
+    async for partition in _stream_partitions(statement, params):
+        batch = _record_batch(partition, schema)
+        if schema is None:
+            schema = batch.schema
+            yield schema.serialize().to_pybytes()
+        yield batch.serialize().to_pybytes()
+    if schema is None:
+        yield pa.schema([]).serialize().to_pybytes()
+    yield ARROW_END_OF_STREAM
+
+
+_STREAMERS = {
+    JSON_MEDIA_TYPE: stream_json_array,
+    NDJSON_MEDIA_TYPE: stream_ndjson,
+    MSGPACK_MEDIA_TYPE: stream_msgpack,
+    ARROW_MEDIA_TYPE: stream_arrow,
+}
+
+
+def streaming_response(statement: TextClause, params: dict[str, Any], media_type: str) -> StreamingResponse:
+    """Stream every row of a statement in the negotiated format."""
+    return StreamingResponse(_STREAMERS[media_type](statement, params), media_type=media_type)
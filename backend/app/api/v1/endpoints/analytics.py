@@ -2,19 +2,50 @@
 
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from sqlalchemy.orm import Session
 
+from backend.app.analytics.pipeline import RunNotFoundError, create_run, get_run, pending_stages
 from backend.app.api.deps import require_role
 from backend.app.core.config import get_settings
 from backend.app.core.rate_limit import limiter
+from backend.app.db.session import get_db
+from backend.app.models.analytics_run import AnalyticsRun
 from backend.app.models.user import UserRole
-from backend.app.schemas.analytics import AnalyticsRunResponse
-from backend.app.worker.tasks import run_analytics_pipeline
+from backend.app.schemas.analytics import AnalyticsRunRecord, AnalyticsRunResponse
+from backend.app.worker.tasks import dispatch_run
 
 router = APIRouter(prefix="/analytics")
 settings = get_settings()
 
 
+def load_run(db: Session, run_id: int) -> AnalyticsRun:
+    """Fetch a run or raise 404."""
+    try:
+        return get_run(db, run_id)
+    except RunNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+def run_record(run: AnalyticsRun) -> AnalyticsRunRecord:
+    """Serialize a run with its remaining stages."""
+    return AnalyticsRunRecord(
+        id=run.id,
+        start_datetime=run.start_datetime,
+        end_datetime=run.end_datetime,
+        resolution=run.resolution,
+        status=run.status,
+        completed_stages=run.completed_stages,
+        pending_stages=pending_stages(run),
+        row_counts=run.row_counts,
+        newly_flagged_count=len(run.newly_flagged),
+        last_error=run.last_error,
+        failed_attempts=run.failed_attempts,
+        created_at=run.created_at,
+        updated_at=run.updated_at,
+    )
+
+
 @router.post("/run", response_model=AnalyticsRunResponse)
 @limiter.limit(settings.rate_limit_analyst)
 def run_analytics(
@@ -22,11 +53,43 @@ def run_analytics(
     start_datetime: datetime | None = Query(default=None),
     end_datetime: datetime | None = Query(default=None),
     resolution: int = Query(default=8, ge=7, le=8),
+    db: Session = Depends(get_db),
     _: object = Depends(require_role(UserRole.admin, UserRole.analyst)),
 ) -> AnalyticsRunResponse:
-    """Schedule analytics pipeline in Celery."""
+    """Record a pipeline run and queue its stage chain in Celery; the run id tracks and resumes it."""
     _ = request
     end_dt = end_datetime or datetime.now(UTC)
     start_dt = start_datetime or (end_dt - timedelta(days=30))
-    task = run_analytics_pipeline.delay(start_dt.isoformat(), end_dt.isoformat(), resolution)
-    return AnalyticsRunResponse(task_id=task.id, status="queued")
+    run_id = create_run(db, start_dt, end_dt, resolution)
+    result = dispatch_run(run_id)
+    return AnalyticsRunResponse(task_id=result.id, status="queued", run_id=run_id)
+
+
+@router.get("/runs/{run_id}", response_model=AnalyticsRunRecord)
+@limiter.limit(settings.rate_limit_analyst)
+def get_analytics_run(
+    request: Request,
+    run_id: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    _: object = Depends(require_role(UserRole.admin, UserRole.analyst)),
+) -> AnalyticsRunRecord:
+    """Return a pipeline run's window, committed stages and row counts."""
+    _ = request
+    return run_record(load_run(db, run_id))
+
+
+@router.post("/runs/{run_id}/resume", response_model=AnalyticsRunResponse)
+@limiter.limit(settings.rate_limit_analyst)
+def resume_analytics_run(
+    request: Request,
+    run_id: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    _: object = Depends(require_role(UserRole.admin, UserRole.analyst)),
+) -> AnalyticsRunResponse:
+    """Requeue a failed or interrupted run from its first uncommitted stage."""
+    _ = request
+    run = load_run(db, run_id)
+    if not pending_stages(run):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Analytics run {run_id} already completed")
+    result = dispatch_run(run_id)
+    return AnalyticsRunResponse(task_id=result.id, status="queued", run_id=run_id)
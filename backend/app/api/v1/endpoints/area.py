@@ -0,0 +1,130 @@
+"""Area risk queries resolved through H3 cover sets (bbox, radius, k-ring)."""
+
+from datetime import date
+
+import h3
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.api.params import event_type_query, parse_bbox
+from backend.app.core.config import get_settings
+from backend.app.core.rate_limit import limiter
+from backend.app.db.session import get_async_db
+from backend.app.schemas.analytics import RiskCellResponse
+from backend.app.services.h3_cover import CoverTooLargeError, bbox_cells, kring_cells, radius_cells
+
+router = APIRouter(prefix="/risk/area")
+settings = get_settings()
+
+MAX_RANGE_DAYS = 90
+
+AREA_CELLS_SQL = text(
+    """
+    SELECT
+        to_hex(h3_index) AS h3_index,
+        time_bucket,
+        event_count,
+        rolling_7d_avg,
+        growth_rate,
+        risk_score,
+        risk_level::text AS risk_level,
+        flagged AS anomaly_flagged
+    FROM mv_daily_risk
+    WHERE h3_index = ANY(CAST(:cells AS BIGINT[]))
+      AND event_type = :event_type
+      AND time_bucket BETWEEN :start_date AND :end_date
+    ORDER BY time_bucket DESC, risk_score DESC
+    """
+)
+
+
+def check_range(start_date: date, end_date: date) -> None:
+    """Reject inverted or oversize date ranges."""
+    if end_date < start_date or (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Date range must cover 1-{MAX_RANGE_DAYS} days",
+        )
+
+
+async def fetch_cells(
+    db: AsyncSession, cells: list[str], start_date: date, end_date: date, event_type: str
+) -> list[RiskCellResponse]:
+    """Fetch risk rows for a cell set with index lookups on (h3_index, event_type, time_bucket)."""
+    if not cells:
+        return []
+    result = await db.execute(
+        AREA_CELLS_SQL,
+        {
+            "cells": [h3.str_to_int(cell) for cell in cells],
+            "event_type": event_type,
+            "start_date": start_date,
+            "end_date": end_date,
+        },
+    )
+    return [RiskCellResponse(**row) for row in result.mappings()]
+
+
+@router.get("/bbox", response_model=list[RiskCellResponse])
+@limiter.limit(settings.rate_limit_public)
+async def get_risk_in_bbox(
+    request: Request,
+    bbox: str = Query(..., description="min_lon,min_lat,max_lon,max_lat"),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    resolution: int = Query(default=8, ge=7, le=8),
+    db: AsyncSession = Depends(get_async_db),
+    event_type: str = event_type_query(),
+) -> list[RiskCellResponse]:
+    """Return risk for cells overlapping a viewport."""
+    _ = request
+    check_range(start_date, end_date)
+    min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+    try:
+        cells = bbox_cells(min_lon, min_lat, max_lon, max_lat, resolution)
+    except CoverTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    return await fetch_cells(db, cells, start_date, end_date, event_type)
+
+
+@router.get("/radius", response_model=list[RiskCellResponse])
+@limiter.limit(settings.rate_limit_public)
+async def get_risk_in_radius(
+    request: Request,
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_m: float = Query(..., gt=0, le=200_000),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    resolution: int = Query(default=8, ge=7, le=8),
+    db: AsyncSession = Depends(get_async_db),
+    event_type: str = event_type_query(),
+) -> list[RiskCellResponse]:
+    """Return risk for cells around a point, e.g. a substation."""
+    _ = request
+    check_range(start_date, end_date)
+    try:
+        cells = radius_cells(latitude, longitude, radius_m, resolution)
+    except CoverTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    return await fetch_cells(db, cells, start_date, end_date, event_type)
+
+
+@router.get("/kring", response_model=list[RiskCellResponse])
+@limiter.limit(settings.rate_limit_public)
+async def get_risk_in_kring(
+    request: Request,
+    h3_index: str = Query(...),
+    k: int = Query(default=1, ge=0, le=50),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: AsyncSession = Depends(get_async_db),
+    event_type: str = event_type_query(),
+) -> list[RiskCellResponse]:
+    """Return risk for a cell and its neighbours within grid distance k."""
+    _ = request
+    check_range(start_date, end_date)
+    if not h3.is_valid_cell(h3_index):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid H3 cell")
+    return await fetch_cells(db, kring_cells(h3_index, k), start_date, end_date, event_type)
@@ -6,10 +6,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from backend.app.api.deps import AuthenticatedUser, get_current_user, require_role
 from backend.app.core.config import get_settings
+from backend.app.core.revocation import publish_token_version, revoke_token, token_status_cache
 from backend.app.core.security import create_access_token, verify_password
 from backend.app.db.session import get_db
-from backend.app.models.user import User
+from backend.app.models.user import User, UserRole
 from backend.app.schemas.auth import TokenRequest, TokenResponse
 
 router = APIRouter(prefix="/auth")
@@ -23,9 +25,33 @@ def get_token(payload: TokenRequest, db: Session = Depends(get_db)) -> TokenResp
     if not user or not verify_password(payload.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    publish_token_version(user.username, user.token_version)
     token = create_access_token(
         subject=user.username,
         role=user.role.value,
         expires_delta=timedelta(minutes=settings.jwt_expiration_minutes),
+        token_version=user.token_version,
     )
     return TokenResponse(access_token=token)
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_current_token(current_user: AuthenticatedUser = Depends(get_current_user)) -> None:
+    """Denylist the bearer token until its expiry."""
+    revoke_token(current_user.username, current_user.jti, current_user.expires_at)
+
+
+@router.post("/users/{username}/revoke", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_user_tokens(
+    username: str,
+    db: Session = Depends(get_db),
+    _: AuthenticatedUser = Depends(require_role(UserRole.admin)),
+) -> None:
+    """Invalidate every outstanding token of a user by bumping their token version."""
+    user = db.scalar(select(User).where(User.username == username))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    user.token_version += 1
+    db.commit()
+    publish_token_version(user.username, user.token_version)
+    token_status_cache.evict_user(user.username)
@@ -1,22 +1,60 @@
 """Event ingestion and retrieval endpoints."""
 
+import csv
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy import text
+import psycopg
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import TextClause, text
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.app.api.deps import require_role
+from backend.app.api.params import (
+    cursor_datetime,
+    cursor_int,
+    decode_cursor,
+    encode_cursor,
+    parse_bbox,
+    parse_polygon_wkt,
+)
+from backend.app.api.streaming import (
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    negotiate_media_type,
+    rows_response,
+    streaming_response,
+)
 from backend.app.core.config import get_settings
+from backend.app.core.ingest_stream import enqueue_events, stream_backlog
 from backend.app.core.rate_limit import limiter
-from backend.app.db.session import get_db
+from backend.app.db.session import SessionLocal, get_async_db, get_db
 from backend.app.models.user import UserRole
-from backend.app.schemas.event import EventResponse, EventUploadRequest
-from backend.app.services.ingestion import ingest_events
+from backend.app.schemas.event import (
+    EventResponse,
+    EventUploadItem,
+    EventUploadRequest,
+    QueuedUploadResponse,
+    StreamUploadResponse,
+    UploadBatchResult,
+    UploadRowError,
+)
+from backend.app.services.ingestion import ingest_events, parse_csv_row
 
 router = APIRouter(prefix="/events")
 settings = get_settings()
 
+DEFAULT_PAGE_SIZE = 500
+CSV_MEDIA_TYPE = "text/csv"
+MAX_LINE_BYTES = 1 << 20
+MAX_REPORTED_ERRORS = 1000
+BACKLOG_RETRY_AFTER_SECONDS = 5
+
 
 @router.post("/upload")
 @limiter.limit(settings.rate_limit_analyst)
@@ -26,47 +64,224 @@ def upload_events(
     db: Session = Depends(get_db),
     _: object = Depends(require_role(UserRole.admin, UserRole.analyst)),
 ) -> dict[str, int]:
-    """Bulk-upload event records."""
+    """Bulk-upload event records via COPY, committing once per ingest batch.
+
+    Events with an ``event_key`` (or every event when ``INGEST_DEDUPLICATE`` is on)
+    are skipped if already stored and counted under ``duplicates``.
+    """
     _ = request
     inserted = ingest_events(db, payload.events)
-    return {"inserted": inserted}
+    return {"inserted": inserted, "duplicates": len(payload.events) - inserted}
+
+
+@router.post("/upload/async", response_model=QueuedUploadResponse, status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit(settings.rate_limit_analyst)
+async def upload_events_async(
+    request: Request,
+    payload: EventUploadRequest,
+    _: object = Depends(require_role(UserRole.admin, UserRole.analyst)),
+) -> QueuedUploadResponse:
+    """Validate events and queue them on the Redis ingest stream; a consumer writes them in large batches.
+
+    Returns 202 once the events are durable in Redis. When the unwritten backlog would
+    exceed ``INGEST_STREAM_MAX_BACKLOG`` the request is refused with 503 and
+    ``Retry-After`` so producers slow down instead of growing Redis without bound.
+    """
+    _ = request
+    backlog = await stream_backlog()
+    if backlog + len(payload.events) > settings.ingest_stream_max_backlog:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ingest backlog is full; retry later",
+            headers={"Retry-After": str(BACKLOG_RETRY_AFTER_SECONDS)},
+        )
+    entry_ids = await enqueue_events(payload.events)
+    return QueuedUploadResponse(
+        queued=len(entry_ids),
+        backlog=backlog + len(entry_ids),
+        last_id=entry_ids[-1] if entry_ids else None,
+    )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a streamed request body into lines without buffering the whole body."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        if len(pending) > MAX_LINE_BYTES:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Input line too long")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if pending:
+        yield pending.rstrip(b"\r")
+
+
+def describe_error(exc: Exception) -> str:
+    """Compact, single-line description of a row parse or validation failure."""
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors())
+    if isinstance(exc, KeyError):
+        return f"missing column {exc}"
+    if isinstance(exc, DBAPIError) and exc.orig is not None:
+        return str(exc.orig).strip().splitlines()[0]
+    return str(exc).strip().splitlines()[0] if str(exc).strip() else type(exc).__name__
+
+
+async def commit_batch(db: Session, batch: list[EventUploadItem], summary: StreamUploadResponse) -> None:
+    """COPY one batch off the event loop and record its outcome; a failed batch is rolled back.
+
+    Driver errors surface either directly (psycopg) or wrapped by SQLAlchemy on flush/commit;
+    both end the batch, not the upload.
+    """
+    result = UploadBatchResult(batch=len(summary.batches) + 1, inserted=0)
+    try:
+        result.inserted = await run_in_threadpool(ingest_events, db, batch, len(batch))
+        result.duplicates = len(batch) - result.inserted
+    except (psycopg.Error, SQLAlchemyError) as exc:
+        await run_in_threadpool(db.rollback)
+        result.error = describe_error(exc)
+    summary.inserted += result.inserted
+    summary.duplicates += result.duplicates
+    summary.batches.append(result)
+    batch.clear()
+
+
+@router.post("/upload/stream", response_model=StreamUploadResponse)
+@limiter.limit(settings.rate_limit_analyst)
+async def upload_events_stream(
+    request: Request,
+    _: object = Depends(require_role(UserRole.admin, UserRole.analyst)),
+) -> StreamUploadResponse:
+    """Stream an NDJSON or CSV body into events, committing per batch and skipping bad rows.
+
+    Rows are validated as they arrive and written in ``INGEST_BATCH_SIZE`` batches, so
+    memory is bounded by one batch. CSV input needs a header row and no quoted newlines.
+    Line numbers in ``errors`` are 1-based and count the CSV header.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in {NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE}:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send {NDJSON_MEDIA_TYPE} or {CSV_MEDIA_TYPE}",
+        )
+
+    summary = StreamUploadResponse(inserted=0, rejected=0, batches=[], errors=[])
+    header: list[str] | None = None
+    batch: list[EventUploadItem] = []
+
+    with SessionLocal() as db:
+        line_number = 0
+        async for line in iter_lines(request.stream()):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                if content_type == NDJSON_MEDIA_TYPE:
+                    item = EventUploadItem.model_validate_json(line)
+                elif header is None:
+                    header = next(csv.reader([line.decode()]))
+                    continue
+                else:
+                    item = parse_csv_row(dict(zip(header, next(csv.reader([line.decode()])), strict=True)))
+            except (KeyError, TypeError, ValueError) as exc:
+                summary.rejected += 1
+                if len(summary.errors) < MAX_REPORTED_ERRORS:
+                    summary.errors.append(UploadRowError(line=line_number, error=describe_error(exc)))
+                continue
+            batch.append(item)
+            if len(batch) >= settings.ingest_batch_size:
+                await commit_batch(db, batch, summary)
+        if batch:
+            await commit_batch(db, batch, summary)
+    return summary
+
+
+def build_event_query(
+    event_type: str | None,
+    start_datetime: datetime | None,
+    end_datetime: datetime | None,
+    bbox: str | None,
+    polygon: str | None,
+    cursor: str | None,
+    limit: int | None,
+) -> tuple[TextClause, dict[str, Any]]:
+    """Build the event listing query; only supplied filters become predicates so indexes stay usable."""
+    clauses: list[str] = []
+    params: dict[str, Any] = {}
+    if event_type is not None:
+        clauses.append("event_type = :event_type")
+        params["event_type"] = event_type
+    if start_datetime is not None:
+        clauses.append("event_timestamp >= :start_datetime")
+        params["start_datetime"] = start_datetime
+    if end_datetime is not None:
+        clauses.append("event_timestamp <= :end_datetime")
+        params["end_datetime"] = end_datetime
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+        clauses.append("geom && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)")
+        params.update({"min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat})
+    if polygon is not None:
+        clauses.append("ST_Intersects(geom, ST_GeomFromText(:polygon_wkt, 4326))")
+        params["polygon_wkt"] = parse_polygon_wkt(polygon)
+    if cursor is not None:
+        cursor_timestamp, cursor_id = decode_cursor(cursor, 2)
+        # Row comparison matches the (event_timestamp, id) primary key for a backward index scan.
+        clauses.append("(event_timestamp, id) < (CAST(:cursor_timestamp AS TIMESTAMPTZ), CAST(:cursor_id AS BIGINT))")
+        params.update({"cursor_timestamp": cursor_datetime(cursor_timestamp), "cursor_id": cursor_int(cursor_id)})
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    limit_clause = ""
+    if limit is not None:
+        limit_clause = "LIMIT :limit"
+        params["limit"] = limit
+    statement = text(
+        f"""
+        SELECT
+            id,
+            event_type,
+            event_timestamp,
+            ST_X(geom::geometry) AS longitude,
+            ST_Y(geom::geometry) AS latitude,
+            attributes_json
+        FROM events
+        {where}
+        ORDER BY event_timestamp DESC, id DESC
+        {limit_clause}
+        """
+    )
+    return statement, params
 
 
 @router.get("", response_model=list[EventResponse])
 @limiter.limit(settings.rate_limit_public)
-def list_events(
+async def list_events(
     request: Request,
-    db: Session = Depends(get_db),
-    limit: int = Query(default=500, le=5000),
+    db: AsyncSession = Depends(get_async_db),
+    limit: int | None = Query(default=None, ge=1, le=5000),
     event_type: str | None = Query(default=None),
     start_datetime: datetime | None = Query(default=None),
     end_datetime: datetime | None = Query(default=None),
-) -> list[EventResponse]:
-    """Return events with optional temporal and type filtering."""
-    _ = request
-    rows = db.execute(
-        text(
-            """
-            SELECT
-                id,
-                event_type,
-                event_timestamp,
-                ST_X(geom::geometry) AS longitude,
-                ST_Y(geom::geometry) AS latitude,
-                attributes_json
-            FROM events
-            WHERE (CAST(:event_type AS VARCHAR) IS NULL OR event_type = :event_type)
-              AND (CAST(:start_datetime AS TIMESTAMPTZ) IS NULL OR event_timestamp >= :start_datetime)
-              AND (CAST(:end_datetime AS TIMESTAMPTZ) IS NULL OR event_timestamp <= :end_datetime)
-            ORDER BY event_timestamp DESC
-            LIMIT :limit
-            """
-        ),
-        {
-            "event_type": event_type,
-            "start_datetime": start_datetime,
-            "end_datetime": end_datetime,
-            "limit": limit,
-        },
-    ).mappings()
-    return [EventResponse(**row) for row in rows]
+    bbox: str | None = Query(default=None, description="min_lon,min_lat,max_lon,max_lat"),
+    polygon: str | None = Query(default=None, description="WKT Polygon/MultiPolygon in EPSG:4326"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+) -> Response:
+    """Return events newest-first with keyset pagination and spatial/temporal/type filters.
+
+    JSON pages default to 500 rows and carry ``X-Next-Cursor`` when more rows remain.
+    NDJSON, MessagePack and Arrow IPC (via ``Accept``) stream every matching row (or ``limit`` rows).
+    """
+    media_type = negotiate_media_type(request.headers.get("accept", ""))
+    if media_type != JSON_MEDIA_TYPE:
+        statement, params = build_event_query(event_type, start_datetime, end_datetime, bbox, polygon, cursor, limit)
+        return streaming_response(statement, params, media_type)
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    statement, params = build_event_query(event_type, start_datetime, end_datetime, bbox, polygon, cursor, page_size)
+    result = await db.execute(statement, params)
+    rows = result.mappings().all()
+    headers = {}
+    if len(rows) == page_size:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1]["event_timestamp"], rows[-1]["id"])
+    return rows_response(rows, media_type, headers)
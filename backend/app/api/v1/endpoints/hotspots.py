@@ -1,51 +1,121 @@
 """Hotspot detection read endpoint."""
 
 from datetime import date
+from typing import Any
 
-from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import TextClause, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.app.api.params import (
+    cursor_date,
+    cursor_int,
+    decode_cursor,
+    encode_cursor,
+    event_type_query,
+    parse_bbox,
+)
+from backend.app.api.streaming import negotiate_media_type, rows_response
 from backend.app.core.config import get_settings
 from backend.app.core.rate_limit import limiter
-from backend.app.db.session import get_db
+from backend.app.db.session import get_async_db
+from backend.app.models.event import ALL_EVENT_TYPES
+from backend.app.schemas.analytics import HotspotResponse
 
 router = APIRouter(prefix="/hotspots")
 settings = get_settings()
 
+MAX_RANGE_DAYS = 90
 
-@router.get("")
+
+def build_hotspot_query(
+    start_date: date,
+    end_date: date,
+    top_k: int | None,
+    bbox: str | None,
+    cursor: str | None,
+    limit: int,
+    min_gi_zscore: float | None = None,
+    event_type: str = ALL_EVENT_TYPES,
+) -> tuple[TextClause, dict[str, Any]]:
+    """Build the ranked hotspot query; rows come off ``uq_hotspots_type_time_rank`` in order."""
+    clauses = ["event_type = :event_type", "time_bucket BETWEEN :start_date AND :end_date"]
+    params: dict[str, Any] = {"event_type": event_type, "start_date": start_date, "end_date": end_date, "limit": limit}
+    if top_k is not None:
+        clauses.append("rank <= :top_k")
+        params["top_k"] = top_k
+    if min_gi_zscore is not None:
+        clauses.append("gi_zscore >= :min_gi_zscore")
+        params["min_gi_zscore"] = min_gi_zscore
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+        clauses.append("geom && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)")
+        params.update({"min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat})
+    if cursor is not None:
+        cursor_day, cursor_rank = decode_cursor(cursor, 2)
+        clauses.append(
+            "(time_bucket < CAST(:cursor_date AS DATE) OR (time_bucket = CAST(:cursor_date AS DATE) AND rank > :cursor_rank))"
+        )
+        params.update({"cursor_date": cursor_date(cursor_day), "cursor_rank": cursor_int(cursor_rank)})
+
+    statement = text(
+        f"""
+        SELECT
+            to_hex(h3_index) AS h3_index,
+            time_bucket,
+            rank,
+            risk_score,
+            risk_level::text AS risk_level,
+            growth_rate,
+            anomaly_flagged,
+            gi_zscore,
+            reasons
+        FROM hotspots
+        WHERE {' AND '.join(clauses)}
+        ORDER BY time_bucket DESC, rank
+        LIMIT :limit
+        """
+    )
+    return statement, params
+
+
+@router.get("", response_model=list[HotspotResponse])
 @limiter.limit(settings.rate_limit_public)
-def get_hotspots(
+async def get_hotspots(
     request: Request,
     start_date: date = Query(...),
     end_date: date = Query(...),
-    db: Session = Depends(get_db),
-) -> list[dict[str, object]]:
-    """Return emerging hotspots for date range."""
-    _ = request
-    rows = db.execute(
-        text(
-            """
-            SELECT
-                r.h3_index,
-                r.time_bucket,
-                r.risk_score,
-                r.risk_level::text AS risk_level,
-                c.growth_rate,
-                COALESCE(a.flagged, false) AS anomaly_flagged
-            FROM risk_scores r
-            JOIN cell_aggregates c
-              ON c.h3_index = r.h3_index
-             AND c.time_bucket = r.time_bucket
-            LEFT JOIN anomaly_flags a
-              ON a.h3_index = r.h3_index
-             AND a.time_bucket = r.time_bucket
-            WHERE r.time_bucket BETWEEN :start_date AND :end_date
-              AND (r.risk_level IN ('high', 'critical') OR COALESCE(a.flagged, false) = true)
-            ORDER BY r.time_bucket DESC, r.risk_score DESC
-            """
-        ),
-        {"start_date": start_date, "end_date": end_date},
-    ).mappings()
-    return [dict(row) for row in rows]
+    db: AsyncSession = Depends(get_async_db),
+    top_k: int | None = Query(default=None, ge=1, description="Keep each day's K highest-ranked hotspots"),
+    bbox: str | None = Query(default=None, description="min_lon,min_lat,max_lon,max_lat"),
+    min_gi_zscore: float | None = Query(
+        default=None, description="Keep spatial clusters: Gi* z-score at least this (1.96 is 95% significance)"
+    ),
+    limit: int = Query(default=1000, ge=1, le=5000),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    event_type: str = event_type_query(),
+) -> Response:
+    """Return ranked hotspots for a date range, newest day first and by daily rank.
+
+    Ranks are national per event type and day, so ``top_k`` combined with ``bbox`` returns the
+    day's top-K hotspots that fall inside the box. ``gi_zscore`` is the cell's
+    Getis-Ord Gi* score over its H3 neighborhood; ``min_gi_zscore`` keeps cells
+    whose neighbors surge with them and drops isolated spikes (all-types rollup only). ``Accept`` selects JSON, NDJSON,
+    MessagePack or Arrow IPC.
+    """
+    media_type = negotiate_media_type(request.headers.get("accept", ""))
+    if end_date < start_date or (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Date range must cover 1-{MAX_RANGE_DAYS} days",
+        )
+
+    statement, params = build_hotspot_query(
+        start_date, end_date, top_k, bbox, cursor, limit, min_gi_zscore, event_type
+    )
+    result = await db.execute(statement, params)
+    rows = result.mappings().all()
+    headers = {}
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1]["time_bucket"], rows[-1]["rank"])
+    return rows_response(rows, media_type, headers)
@@ -1,52 +1,270 @@
 """Risk read endpoints."""
 
 from datetime import date
+from typing import Any
 
-from fastapi import APIRouter, Depends, Path, Request
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+import h3
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from h3.api import basic_int as h3_int
+from sqlalchemy import TextClause, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.app.api.params import (
+    cursor_float,
+    decode_cursor,
+    encode_cursor,
+    event_type_query,
+    parse_bbox,
+    parse_h3_cell,
+)
+from backend.app.api.streaming import negotiate_media_type, rows_response, streaming_response
 from backend.app.core.config import get_settings
 from backend.app.core.rate_limit import limiter
-from backend.app.db.session import get_db
-from backend.app.schemas.analytics import RiskCellResponse
+from backend.app.db.session import get_async_db
+from backend.app.models.event import ALL_EVENT_TYPES
+from backend.app.models.risk_score import RiskLevel
+from backend.app.schemas.analytics import RiskCellHistoryResponse, RiskCellResponse, RiskForecastResponse
 
 router = APIRouter(prefix="/risk")
 settings = get_settings()
 
+# Scored cells are resolution 7 or 8; coarser parents would expand to millions of children.
+CELL_RESOLUTIONS = (7, 8)
+MIN_PARENT_RESOLUTION = 3
+MAX_HISTORY_DAYS = 366
+
+CELL_HISTORY_SQL = text(
+    """
+    SELECT
+        COALESCE(array_agg(time_bucket ORDER BY time_bucket), '{}') AS dates,
+        COALESCE(array_agg(event_count ORDER BY time_bucket), '{}') AS event_count,
+        COALESCE(array_agg(rolling_7d_avg ORDER BY time_bucket), '{}') AS rolling_7d_avg,
+        COALESCE(array_agg(growth_rate ORDER BY time_bucket), '{}') AS growth_rate,
+        COALESCE(array_agg(risk_score ORDER BY time_bucket), '{}') AS risk_score,
+        COALESCE(array_agg(risk_level::text ORDER BY time_bucket), '{}') AS risk_level,
+        COALESCE(array_agg(flagged ORDER BY time_bucket), '{}') AS anomaly_flagged
+    FROM mv_daily_risk
+    WHERE h3_index = :h3_index
+      AND event_type = :event_type
+      AND time_bucket BETWEEN :start_date AND :end_date
+    """
+)
+
+
+def parse_risk_levels(risk_level: str) -> list[str]:
+    """Parse a comma-separated risk level set."""
+    levels = [level.strip() for level in risk_level.split(",") if level.strip()]
+    unknown = set(levels) - {level.value for level in RiskLevel}
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown risk level(s): {', '.join(sorted(unknown))}",
+        )
+    return levels
+
+
+def h3_children(h3_parent: str) -> list[int]:
+    """Expand an H3 parent cell into the 64-bit ids of its descendants at the scored resolutions."""
+    parent = parse_h3_cell(h3_parent, detail="Invalid H3 parent cell")
+    resolution = h3_int.get_resolution(parent)
+    if resolution < MIN_PARENT_RESOLUTION:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"H3 parent resolution must be >= {MIN_PARENT_RESOLUTION}",
+        )
+    children: list[int] = []
+    for child_resolution in CELL_RESOLUTIONS:
+        if child_resolution >= resolution:
+            children.extend(h3_int.cell_to_children(parent, child_resolution))
+    return children
+
+
+def build_risk_query(
+    risk_date: date,
+    bbox: str | None,
+    h3_parent: str | None,
+    risk_level: str | None,
+    min_score: float | None,
+    cursor: str | None,
+    limit: int | None,
+    event_type: str = ALL_EVENT_TYPES,
+) -> tuple[TextClause, dict[str, Any]]:
+    """Build the per-day risk query against mv_daily_risk; only supplied filters become predicates."""
+    clauses = ["event_type = :event_type", "time_bucket = :risk_date"]
+    params: dict[str, Any] = {"event_type": event_type, "risk_date": risk_date}
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+        clauses.append("geom && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)")
+        params.update({"min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat})
+    if h3_parent is not None:
+        clauses.append("h3_index = ANY(CAST(:h3_cells AS BIGINT[]))")
+        params["h3_cells"] = h3_children(h3_parent)
+    if risk_level is not None:
+        clauses.append("risk_level = ANY(CAST(:risk_levels AS risk_level[]))")
+        params["risk_levels"] = parse_risk_levels(risk_level)
+    if min_score is not None:
+        clauses.append("risk_score >= :min_score")
+        params["min_score"] = min_score
+    if cursor is not None:
+        cursor_score, cursor_h3 = decode_cursor(cursor, 2)
+        if not isinstance(cursor_h3, str) or not h3.is_valid_cell(cursor_h3):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        clauses.append("(risk_score, h3_index) < (CAST(:cursor_score AS DOUBLE PRECISION), CAST(:cursor_h3 AS BIGINT))")
+        params.update({"cursor_score": cursor_float(cursor_score), "cursor_h3": h3.str_to_int(cursor_h3)})
+
+    limit_clause = ""
+    if limit is not None:
+        limit_clause = "LIMIT :limit"
+        params["limit"] = limit
+    statement = text(
+        f"""
+        SELECT
+            to_hex(h3_index) AS h3_index,
+            time_bucket,
+            event_count,
+            rolling_7d_avg,
+            growth_rate,
+            risk_score,
+            risk_level::text AS risk_level,
+            flagged AS anomaly_flagged
+        FROM mv_daily_risk
+        WHERE {' AND '.join(clauses)}
+        ORDER BY risk_score DESC, mv_daily_risk.h3_index DESC
+        {limit_clause}
+        """
+    )
+    return statement, params
+
+
+def build_forecast_query(
+    target_date: date,
+    bbox: str | None,
+    h3_parent: str | None,
+    min_score: float | None,
+    limit: int,
+) -> tuple[TextClause, dict[str, Any]]:
+    """Build the top-N forecast query for one target day, ranked off ``idx_risk_forecasts_target_score``."""
+    clauses = ["f.target_date = :target_date"]
+    params: dict[str, Any] = {"target_date": target_date, "limit": limit}
+    join = ""
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+        join = "JOIN h3_cells c ON c.h3_index = f.h3_index"
+        clauses.append("c.geom && ST_MakeEnvelope(:min_lon, :min_lat, :max_lon, :max_lat, 4326)")
+        params.update({"min_lon": min_lon, "min_lat": min_lat, "max_lon": max_lon, "max_lat": max_lat})
+    if h3_parent is not None:
+        clauses.append("f.h3_index = ANY(CAST(:h3_cells AS BIGINT[]))")
+        params["h3_cells"] = h3_children(h3_parent)
+    if min_score is not None:
+        clauses.append("f.predicted_risk_score >= :min_score")
+        params["min_score"] = min_score
+    statement = text(
+        f"""
+        SELECT
+            to_hex(f.h3_index) AS h3_index,
+            f.target_date,
+            f.issued_on,
+            f.horizon_days,
+            f.predicted_event_count,
+            f.lower_event_count,
+            f.upper_event_count,
+            f.predicted_risk_score,
+            f.predicted_risk_level::text AS predicted_risk_level
+        FROM risk_forecasts f
+        {join}
+        WHERE {' AND '.join(clauses)}
+        ORDER BY f.predicted_risk_score DESC, f.h3_index DESC
+        LIMIT :limit
+        """
+    )
+    return statement, params
+
+
+@router.get("/forecast/{target_date}", response_model=list[RiskForecastResponse])
+@limiter.limit(settings.rate_limit_public)
+async def get_risk_forecast(
+    request: Request,
+    target_date: date = Path(...),
+    db: AsyncSession = Depends(get_async_db),
+    bbox: str | None = Query(default=None, description="min_lon,min_lat,max_lon,max_lat"),
+    h3_parent: str | None = Query(default=None, description="Coarser H3 cell whose descendants to return"),
+    min_score: float | None = Query(default=None, ge=0, le=100),
+    limit: int = Query(default=1000, ge=1, le=5000),
+) -> Response:
+    """Return projected risk for a future day, highest projected risk first.
+
+    Forecasts are issued by the pipeline's forecast stage for the days after its
+    window; each row carries the day it was issued on and its horizon. ``Accept``
+    selects JSON, NDJSON, MessagePack or Arrow IPC.
+    """
+    media_type = negotiate_media_type(request.headers.get("accept", ""))
+    statement, params = build_forecast_query(target_date, bbox, h3_parent, min_score, limit)
+    result = await db.execute(statement, params)
+    return rows_response(result.mappings().all(), media_type)
+
+
+@router.get("/cells/{h3_index}/history", response_model=RiskCellHistoryResponse)
+@limiter.limit(settings.rate_limit_public)
+async def get_cell_history(
+    request: Request,
+    h3_index: str = Path(...),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: AsyncSession = Depends(get_async_db),
+    event_type: str = event_type_query(),
+) -> RiskCellHistoryResponse:
+    """Return one cell's daily series as parallel arrays, oldest day first.
+
+    The range is read with a single scan of ``uq_mv_daily_risk_h3_type_time`` and
+    aggregated in Postgres, so the response is one row regardless of length.
+    """
+    _ = request
+    cell = parse_h3_cell(h3_index)
+    if end_date < start_date or (end_date - start_date).days + 1 > MAX_HISTORY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Date range must cover 1-{MAX_HISTORY_DAYS} days",
+        )
+
+    result = await db.execute(
+        CELL_HISTORY_SQL,
+        {"h3_index": cell, "event_type": event_type, "start_date": start_date, "end_date": end_date},
+    )
+    return RiskCellHistoryResponse(h3_index=h3_index, **result.mappings().one())
+
 
 @router.get("/{risk_date}", response_model=list[RiskCellResponse])
 @limiter.limit(settings.rate_limit_public)
-def get_risk_for_date(
+async def get_risk_for_date(
     request: Request,
     risk_date: date = Path(...),
-    db: Session = Depends(get_db),
-) -> list[RiskCellResponse]:
-    """Return scored H3 cells for a specific day."""
-    _ = request
-    rows = db.execute(
-        text(
-            """
-            SELECT
-                rs.h3_index,
-                rs.time_bucket,
-                ca.event_count,
-                ca.rolling_7d_avg,
-                ca.growth_rate,
-                rs.risk_score,
-                rs.risk_level::text AS risk_level,
-                COALESCE(af.flagged, false) AS anomaly_flagged
-            FROM risk_scores rs
-            JOIN cell_aggregates ca
-              ON ca.h3_index = rs.h3_index
-             AND ca.time_bucket = rs.time_bucket
-            LEFT JOIN anomaly_flags af
-              ON af.h3_index = rs.h3_index
-             AND af.time_bucket = rs.time_bucket
-            WHERE rs.time_bucket = :risk_date
-            ORDER BY rs.risk_score DESC
-            """
-        ),
-        {"risk_date": risk_date},
-    ).mappings()
-    return [RiskCellResponse(**row) for row in rows]
+    db: AsyncSession = Depends(get_async_db),
+    bbox: str | None = Query(default=None, description="min_lon,min_lat,max_lon,max_lat"),
+    h3_parent: str | None = Query(default=None, description="Coarser H3 cell whose descendants to return"),
+    risk_level: str | None = Query(default=None, description="Comma-separated risk levels"),
+    min_score: float | None = Query(default=None, ge=0, le=100),
+    limit: int | None = Query(default=None, ge=1, le=5000, description="Top-N page size by risk score"),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    event_type: str = event_type_query(),
+) -> Response:
+    """Return scored H3 cells for a specific day, highest risk first.
+
+    With ``limit`` the response is one page with ``X-Next-Cursor`` when more rows remain;
+    without it every matching row is streamed from a server-side cursor. ``Accept`` selects
+    JSON, NDJSON, MessagePack or Arrow IPC for either mode. ``event_type`` reads one type's
+    scores (normalized within that type) instead of the all-types rollup.
+    """
+    media_type = negotiate_media_type(request.headers.get("accept", ""))
+    if limit is None:
+        statement, params = build_risk_query(
+            risk_date, bbox, h3_parent, risk_level, min_score, cursor, None, event_type
+        )
+        return streaming_response(statement, params, media_type)
+
+    statement, params = build_risk_query(risk_date, bbox, h3_parent, risk_level, min_score, cursor, limit, event_type)
+    result = await db.execute(statement, params)
+    rows = result.mappings().all()
+    headers = {}
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1]["risk_score"], rows[-1]["h3_index"])
+    return rows_response(rows, media_type, headers)
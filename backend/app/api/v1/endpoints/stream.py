@@ -0,0 +1,42 @@
+"""Server-Sent Events push of pipeline results."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import orjson
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from backend.app.core.config import get_settings
+from backend.app.core.pipeline_events import current_data_version, pipeline_broadcaster, sse_frame
+from backend.app.core.rate_limit import limiter
+
+router = APIRouter(prefix="/stream")
+settings = get_settings()
+
+HEARTBEAT_SECONDS = 15.0
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+async def pipeline_events() -> AsyncIterator[bytes]:
+    """Yield the current data version, then every pipeline result as it is published."""
+    async with pipeline_broadcaster.subscribe() as queue:
+        version = await current_data_version()
+        yield b"retry: 5000\n" + sse_frame("version", orjson.dumps({"version": version}), event_id=version)
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield b": keepalive\n\n"
+
+
+@router.get("/pipeline")
+@limiter.limit(settings.rate_limit_public)
+async def stream_pipeline_results(request: Request) -> StreamingResponse:
+    """Push committed pipeline runs: changed dates, newly flagged cells and the new data version.
+
+    The first event carries the current version so a reconnecting client can tell
+    whether it missed a run and should refetch.
+    """
+    _ = request
+    return StreamingResponse(pipeline_events(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,72 +1,99 @@
 """Vector tile endpoint."""
 
 from datetime import date
+from pathlib import Path
 
-from fastapi import APIRouter, Depends, Query, Request, Response
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.core.cache import redis_client
+from backend.app.api.params import event_type_query
+from backend.app.core.cache import async_redis_client
 from backend.app.core.config import get_settings
 from backend.app.core.rate_limit import limiter
-from backend.app.db.session import get_db
+from backend.app.db.session import get_async_db
+from backend.app.models.event import ALL_EVENT_TYPES
+from backend.app.models.risk_score import RiskLevel
+from backend.app.services.tile_archive import TileArchiveStore
+from backend.app.services.tiles import TILE_MEDIA_TYPE, render_risk_series_tile, render_risk_tile_async
 
 router = APIRouter(prefix="/tiles")
 settings = get_settings()
+MAX_SERIES_DAYS = 90
+tile_archives = TileArchiveStore(Path(settings.tile_archive_dir)) if settings.tile_archive_dir else None
 
 
 @router.get("/{z}/{x}/{y}.mvt")
 @limiter.limit(settings.rate_limit_public)
-def get_risk_tile(
+async def get_risk_tile(
     request: Request,
     z: int,
     x: int,
     y: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     risk_date: date | None = Query(default=None),
     risk_level: str | None = Query(default=None),
+    event_type: str = event_type_query(),
 ) -> Response:
-    """Serve MVT for risk layers using ST_AsMVT."""
+    """Serve MVT for risk layers from a baked archive or ST_AsMVT."""
     _ = request
-    cache_key = f"tile:{z}:{x}:{y}:{risk_date}:{risk_level}"
-    cached = redis_client.get(cache_key)
+    levels = risk_level.split(",") if risk_level else None
+
+    # Baked archives hold every level of the all-types rollup, so only unfiltered requests can be answered from them.
+    unfiltered = event_type == ALL_EVENT_TYPES and (levels is None or set(levels) >= set(RiskLevel))
+    if tile_archives is not None and risk_date is not None and unfiltered:
+        # Opening, mapping and reading archives is blocking file I/O; keep it off the event loop.
+        archived = await run_in_threadpool(tile_archives.read_tile, risk_date, z, x, y)
+        if archived is not None:
+            return Response(content=archived, media_type=TILE_MEDIA_TYPE)
+
+    cache_key = f"tile:{z}:{x}:{y}:{risk_date}:{risk_level}:{event_type}"
+    cached = await async_redis_client.get(cache_key)
     if cached:
-        return Response(content=cached, media_type="application/vnd.mapbox-vector-tile")
+        return Response(content=cached, media_type=TILE_MEDIA_TYPE)
 
-    levels = risk_level.split(",") if risk_level else None
-    tile = db.execute(
-        text(
-            """
-            WITH bounds AS (
-                SELECT ST_TileEnvelope(:z, :x, :y) AS geom
-            ),
-            source AS (
-                SELECT
-                    m.h3_index,
-                    m.time_bucket,
-                    m.event_count,
-                    m.rolling_7d_avg,
-                    m.growth_rate,
-                    m.risk_score,
-                    m.risk_level,
-                    m.flagged,
-                    ST_AsMVTGeom(ST_Transform(m.geom, 3857), b.geom, 4096, 64, true) AS geom
-                FROM mv_daily_risk m
-                CROSS JOIN bounds b
-                WHERE ST_Intersects(ST_Transform(m.geom, 3857), b.geom)
-                  AND (CAST(:risk_date AS DATE) IS NULL OR m.time_bucket = :risk_date)
-                  AND (
-                      CAST(:risk_levels AS text[]) IS NULL
-                      OR m.risk_level::text = ANY(CAST(:risk_levels AS text[]))
-                  )
-            )
-            SELECT ST_AsMVT(source, 'risk', 4096, 'geom') AS tile
-            FROM source
-            """
-        ),
-        {"z": z, "x": x, "y": y, "risk_date": risk_date, "risk_levels": levels},
-    ).scalar_one_or_none()
+    binary_tile = await render_risk_tile_async(
+        db, z, x, y, risk_date=risk_date, risk_levels=levels, event_type=event_type
+    )
+    await async_redis_client.setex(cache_key, 300, binary_tile)
+    return Response(content=binary_tile, media_type=TILE_MEDIA_TYPE)
+
+
+@router.get("/series/{z}/{x}/{y}.mvt")
+@limiter.limit(settings.rate_limit_public)
+async def get_risk_series_tile(
+    request: Request,
+    z: int,
+    x: int,
+    y: int,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: AsyncSession = Depends(get_async_db),
+    risk_level: str | None = Query(default=None),
+    v: int = Query(default=0, ge=0, description="Data version from the pipeline stream"),
+    event_type: str = event_type_query(),
+) -> Response:
+    """Serve one MVT covering a date range for client-side timeline playback.
 
-    binary_tile = tile or b""
-    redis_client.setex(cache_key, 300, binary_tile)
-    return Response(content=binary_tile, media_type="application/vnd.mapbox-vector-tile")
+    ``v`` is part of the cache key, so clients that learned of a newer pipeline run
+    skip tiles cached before it.
+    """
+    _ = request
+    span = (end_date - start_date).days + 1
+    if span < 1 or span > MAX_SERIES_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Date range must cover 1-{MAX_SERIES_DAYS} days",
+        )
+
+    cache_key = f"tile-series:{v}:{z}:{x}:{y}:{start_date}:{end_date}:{risk_level}:{event_type}"
+    cached = await async_redis_client.get(cache_key)
+    if cached:
+        return Response(content=cached, media_type=TILE_MEDIA_TYPE)
+
+    levels = risk_level.split(",") if risk_level else None
+    binary_tile = await render_risk_series_tile(
+        db, z, x, y, start_date, end_date, risk_levels=levels, event_type=event_type
+    )
+    await async_redis_client.setex(cache_key, 300, binary_tile)
+    return Response(content=binary_tile, media_type=TILE_MEDIA_TYPE)
@@ -1,9 +1,11 @@
 """Redis cache client factory."""
 
 import redis
+import redis.asyncio
 
 from backend.app.core.config import get_settings
 
 settings = get_settings()
 
 redis_client = redis.Redis.from_url(settings.redis_url, decode_responses=False)
+async_redis_client = redis.asyncio.Redis.from_url(settings.redis_url, decode_responses=False)
@@ -18,15 +18,39 @@ class Settings(BaseSettings):
 
     database_url: str
     redis_url: str
+    async_db_pool_size: int = 20
+    async_db_max_overflow: int = 40
 
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_minutes: int = 60
+    auth_status_cache_seconds: int = 30
 
     rate_limit_public: str = "60/minute"
     rate_limit_analyst: str = "240/minute"
     rate_limit_admin: str = "600/minute"
 
+    ingest_batch_size: int = 10_000
+    ingest_deduplicate: bool = False
+    ingest_bloom_capacity: int = 1_000_000
+    ingest_stream_max_backlog: int = 1_000_000
+    ingest_stream_batch_size: int = 20_000
+    ingest_stream_linger_ms: int = 250
+    ingest_stream_block_ms: int = 5_000
+    ingest_stream_claim_idle_ms: int = 60_000
+    ingest_stream_max_attempts: int = 5
+
+    analytics_trigger_debounce_seconds: float = 30.0
+    analytics_trigger_max_delay_seconds: float = 300.0
+
+    events_compress_after_days: int = 90
+    events_retention_days: int | None = None
+    derived_compress_after_days: int = 180
+    derived_retention_days: int | None = 730
+
+    tile_archive_dir: str | None = None
+    tile_archive_max_zoom: int = 12
+
 
 @lru_cache
 def get_settings() -> Settings:
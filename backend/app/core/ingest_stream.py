@@ -0,0 +1,45 @@
+"""Write-behind event ingestion through a Redis Stream.
+
+The async upload endpoint validates events and appends them to ``STREAM_KEY``,
+one entry per event, without touching Postgres. Consumers in ``CONSUMER_GROUP``
+(``python -m backend.app.worker.ingest_consumer``) drain it in large COPY
+batches and acknowledge and delete entries only after their batch commits, so
+the stream length is the unwritten backlog that producers are throttled on.
+"""
+
+from redis.exceptions import ResponseError
+
+from backend.app.core.cache import async_redis_client, redis_client
+from backend.app.core.config import get_settings
+from backend.app.schemas.event import EventUploadItem
+
+settings = get_settings()
+
+STREAM_KEY = "ingest:events"
+DEAD_LETTER_KEY = "ingest:events:dead"
+CONSUMER_GROUP = "ingest-writers"
+EVENT_FIELD = b"event"
+
+
+async def stream_backlog() -> int:
+    """Entries appended but not yet written to ``events``."""
+    length: int = await async_redis_client.xlen(STREAM_KEY)
+    return length
+
+
+async def enqueue_events(events: list[EventUploadItem]) -> list[str]:
+    """Append validated events to the ingest stream in one round trip; returns their entry ids."""
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        for item in events:
+            pipe.xadd(STREAM_KEY, {EVENT_FIELD: item.model_dump_json()})
+        entry_ids = await pipe.execute()
+    return [entry_id.decode() for entry_id in entry_ids]
+
+
+def ensure_consumer_group() -> None:
+    """Create the stream and consumer group if missing; existing groups are left alone."""
+    try:
+        redis_client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
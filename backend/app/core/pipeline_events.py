@@ -0,0 +1,117 @@
+"""Pipeline result notifications over Redis pub/sub, fanned out to SSE clients.
+
+The worker publishes one message per committed pipeline run. Each API process
+holds a single Redis subscription and copies every pre-encoded SSE frame into
+small per-client queues, so a connected dashboard costs one queue and one
+suspended generator rather than its own Redis connection.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from datetime import date, timedelta
+
+import h3
+import orjson
+from redis.exceptions import RedisError
+
+from backend.app.core.cache import async_redis_client, redis_client
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_CHANNEL = "pipeline:results"
+DATA_VERSION_KEY = "pipeline:data_version"
+MAX_FLAGGED_CELLS = 1000
+CLIENT_QUEUE_SIZE = 16
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+def publish_pipeline_result(start_date: date, end_date: date, flagged_cells: list[tuple[int, date]]) -> int:
+    """Bump the data version and announce a committed run; returns the new version.
+
+    Flagged cells arrive as 64-bit H3 ids and are published as hex strings, like the API.
+    """
+    version: int = redis_client.incr(DATA_VERSION_KEY)  # type: ignore[assignment]
+    days = (end_date - start_date).days + 1
+    message = {
+        "version": version,
+        "dates": [(start_date + timedelta(days=offset)).isoformat() for offset in range(days)],
+        "flagged_count": len(flagged_cells),
+        "flagged_cells": [
+            {"h3_index": h3.int_to_str(h3_index), "time_bucket": bucket.isoformat()}
+            for h3_index, bucket in flagged_cells[:MAX_FLAGGED_CELLS]
+        ],
+    }
+    redis_client.publish(PIPELINE_CHANNEL, orjson.dumps(message))
+    return version
+
+
+async def current_data_version() -> int:
+    """Return the latest published data version (0 before the first run)."""
+    value = await async_redis_client.get(DATA_VERSION_KEY)
+    return int(value) if value is not None else 0
+
+
+def sse_frame(event: str, data: bytes, event_id: int | None = None) -> bytes:
+    """Encode one Server-Sent Events frame."""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\n".encode() + b"data: " + data + b"\n\n"
+
+
+class PipelineBroadcaster:
+    """One Redis subscription per process, fanned out to bounded per-client queues."""
+
+    def __init__(self, queue_size: int = CLIENT_QUEUE_SIZE) -> None:
+        self._queue_size = queue_size
+        self._queues: set[asyncio.Queue[bytes]] = set()
+        self._listener: asyncio.Task[None] | None = None
+
+    @property
+    def client_count(self) -> int:
+        """Number of connected subscribers."""
+        return len(self._queues)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[bytes]]:
+        """Register a client queue for the lifetime of the context."""
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=self._queue_size)
+        self._queues.add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            yield queue
+        finally:
+            self._queues.discard(queue)
+
+    def broadcast(self, frame: bytes) -> None:
+        """Queue a frame for every client, dropping a slow client's oldest frame."""
+        for queue in list(self._queues):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    async def close(self) -> None:
+        """Stop the Redis listener."""
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with async_redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(PIPELINE_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        version = orjson.loads(message["data"])["version"]
+                        self.broadcast(sse_frame("pipeline", message["data"], event_id=version))
+            except RedisError:
+                logger.warning("Pipeline subscription lost; reconnecting", exc_info=True)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+
+pipeline_broadcaster = PipelineBroadcaster()
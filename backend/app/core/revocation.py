@@ -0,0 +1,130 @@
+"""JWT revocation state: per-user token versions and a jti denylist in Redis.
+
+Authenticated requests are checked against Redis through a short-TTL in-process
+cache, so the steady-state auth path is a signature check plus a dict lookup.
+Postgres (``users.token_version``) stays the source of truth and is only read
+when the Redis key is missing, e.g. after a Redis flush.
+"""
+
+import threading
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+
+from backend.app.core.cache import async_redis_client, redis_client
+from backend.app.core.config import get_settings
+from backend.app.db.session import AsyncSessionLocal
+from backend.app.models.user import User
+
+settings = get_settings()
+
+TOKEN_VERSION_KEY = "auth:token_version:{username}"
+DENYLIST_KEY = "auth:denylist:{jti}"
+STATUS_CACHE_MAX_ENTRIES = 50_000
+
+
+class TokenStatusCache:
+    """Bounded TTL cache of token checks keyed by jti, remembering each token's user.
+
+    Verdicts are stored on the event loop and revoked from threadpool endpoints,
+    so every access holds a lock. Each revocation bumps a generation; a verdict
+    read from Redis before the latest revocation is not stored, so an in-flight
+    check cannot re-cache a token as active just after it was revoked.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = STATUS_CACHE_MAX_ENTRIES) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: dict[str, tuple[float, bool, str]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        """Revocations so far; pass it to ``set`` for a verdict read after this call."""
+        with self._lock:
+            return self._generation
+
+    def get(self, jti: str) -> bool | None:
+        """Return the cached verdict, or None when missing or stale."""
+        with self._lock:
+            entry = self._entries.get(jti)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, jti: str, active: bool, username: str, generation: int) -> None:
+        """Store a verdict unless a revocation happened since ``generation``, evicting the oldest entry when full."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._store(jti, active, username)
+
+    def deny(self, jti: str, username: str) -> None:
+        """Cache a revoked token as inactive."""
+        with self._lock:
+            self._generation += 1
+            self._store(jti, False, username)
+
+    def evict_user(self, username: str) -> None:
+        """Drop every cached verdict for a user's tokens."""
+        with self._lock:
+            self._generation += 1
+            stale = [jti for jti, (_, _, owner) in self._entries.items() if owner == username]
+            for jti in stale:
+                del self._entries[jti]
+
+    def clear(self) -> None:
+        """Drop every cached verdict."""
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, jti: str, active: bool, username: str) -> None:
+        if len(self._entries) >= self._max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[jti] = (time.monotonic() + self._ttl, active, username)
+
+
+token_status_cache = TokenStatusCache(settings.auth_status_cache_seconds)
+
+
+def publish_token_version(username: str, version: int) -> None:
+    """Mirror a user's current token version into Redis."""
+    redis_client.set(TOKEN_VERSION_KEY.format(username=username), version)
+
+
+def revoke_token(username: str, jti: str, expires_at: datetime) -> None:
+    """Denylist one token until it would have expired anyway."""
+    ttl = int((expires_at - datetime.now(UTC)).total_seconds())
+    if ttl > 0:
+        redis_client.setex(DENYLIST_KEY.format(jti=jti), ttl, 1)
+    token_status_cache.deny(jti, username)
+
+
+async def _load_token_version(username: str) -> int | None:
+    async with AsyncSessionLocal() as db:
+        version = await db.scalar(select(User.token_version).where(User.username == username))
+    if version is not None:
+        await async_redis_client.set(TOKEN_VERSION_KEY.format(username=username), version)
+    return version
+
+
+async def is_token_active(username: str, jti: str, token_version: int) -> bool:
+    """Return whether a verified token is neither denylisted nor superseded by a version bump."""
+    cached = token_status_cache.get(jti)
+    if cached is not None:
+        return cached
+    generation = token_status_cache.generation()
+
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        pipe.get(TOKEN_VERSION_KEY.format(username=username))
+        pipe.exists(DENYLIST_KEY.format(jti=jti))
+        current_version, denied = await pipe.execute()
+
+    if current_version is None:
+        loaded = await _load_token_version(username)
+        active = loaded is not None and loaded == token_version and not denied
+    else:
+        active = int(current_version) == token_version and not denied
+    token_status_cache.set(jti, active, username, generation)
+    return active
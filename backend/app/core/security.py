@@ -1,5 +1,6 @@
 """Authentication and password security utilities."""
 
+import uuid
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -22,10 +23,23 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(subject: str, role: str, expires_delta: timedelta | None = None) -> str:
-    """Create signed JWT token."""
-    expire = datetime.now(UTC) + (expires_delta or timedelta(minutes=settings.jwt_expiration_minutes))
-    payload: dict[str, Any] = {"sub": subject, "role": role, "exp": expire}
+def create_access_token(
+    subject: str,
+    role: str,
+    expires_delta: timedelta | None = None,
+    token_version: int = 0,
+) -> str:
+    """Create signed JWT token carrying role, token version and a unique id for revocation."""
+    issued_at = datetime.now(UTC)
+    expire = issued_at + (expires_delta or timedelta(minutes=settings.jwt_expiration_minutes))
+    payload: dict[str, Any] = {
+        "sub": subject,
+        "role": role,
+        "ver": token_version,
+        "jti": uuid.uuid4().hex,
+        "iat": issued_at,
+        "exp": expire,
+    }
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 
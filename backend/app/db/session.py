@@ -1,8 +1,9 @@
 """Database session and engine setup."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from backend.app.core.config import get_settings
@@ -12,6 +13,15 @@ settings = get_settings()
 engine = create_engine(settings.database_url, pool_pre_ping=True, pool_size=20, max_overflow=40)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, class_=Session)
 
+# psycopg 3 drives both engines from the same URL; the async pool serves the read endpoints.
+async_engine = create_async_engine(
+    settings.database_url,
+    pool_pre_ping=True,
+    pool_size=settings.async_db_pool_size,
+    max_overflow=settings.async_db_max_overflow,
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
 
 def get_db() -> Generator[Session, None, None]:
     """Yield a database session with automatic cleanup."""
@@ -20,3 +30,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async database session for non-blocking read endpoints."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,17 +1,37 @@
 """FastAPI application entrypoint."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from starlette.responses import JSONResponse
 
+from backend.app.api.v1.endpoints.tiles import tile_archives
 from backend.app.api.v1.router import api_router
+from backend.app.core.cache import async_redis_client
 from backend.app.core.config import get_settings
+from backend.app.core.pipeline_events import pipeline_broadcaster
 from backend.app.core.rate_limit import limiter
+from backend.app.db.session import async_engine
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name, debug=settings.app_debug)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Release the pipeline subscription, tile archives and async DB and Redis pools on shutdown."""
+    yield
+    if tile_archives is not None:
+        tile_archives.close()
+    await pipeline_broadcaster.close()
+    await async_redis_client.aclose()
+    await async_engine.dispose()
+
+
+app = FastAPI(title=settings.app_name, debug=settings.app_debug, lifespan=lifespan)
 
 app.state.limiter = limiter
 app.add_exception_handler(
@@ -1,17 +1,33 @@
 """Model package exports for Alembic metadata discovery."""
 
+from backend.app.models.analytics_run import AnalyticsRun
+from backend.app.models.anomaly_baseline import AnomalyBaseline
 from backend.app.models.anomaly_flag import AnomalyFlag
 from backend.app.models.cell_aggregate import CellAggregate
+from backend.app.models.cell_weekly_rollup import CellWeeklyRollup
 from backend.app.models.event import Event
+from backend.app.models.gi_star_score import GiStarScore
 from backend.app.models.h3_cell import H3Cell
+from backend.app.models.hotspot import Hotspot
+from backend.app.models.ingest_batch import IngestBatch
+from backend.app.models.ingest_checkpoint import IngestCheckpoint
+from backend.app.models.risk_forecast import RiskForecast
 from backend.app.models.risk_score import RiskLevel, RiskScore
 from backend.app.models.user import User, UserRole
 
 __all__ = [
+    "AnalyticsRun",
+    "AnomalyBaseline",
     "AnomalyFlag",
     "CellAggregate",
+    "CellWeeklyRollup",
     "Event",
+    "GiStarScore",
     "H3Cell",
+    "Hotspot",
+    "IngestBatch",
+    "IngestCheckpoint",
+    "RiskForecast",
     "RiskLevel",
     "RiskScore",
     "User",
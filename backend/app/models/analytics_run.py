@@ -0,0 +1,29 @@
+"""Analytics pipeline run model."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import ARRAY, BigInteger, DateTime, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+
+
+class AnalyticsRun(Base):
+    """One analytics pipeline run and the stages it has committed."""
+
+    __tablename__ = "analytics_runs"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    start_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_datetime: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    resolution: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    completed_stages: Mapped[list[str]] = mapped_column(ARRAY(Text), nullable=False, default=list)
+    row_counts: Mapped[dict[str, int]] = mapped_column(JSONB, nullable=False, default=dict)
+    newly_flagged: Mapped[list[Any]] = mapped_column(JSONB, nullable=False, default=list)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    failed_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
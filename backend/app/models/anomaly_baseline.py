@@ -0,0 +1,22 @@
+"""Online anomaly baseline state."""
+
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Float, ForeignKey, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+
+
+class AnomalyBaseline(Base):
+    """Decayed Welford weight, mean and M2 of a cell/event type's daily counts through ``through_bucket``."""
+
+    __tablename__ = "anomaly_baselines"
+
+    h3_index: Mapped[int] = mapped_column(BigInteger, ForeignKey("h3_cells.h3_index"), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(64), primary_key=True)
+    through_bucket: Mapped[date] = mapped_column(Date, nullable=False)
+    weight: Mapped[float] = mapped_column(Float, nullable=False)
+    mean: Mapped[float] = mapped_column(Float, nullable=False)
+    m2: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,21 +1,25 @@
-"""Anomaly spike flags derived from z-score."""
+"""Anomaly spike flags scored against online baselines."""
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Date, Float, Integer, String, UniqueConstraint
+from sqlalchemy import BigInteger, Boolean, Date, Float, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.db.base import Base
+from backend.app.models.event import ALL_EVENT_TYPES
 
 
 class AnomalyFlag(Base):
-    """Stores anomaly detection output per cell/day."""
+    """Stores anomaly detection output per cell/event type/day."""
 
     __tablename__ = "anomaly_flags"
-    __table_args__ = (UniqueConstraint("h3_index", "time_bucket", name="uq_anomaly_flags_h3_time"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    h3_index: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
-    time_bucket: Mapped[datetime] = mapped_column(Date, nullable=False, index=True)
+    h3_index: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(64), primary_key=True, default=ALL_EVENT_TYPES)
+    time_bucket: Mapped[datetime] = mapped_column(Date, primary_key=True, index=True)
     anomaly_score: Mapped[float] = mapped_column(Float, nullable=False, default=0)
     flagged: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Baseline state after this day, so a re-run can restart from the day before its window.
+    baseline_weight: Mapped[float | None] = mapped_column(Float)
+    baseline_mean: Mapped[float | None] = mapped_column(Float)
+    baseline_m2: Mapped[float | None] = mapped_column(Float)
@@ -2,21 +2,21 @@
 
 from datetime import datetime
 
-from sqlalchemy import Date, DateTime, Float, Integer, String, UniqueConstraint, func
+from sqlalchemy import BigInteger, Date, DateTime, Float, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.db.base import Base
+from backend.app.models.event import ALL_EVENT_TYPES
 
 
 class CellAggregate(Base):
-    """Daily aggregation metrics for each H3 index."""
+    """Daily aggregation metrics for each H3 index and event type (or the all-types rollup)."""
 
     __tablename__ = "cell_aggregates"
-    __table_args__ = (UniqueConstraint("h3_index", "time_bucket", name="uq_cell_aggregates_h3_time"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    h3_index: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
-    time_bucket: Mapped[datetime] = mapped_column(Date, nullable=False, index=True)
+    h3_index: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(64), primary_key=True, default=ALL_EVENT_TYPES)
+    time_bucket: Mapped[datetime] = mapped_column(Date, primary_key=True, index=True)
     event_count: Mapped[int] = mapped_column(Integer, nullable=False)
     rolling_7d_avg: Mapped[float] = mapped_column(Float, nullable=False, default=0)
     growth_rate: Mapped[float] = mapped_column(Float, nullable=False, default=0)
@@ -0,0 +1,22 @@
+"""Weekly downsampled cell metrics kept after daily rows expire."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Date, Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+
+
+class CellWeeklyRollup(Base):
+    """Per-cell, per-ISO-week totals of expired daily aggregates, risk scores and anomaly flags."""
+
+    __tablename__ = "cell_weekly_rollups"
+
+    h3_index: Mapped[int] = mapped_column(BigInteger, ForeignKey("h3_cells.h3_index"), primary_key=True)
+    week_bucket: Mapped[datetime] = mapped_column(Date, primary_key=True, index=True)
+    event_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    active_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    risk_score_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    max_risk_score: Mapped[float] = mapped_column(Float, nullable=False)
+    flagged_days: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -9,6 +9,9 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.db.base import Base
 
+# ``event_type`` of derived rows that count every event type; not accepted as a real event type.
+ALL_EVENT_TYPES = "all"
+
 
 class Event(Base):
     """Incoming raw event stream persisted in PostGIS."""
@@ -20,4 +23,5 @@ class Event(Base):
     event_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, nullable=False, index=True)
     geom: Mapped[str] = mapped_column(Geometry("POINT", srid=4326, spatial_index=True), nullable=False)
     attributes_json: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    event_key: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
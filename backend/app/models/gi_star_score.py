@@ -0,0 +1,19 @@
+"""Getis-Ord Gi* spatial cluster scores."""
+
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Float, ForeignKey, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+
+
+class GiStarScore(Base):
+    """Gi* z-score of an active cell/day over its H3 neighborhood."""
+
+    __tablename__ = "gi_star_scores"
+
+    h3_index: Mapped[int] = mapped_column(BigInteger, ForeignKey("h3_cells.h3_index"), primary_key=True)
+    time_bucket: Mapped[date] = mapped_column(Date, primary_key=True, index=True)
+    gi_zscore: Mapped[float] = mapped_column(Float, nullable=False)
+    neighbor_count: Mapped[int] = mapped_column(SmallInteger, nullable=False)
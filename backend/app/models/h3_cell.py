@@ -1,7 +1,7 @@
 """H3 polygon registry model."""
 
 from geoalchemy2 import Geometry
-from sqlalchemy import Integer, String
+from sqlalchemy import BigInteger, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.db.base import Base
@@ -12,6 +12,6 @@ class H3Cell(Base):
 
     __tablename__ = "h3_cells"
 
-    h3_index: Mapped[str] = mapped_column(String(32), primary_key=True)
+    h3_index: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     resolution: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     geom: Mapped[str] = mapped_column(Geometry("POLYGON", srid=4326, spatial_index=True), nullable=False)
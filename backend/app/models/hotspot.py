@@ -0,0 +1,46 @@
+"""Ranked daily hotspot model."""
+
+from datetime import datetime
+
+from geoalchemy2 import Geometry
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Boolean,
+    Date,
+    Enum,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+from backend.app.models.event import ALL_EVENT_TYPES
+from backend.app.models.risk_score import RiskLevel
+
+
+class Hotspot(Base):
+    """Hotspot cell per event type and day with national rank and the reasons it qualified."""
+
+    __tablename__ = "hotspots"
+    __table_args__ = (
+        UniqueConstraint("h3_index", "event_type", "time_bucket", name="uq_hotspots_h3_type_time"),
+        Index("uq_hotspots_type_time_rank", "event_type", "time_bucket", "rank", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    h3_index: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False, default=ALL_EVENT_TYPES)
+    time_bucket: Mapped[datetime] = mapped_column(Date, nullable=False)
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    risk_score: Mapped[float] = mapped_column(Float, nullable=False)
+    risk_level: Mapped[RiskLevel] = mapped_column(Enum(RiskLevel, name="risk_level"), nullable=False)
+    growth_rate: Mapped[float] = mapped_column(Float, nullable=False)
+    anomaly_flagged: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    gi_zscore: Mapped[float | None] = mapped_column(Float, nullable=True)
+    reasons: Mapped[list[str]] = mapped_column(ARRAY(Text), nullable=False)
+    geom: Mapped[str] = mapped_column(Geometry("POLYGON", srid=4326, spatial_index=True), nullable=False)
@@ -0,0 +1,20 @@
+"""Ingest batch log model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+
+
+class IngestBatch(Base):
+    """Committed ingest batch whose event range the analytics scheduler has not dispatched yet."""
+
+    __tablename__ = "ingest_batches"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    min_event_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    max_event_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,22 @@
+"""Bulk load checkpoint model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+
+
+class IngestCheckpoint(Base):
+    """Committed progress of one shard of a resumable bulk event load."""
+
+    __tablename__ = "ingest_checkpoints"
+
+    load_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    shard: Mapped[int] = mapped_column(Integer, primary_key=True)
+    committed_offset: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    inserted: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rejected: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    completed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,25 @@
+"""Risk forecast model."""
+
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Enum, Float, ForeignKey, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+from backend.app.models.risk_score import RiskLevel
+
+
+class RiskForecast(Base):
+    """Latest projected event count and risk for one H3 cell and target day."""
+
+    __tablename__ = "risk_forecasts"
+
+    h3_index: Mapped[int] = mapped_column(BigInteger, ForeignKey("h3_cells.h3_index"), primary_key=True)
+    target_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    issued_on: Mapped[date] = mapped_column(Date, nullable=False)
+    horizon_days: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    predicted_event_count: Mapped[float] = mapped_column(Float, nullable=False)
+    lower_event_count: Mapped[float] = mapped_column(Float, nullable=False)
+    upper_event_count: Mapped[float] = mapped_column(Float, nullable=False)
+    predicted_risk_score: Mapped[float] = mapped_column(Float, nullable=False)
+    predicted_risk_level: Mapped[RiskLevel] = mapped_column(Enum(RiskLevel, name="risk_level"), nullable=False)
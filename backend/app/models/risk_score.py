@@ -3,10 +3,11 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Date, Enum, Float, Integer, String, UniqueConstraint
+from sqlalchemy import BigInteger, Date, Enum, Float, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from backend.app.db.base import Base
+from backend.app.models.event import ALL_EVENT_TYPES
 
 
 class RiskLevel(enum.StrEnum):
@@ -19,13 +20,12 @@ class RiskLevel(enum.StrEnum):
 
 
 class RiskScore(Base):
-    """Computed risk score per H3 per day."""
+    """Computed risk score per H3, event type and day."""
 
     __tablename__ = "risk_scores"
-    __table_args__ = (UniqueConstraint("h3_index", "time_bucket", name="uq_risk_scores_h3_time"),)
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    h3_index: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
-    time_bucket: Mapped[datetime] = mapped_column(Date, nullable=False, index=True)
+    h3_index: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(64), primary_key=True, default=ALL_EVENT_TYPES)
+    time_bucket: Mapped[datetime] = mapped_column(Date, primary_key=True, index=True)
     risk_score: Mapped[float] = mapped_column(Float, nullable=False)
     risk_level: Mapped[RiskLevel] = mapped_column(Enum(RiskLevel, name="risk_level"), nullable=False, index=True)
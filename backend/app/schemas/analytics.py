@@ -1,6 +1,6 @@
 """Analytics related schemas."""
 
-from datetime import date
+from datetime import date, datetime
 
 from pydantic import BaseModel
 
@@ -10,6 +10,25 @@ class AnalyticsRunResponse(BaseModel):
 
     task_id: str
     status: str
+    run_id: int
+
+
+class AnalyticsRunRecord(BaseModel):
+    """Persisted state of a checkpointed pipeline run."""
+
+    id: int
+    start_datetime: datetime
+    end_datetime: datetime
+    resolution: int
+    status: str
+    completed_stages: list[str]
+    pending_stages: list[str]
+    row_counts: dict[str, int]
+    newly_flagged_count: int
+    last_error: str | None
+    failed_attempts: int
+    created_at: datetime
+    updated_at: datetime
 
 
 class RiskCellResponse(BaseModel):
@@ -23,3 +42,44 @@ class RiskCellResponse(BaseModel):
     risk_score: float
     risk_level: str
     anomaly_flagged: bool
+
+
+class RiskForecastResponse(BaseModel):
+    """Projected event count and risk for one cell and target day."""
+
+    h3_index: str
+    target_date: date
+    issued_on: date
+    horizon_days: int
+    predicted_event_count: float
+    lower_event_count: float
+    upper_event_count: float
+    predicted_risk_score: float
+    predicted_risk_level: str
+
+
+class RiskCellHistoryResponse(BaseModel):
+    """Daily risk series for one cell as parallel arrays indexed by ``dates``."""
+
+    h3_index: str
+    dates: list[date]
+    event_count: list[int]
+    rolling_7d_avg: list[float]
+    growth_rate: list[float]
+    risk_score: list[float]
+    risk_level: list[str]
+    anomaly_flagged: list[bool]
+
+
+class HotspotResponse(BaseModel):
+    """Ranked hotspot cell for one day."""
+
+    h3_index: str
+    time_bucket: date
+    rank: int
+    risk_score: float
+    risk_level: str
+    growth_rate: float
+    anomaly_flagged: bool
+    gi_zscore: float | None
+    reasons: list[str]
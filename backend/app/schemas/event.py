@@ -1,9 +1,11 @@
 """Event schema definitions."""
 
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from backend.app.models.event import ALL_EVENT_TYPES
 
 
 class EventUploadItem(BaseModel):
@@ -14,6 +16,21 @@ class EventUploadItem(BaseModel):
     longitude: float = Field(ge=-180, le=180)
     latitude: float = Field(ge=-90, le=90)
     attributes_json: dict[str, Any] | None = None
+    event_key: str | None = Field(default=None, min_length=1, max_length=64)
+
+    @field_validator("event_timestamp")
+    @classmethod
+    def assume_utc(cls, value: datetime) -> datetime:
+        """Read a timestamp without an offset as UTC, not in the database session's time zone."""
+        return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+    @field_validator("event_type")
+    @classmethod
+    def reject_rollup_type(cls, value: str) -> str:
+        """Keep the name of the all-types rollup out of real event types."""
+        if value == ALL_EVENT_TYPES:
+            raise ValueError(f"event_type '{ALL_EVENT_TYPES}' is reserved for the all-types rollup")
+        return value
 
 
 class EventUploadRequest(BaseModel):
@@ -22,6 +39,14 @@ class EventUploadRequest(BaseModel):
     events: list[EventUploadItem]
 
 
+class QueuedUploadResponse(BaseModel):
+    """Acknowledgement of events queued for write-behind ingestion."""
+
+    queued: int
+    backlog: int
+    last_id: str | None
+
+
 class EventResponse(BaseModel):
     """Serialized event record."""
 
@@ -31,3 +56,29 @@ class EventResponse(BaseModel):
     longitude: float
     latitude: float
     attributes_json: dict[str, Any] | None
+
+
+class UploadBatchResult(BaseModel):
+    """Outcome of one committed ingest batch."""
+
+    batch: int
+    inserted: int
+    duplicates: int = 0
+    error: str | None = None
+
+
+class UploadRowError(BaseModel):
+    """A rejected input line."""
+
+    line: int
+    error: str
+
+
+class StreamUploadResponse(BaseModel):
+    """Summary of a streamed NDJSON/CSV upload."""
+
+    inserted: int
+    duplicates: int = 0
+    rejected: int
+    batches: list[UploadBatchResult]
+    errors: list[UploadRowError]
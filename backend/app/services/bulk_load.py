@@ -0,0 +1,299 @@
+"""Sharded, resumable bulk event loading.
+
+A source file is split into deterministic shards: fixed-size byte ranges for
+uncompressed line formats (CSV, NDJSON, newline-delimited GeoJSON), row groups
+for Parquet, and a single shard for gzip and GeoJSON FeatureCollections, which
+cannot be split. Each shard is parsed and COPYed by its own worker process and
+connection. After every batch the shard's committed offset is upserted into
+``ingest_checkpoints`` in the same transaction as the rows, so a restarted
+load skips exactly what was already written.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, cast
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.db.session import SessionLocal
+from backend.app.schemas.event import EventUploadItem
+from backend.app.services.ingestion import copy_events, parse_csv_row
+
+SHARD_BYTES = 64 << 20
+MAX_REPORTED_ERRORS = 10
+LINE_FORMATS = {"csv", "ndjson", "geojsonl"}
+FORMATS = LINE_FORMATS | {"geojson", "parquet"}
+_SUFFIX_FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".geojsonl": "geojsonl",
+    ".geojsons": "geojsonl",
+    ".geojson": "geojson",
+    ".json": "geojson",
+    ".parquet": "parquet",
+}
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A unit of work: byte range, row group or whole file, depending on format."""
+
+    index: int
+    start: int
+    end: int | None
+
+
+@dataclass(frozen=True)
+class ShardTask:
+    """Everything a worker process needs to load one shard."""
+
+    load_id: str
+    path: str
+    fmt: str
+    compressed: bool
+    shard: Shard
+    header: list[str] | None
+    delimiter: str
+    resume_offset: int | None
+    batch_size: int
+    deduplicate: bool = False
+
+
+@dataclass
+class ShardResult:
+    """Rows written and rejected by one shard in this run."""
+
+    shard: int
+    inserted: int = 0
+    rejected: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def detect_format(path: Path) -> tuple[str, bool]:
+    """Return (format, gzip-compressed) from the file suffixes."""
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    compressed = bool(suffixes) and suffixes[-1] == ".gz"
+    if compressed:
+        suffixes = suffixes[:-1]
+    fmt = _SUFFIX_FORMATS.get(suffixes[-1]) if suffixes else None
+    if fmt is None:
+        raise ValueError(f"Cannot infer input format from {path.name}; pass --format")
+    return fmt, compressed
+
+
+def load_id_for(path: Path) -> str:
+    """Stable identifier for one version of a source file."""
+    stat = path.stat()
+    return hashlib.sha1(f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+
+
+def _open(path: Path, compressed: bool) -> IO[bytes]:
+    return cast(IO[bytes], gzip.open(path, "rb")) if compressed else path.open("rb")
+
+
+def plan_shards(path: Path, fmt: str, compressed: bool, delimiter: str = ",") -> tuple[list[Shard], list[str] | None]:
+    """Split a source into shards; also returns the CSV header when there is one."""
+    header = None
+    data_start = 0
+    if fmt == "csv":
+        with _open(path, compressed) as handle:
+            first_line = handle.readline()
+            data_start = handle.tell()
+        header = next(csv.reader([first_line.decode("utf-8-sig")], delimiter=delimiter))
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        row_groups = pq.ParquetFile(path).num_row_groups
+        return [Shard(index, index, index + 1) for index in range(row_groups)], None
+    if compressed or fmt == "geojson":
+        return [Shard(0, data_start, None)], header
+
+    size = path.stat().st_size
+    starts = range(data_start, max(size, data_start + 1), SHARD_BYTES)
+    return [Shard(index, start, min(start + SHARD_BYTES, size)) for index, start in enumerate(starts)], header
+
+
+def read_checkpoints(db: Session, load_id: str) -> dict[int, tuple[int, bool]]:
+    """Return shard -> (committed offset, completed) for a load."""
+    rows = db.execute(
+        text("SELECT shard, committed_offset, completed FROM ingest_checkpoints WHERE load_id = :load_id"),
+        {"load_id": load_id},
+    ).all()
+    return {row.shard: (row.committed_offset, row.completed) for row in rows}
+
+
+def _feature_to_event(feature: dict[str, Any]) -> EventUploadItem:
+    properties = dict(feature.get("properties") or {})
+    longitude, latitude = feature["geometry"]["coordinates"][:2]
+    event_type = properties.pop("event_type")
+    event_timestamp = properties.pop("event_timestamp")
+    event_key = properties.pop("event_key", None)
+    attributes = properties.pop("attributes_json", None) or properties or None
+    return EventUploadItem(
+        event_type=event_type,
+        event_timestamp=event_timestamp,
+        longitude=longitude,
+        latitude=latitude,
+        attributes_json=attributes,
+        event_key=event_key,
+    )
+
+
+def _parse_line(line: bytes, task: ShardTask) -> EventUploadItem:
+    if task.fmt == "ndjson":
+        return EventUploadItem.model_validate_json(line)
+    if task.fmt == "geojsonl":
+        return _feature_to_event(orjson.loads(line.lstrip(b"\x1e")))
+    values = next(csv.reader([line.decode()], delimiter=task.delimiter))
+    return parse_csv_row(dict(zip(task.header or [], values, strict=True)))
+
+
+def iter_shard(task: ShardTask) -> Iterator[tuple[int, EventUploadItem | Exception]]:
+    """Yield (offset after record, event or parse error) for one shard from its resume point."""
+    shard = task.shard
+    if task.fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        rows = pq.ParquetFile(task.path).read_row_group(shard.start).to_pylist()
+        for position in range(task.resume_offset or 0, len(rows)):
+            row = rows[position]
+            try:
+                if isinstance(row.get("attributes_json"), str):
+                    row["attributes_json"] = orjson.loads(row["attributes_json"])
+                yield position + 1, EventUploadItem.model_validate(row)
+            except (KeyError, TypeError, ValueError) as exc:
+                yield position + 1, exc
+        return
+
+    if task.fmt == "geojson":
+        with _open(Path(task.path), task.compressed) as handle:
+            features = orjson.loads(handle.read())["features"]
+        for position in range(task.resume_offset or 0, len(features)):
+            try:
+                yield position + 1, _feature_to_event(features[position])
+            except (KeyError, TypeError, ValueError) as exc:
+                yield position + 1, exc
+        return
+
+    with _open(Path(task.path), task.compressed) as handle:
+        if task.resume_offset is not None:
+            handle.seek(task.resume_offset)
+        elif shard.start > 0:
+            # A line belongs to the shard it starts in: back up one byte and drop the partial line.
+            handle.seek(shard.start - 1)
+            handle.readline()
+        while shard.end is None or handle.tell() < shard.end:
+            line = handle.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                yield handle.tell(), _parse_line(line.rstrip(b"\r\n"), task)
+            except (KeyError, TypeError, ValueError) as exc:
+                yield handle.tell(), exc
+
+
+def _checkpoint(db: Session, task: ShardTask, offset: int, result: ShardResult, completed: bool) -> None:
+    db.execute(
+        text(
+            """
+            INSERT INTO ingest_checkpoints (load_id, shard, committed_offset, inserted, rejected, completed, updated_at)
+            VALUES (:load_id, :shard, :offset, :inserted, :rejected, :completed, NOW())
+            ON CONFLICT (load_id, shard) DO UPDATE SET
+                committed_offset = EXCLUDED.committed_offset,
+                inserted = ingest_checkpoints.inserted + EXCLUDED.inserted,
+                rejected = ingest_checkpoints.rejected + EXCLUDED.rejected,
+                completed = EXCLUDED.completed,
+                updated_at = NOW()
+            """
+        ),
+        {
+            "load_id": task.load_id,
+            "shard": task.shard.index,
+            "offset": offset,
+            "inserted": result.inserted,
+            "rejected": result.rejected,
+            "completed": completed,
+        },
+    )
+
+
+def load_shard(task: ShardTask) -> ShardResult:
+    """Parse and COPY one shard, committing rows and checkpoint together per batch."""
+    total = ShardResult(shard=task.shard.index)
+    pending = ShardResult(shard=task.shard.index)
+    batch: list[EventUploadItem] = []
+    # Line formats checkpoint byte offsets; Parquet and FeatureCollections count records.
+    offset = task.resume_offset if task.resume_offset is not None else 0
+    if task.resume_offset is None and task.fmt in LINE_FORMATS:
+        offset = task.shard.start
+
+    with SessionLocal() as db:
+
+        def commit(completed: bool) -> None:
+            pending.inserted = copy_events(db, batch, task.deduplicate) if batch else 0
+            _checkpoint(db, task, offset, pending, completed)
+            db.commit()
+            total.inserted += pending.inserted
+            total.rejected += pending.rejected
+            pending.inserted = pending.rejected = 0
+            batch.clear()
+
+        for offset, parsed in iter_shard(task):
+            if isinstance(parsed, Exception):
+                pending.rejected += 1
+                if len(total.errors) < MAX_REPORTED_ERRORS:
+                    total.errors.append(f"shard {task.shard.index} @ {offset}: {parsed}")
+                continue
+            batch.append(parsed)
+            if len(batch) >= task.batch_size:
+                commit(completed=False)
+        commit(completed=True)
+    return total
+
+
+def build_tasks(
+    path: Path, fmt: str | None, batch_size: int, delimiter: str = ",", deduplicate: bool = False
+) -> tuple[list[ShardTask], int]:
+    """Plan a load and drop shards already completed; returns (tasks, completed shard count)."""
+    detected, compressed = detect_format(path)
+    fmt = fmt or detected
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt}")
+    load_id = load_id_for(path)
+    shards, header = plan_shards(path, fmt, compressed, delimiter)
+    with SessionLocal() as db:
+        checkpoints = read_checkpoints(db, load_id)
+
+    tasks = []
+    for shard in shards:
+        committed_offset, completed = checkpoints.get(shard.index, (None, False))
+        if completed:
+            continue
+        tasks.append(
+            ShardTask(
+                load_id=load_id,
+                path=str(path),
+                fmt=fmt,
+                compressed=compressed,
+                shard=shard,
+                header=header,
+                delimiter=delimiter,
+                resume_offset=committed_offset,
+                batch_size=batch_size,
+                deduplicate=deduplicate,
+            )
+        )
+    return tasks, len(shards) - len(tasks)
+
@@ -0,0 +1,53 @@
+"""Turn query shapes (bbox, point + radius, k-ring) into H3 cell cover sets."""
+
+import math
+
+import h3
+
+MAX_COVER_CELLS = 50_000
+
+
+class CoverTooLargeError(ValueError):
+    """Raised when a shape would expand to more than ``MAX_COVER_CELLS`` cells."""
+
+
+def _check_size(cells: list[str]) -> list[str]:
+    if len(cells) > MAX_COVER_CELLS:
+        raise CoverTooLargeError(f"Query area expands to {len(cells)} cells; limit is {MAX_COVER_CELLS}")
+    return cells
+
+
+def bbox_cells(min_lon: float, min_lat: float, max_lon: float, max_lat: float, resolution: int) -> list[str]:
+    """Cells overlapping a lon/lat box."""
+    # Estimate before polyfilling so huge boxes are rejected without enumerating them.
+    cell_area = h3.average_hexagon_area(resolution, unit="km^2")
+    mid_lat = math.radians((min_lat + max_lat) / 2)
+    box_area = (max_lat - min_lat) * 111.32 * (max_lon - min_lon) * 111.32 * max(math.cos(mid_lat), 0.01)
+    if box_area / cell_area > MAX_COVER_CELLS:
+        raise CoverTooLargeError(f"Query area expands to ~{int(box_area / cell_area)} cells; limit is {MAX_COVER_CELLS}")
+
+    polygon = h3.LatLngPoly([(min_lat, min_lon), (min_lat, max_lon), (max_lat, max_lon), (max_lat, min_lon)])
+    return _check_size(list(h3.polygon_to_cells_experimental(polygon, resolution, contain="overlap")))
+
+
+def radius_cells(latitude: float, longitude: float, radius_m: float, resolution: int) -> list[str]:
+    """Cells whose area can intersect a circle around a point."""
+    edge_m = h3.average_hexagon_edge_length(resolution, unit="m")
+    k = math.ceil(radius_m / (math.sqrt(3) * edge_m)) + 1
+    if 3 * k * (k + 1) + 1 > MAX_COVER_CELLS:
+        raise CoverTooLargeError(f"Radius expands beyond {MAX_COVER_CELLS} cells at resolution {resolution}")
+
+    origin = (latitude, longitude)
+    center = h3.latlng_to_cell(latitude, longitude, resolution)
+    return [
+        cell
+        for cell in h3.grid_disk(center, k)
+        if h3.great_circle_distance(origin, h3.cell_to_latlng(cell), unit="m") <= radius_m + edge_m
+    ]
+
+
+def kring_cells(h3_index: str, k: int) -> list[str]:
+    """Cells within grid distance ``k`` of a cell."""
+    if 3 * k * (k + 1) + 1 > MAX_COVER_CELLS:
+        raise CoverTooLargeError(f"k={k} expands beyond {MAX_COVER_CELLS} cells")
+    return list(h3.grid_disk(h3_index, k))
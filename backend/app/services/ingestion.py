@@ -1,40 +1,202 @@
-"""Event ingestion service. Bulk insert with transaction semantics."""
+"""Event ingestion service. Streams rows into the events hypertable with COPY.
 
-import json
+Events that carry an ``event_key`` (or get a content hash when deduplication is
+on) are idempotent: they are COPYed into a temporary staging table and merged
+with ``ON CONFLICT DO NOTHING`` against ``uq_events_key``. A per-process Bloom
+filter routes keys that may have been seen before to one bulk existence check
+per batch, so replayed windows are dropped before they are shipped.
+"""
 
-from sqlalchemy import text
+import hashlib
+import struct
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from itertools import islice
+from typing import cast
+
+import orjson
+import psycopg
 from sqlalchemy.orm import Session
 
+from backend.app.core.config import get_settings
 from backend.app.schemas.event import EventUploadItem
+from backend.app.services.bloom import BloomFilter
+
+settings = get_settings()
+
+EVENT_COLUMNS = "event_type, event_timestamp, geom, attributes_json, event_key"
+COPY_EVENTS_SQL = f"COPY events ({EVENT_COLUMNS}) FROM STDIN"
+COPY_STAGING_SQL = f"COPY events_staging ({EVENT_COLUMNS}) FROM STDIN"
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS events_staging (
+        event_type VARCHAR(64) NOT NULL,
+        event_timestamp TIMESTAMPTZ NOT NULL,
+        geom GEOMETRY(Point, 4326) NOT NULL,
+        attributes_json JSONB,
+        event_key VARCHAR(64)
+    )
+"""
+MERGE_STAGING_SQL = f"""
+    WITH staged AS (DELETE FROM events_staging RETURNING *)
+    INSERT INTO events ({EVENT_COLUMNS})
+    SELECT {EVENT_COLUMNS} FROM staged
+    ON CONFLICT DO NOTHING
+"""
+# Exact (event_key, event_timestamp) pairs, as uq_events_key enforces; the range bounds keep chunk exclusion.
+EXISTING_KEYS_SQL = """
+    SELECT e.event_key, e.event_timestamp
+    FROM events e
+    JOIN unnest(%s::text[], %s::timestamptz[]) AS b (event_key, event_timestamp)
+      ON e.event_key = b.event_key
+     AND e.event_timestamp = b.event_timestamp
+    WHERE e.event_timestamp BETWEEN %s AND %s
+"""
+INGESTED_CHANNEL = "events_ingested"
+NOTIFY_INGESTED_SQL = "SELECT pg_notify(%s, %s)"
+RECORD_BATCH_SQL = """
+    INSERT INTO ingest_batches (min_event_timestamp, max_event_timestamp, event_count)
+    VALUES (%s, %s, %s)
+    RETURNING id
+"""
+# Little-endian EWKB Point with the SRID flag set.
+_EWKB_POINT_HEADER = struct.pack("<BII", 1, 0x20000001, 4326)
+
+event_key_filter = BloomFilter(settings.ingest_bloom_capacity)
+
+
+def point_ewkb_hex(longitude: float, latitude: float) -> str:
+    """Hex EWKB for an SRID 4326 point; PostGIS parses it directly as geometry input."""
+    return (_EWKB_POINT_HEADER + struct.pack("<dd", longitude, latitude)).hex()
+
+
+def parse_csv_row(row: dict[str, str]) -> EventUploadItem:
+    """Transform a CSV row into a validated event."""
+    attrs_raw = row.get("attributes_json")
+    attributes = orjson.loads(attrs_raw) if attrs_raw else None
+    return EventUploadItem(
+        event_type=row["event_type"],
+        event_timestamp=datetime.fromisoformat(row["event_timestamp"]),
+        longitude=float(row["longitude"]),
+        latitude=float(row["latitude"]),
+        attributes_json=attributes,
+        event_key=row.get("event_key") or None,
+    )
+
+
+def _batches(events: Iterable[EventUploadItem], batch_size: int) -> Iterator[list[EventUploadItem]]:
+    iterator = iter(events)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def _as_utc(timestamp: datetime) -> datetime:
+    # EventUploadItem already does this; items built without validation (model_copy) are covered here too.
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
 
 
-def ingest_events(db: Session, events: list[EventUploadItem]) -> int:
-    """Insert validated events in a single transaction."""
-    payload = [
-        {
-            "event_type": item.event_type,
-            "event_timestamp": item.event_timestamp,
-            "longitude": item.longitude,
-            "latitude": item.latitude,
-            "attributes_json": json.dumps(item.attributes_json) if item.attributes_json is not None else None,
-        }
-        for item in events
-    ]
-    db.execute(
-        text(
-            """
-            INSERT INTO events (event_type, event_timestamp, geom, attributes_json, created_at)
-            VALUES (
-                :event_type,
-                :event_timestamp,
-                ST_SetSRID(ST_MakePoint(:longitude, :latitude), 4326)::geometry,
-                CAST(:attributes_json AS jsonb),
-                NOW()
-            )
-            """
-        ),
-        payload,
+def content_event_key(item: EventUploadItem) -> str:
+    """Hash of type, UTC timestamp, coordinates rounded to ~1 m and the attribute ``source``."""
+    source = (item.attributes_json or {}).get("source") or ""
+    timestamp = _as_utc(item.event_timestamp).astimezone(UTC).isoformat()
+    material = f"{item.event_type}|{timestamp}|{item.longitude:.5f}|{item.latitude:.5f}|{source}"
+    return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+
+
+def _row(item: EventUploadItem, event_key: str | None) -> tuple[object, ...]:
+    return (
+        item.event_type,
+        # A naive value would be read in the session time zone and miss the UTC duplicate pre-check.
+        _as_utc(item.event_timestamp),
+        point_ewkb_hex(item.longitude, item.latitude),
+        orjson.dumps(item.attributes_json).decode() if item.attributes_json is not None else None,
+        event_key,
     )
-    db.commit()
-    return len(payload)
 
+
+def _drop_known_duplicates(
+    cursor: psycopg.Cursor, keyed: list[tuple[EventUploadItem, str | None]]
+) -> list[tuple[EventUploadItem, str | None]]:
+    # Duplicates inside the batch never reach the database. A key reused at another timestamp is a distinct event.
+    unique: dict[tuple[str, datetime], EventUploadItem] = {}
+    unkeyed: list[tuple[EventUploadItem, str | None]] = []
+    for item, event_key in keyed:
+        if event_key is None:
+            unkeyed.append((item, None))
+        else:
+            unique.setdefault((event_key, _as_utc(item.event_timestamp)), item)
+
+    maybe_seen = [pair for pair in unique if pair[0] in event_key_filter]
+    if maybe_seen:
+        keys = [event_key for event_key, _ in maybe_seen]
+        timestamps = [timestamp for _, timestamp in maybe_seen]
+        cursor.execute(EXISTING_KEYS_SQL, (keys, timestamps, min(timestamps), max(timestamps)))
+        for existing_key, existing_timestamp in cursor.fetchall():
+            unique.pop((existing_key, existing_timestamp), None)
+    return [(item, event_key) for (event_key, _), item in unique.items()] + unkeyed
+
+
+def _notify_ingested(cursor: psycopg.Cursor, items: list[EventUploadItem], inserted: int) -> None:
+    # The batch row and the NOTIFY both take effect only if the surrounding transaction commits.
+    timestamps = [_as_utc(item.event_timestamp) for item in items]
+    cursor.execute(RECORD_BATCH_SQL, (min(timestamps), max(timestamps), inserted))
+    batch_id = cast(tuple[int], cursor.fetchone())[0]
+    payload = {"id": batch_id, "min": min(timestamps).isoformat(), "max": max(timestamps).isoformat(), "count": inserted}
+    cursor.execute(NOTIFY_INGESTED_SQL, (INGESTED_CHANNEL, orjson.dumps(payload).decode()))
+
+
+def copy_events(
+    db: Session, events: Iterable[EventUploadItem], deduplicate: bool | None = None, precheck: bool = True
+) -> int:
+    """COPY events inside the session's current transaction; returns rows inserted.
+
+    Keyed events (caller keys, or content hashes when ``deduplicate``) that already
+    exist are skipped, so the return value excludes duplicates. ``precheck=False``
+    skips the Bloom filter and relies on the unique index alone, for keys that are
+    almost never replayed. Batches that insert rows are logged in ``ingest_batches``
+    and send an ``events_ingested`` NOTIFY with their id and timestamp range for
+    the analytics scheduler.
+    """
+    deduplicate = settings.ingest_deduplicate if deduplicate is None else deduplicate
+    keyed = [(item, item.event_key or (content_event_key(item) if deduplicate else None)) for item in events]
+    connection = cast(psycopg.Connection, db.connection().connection.driver_connection)
+
+    with connection.cursor() as cursor:
+        if not any(event_key for _, event_key in keyed):
+            with cursor.copy(COPY_EVENTS_SQL) as copy:
+                for item, event_key in keyed:
+                    copy.write_row(_row(item, event_key))
+            if keyed:
+                _notify_ingested(cursor, [item for item, _ in keyed], len(keyed))
+            return len(keyed)
+
+        if precheck:
+            keyed = _drop_known_duplicates(cursor, keyed)
+        cursor.execute(CREATE_STAGING_SQL)
+        with cursor.copy(COPY_STAGING_SQL) as copy:
+            for item, event_key in keyed:
+                copy.write_row(_row(item, event_key))
+        cursor.execute(MERGE_STAGING_SQL)
+        inserted = cursor.rowcount
+        if inserted:
+            _notify_ingested(cursor, [item for item, _ in keyed], inserted)
+
+    if precheck:
+        for _, event_key in keyed:
+            if event_key is not None:
+                event_key_filter.add(event_key)
+    return inserted
+
+
+def ingest_events(
+    db: Session,
+    events: Iterable[EventUploadItem],
+    batch_size: int | None = None,
+    deduplicate: bool | None = None,
+) -> int:
+    """COPY validated events into ``events``, committing once per batch; returns rows inserted."""
+    batch_size = batch_size or settings.ingest_batch_size
+    inserted = 0
+    for batch in _batches(events, batch_size):
+        inserted += copy_events(db, batch, deduplicate)
+        db.commit()
+    return inserted
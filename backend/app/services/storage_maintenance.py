@@ -0,0 +1,165 @@
+"""Storage lifecycle for the events and derived cell-day hypertables.
+
+Chunks older than ``EVENTS_COMPRESS_AFTER_DAYS`` / ``DERIVED_COMPRESS_AFTER_DAYS``
+are compressed one chunk per transaction. Derived daily rows older than
+``DERIVED_RETENTION_DAYS`` are rolled up into ``cell_weekly_rollups`` (from the
+all-types rows) and their chunks dropped in the same transaction, so every daily
+row is counted exactly once. Raw events are only dropped when ``EVENTS_RETENTION_DAYS`` is set.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import get_settings
+from backend.app.models.event import ALL_EVENT_TYPES
+
+settings = get_settings()
+
+DERIVED_TABLES = ("cell_aggregates", "risk_scores", "anomaly_flags")
+HYPERTABLES = ("events", *DERIVED_TABLES)
+
+
+@dataclass
+class MaintenanceReport:
+    """What one maintenance pass changed."""
+
+    compressed_chunks: dict[str, int] = field(default_factory=dict)
+    rolled_up_before: date | None = None
+    rolled_up_cell_days: int = 0
+    dropped_chunks: dict[str, int] = field(default_factory=dict)
+
+
+def table_sizes(db: Session) -> dict[str, int]:
+    """Total bytes per hypertable, including indexes and compressed chunks."""
+    return {
+        table: db.execute(text("SELECT hypertable_size(CAST(:table AS regclass))"), {"table": table}).scalar_one() or 0
+        for table in HYPERTABLES
+    }
+
+
+def compress_old_chunks(db: Session, table: str, older_than_days: int) -> int:
+    """Compress uncompressed chunks that ended more than ``older_than_days`` ago; returns chunks compressed."""
+    chunks = db.execute(
+        text(
+            """
+            SELECT format('%I.%I', chunk_schema, chunk_name) AS chunk
+            FROM timescaledb_information.chunks
+            WHERE hypertable_name = :table
+              AND NOT is_compressed
+              AND range_end <= NOW() - make_interval(days => :days)
+            ORDER BY range_end
+            """
+        ),
+        {"table": table, "days": older_than_days},
+    ).scalars().all()
+    db.commit()
+    for chunk in chunks:
+        db.execute(text("SELECT compress_chunk(CAST(:chunk AS regclass), if_not_compressed => TRUE)"), {"chunk": chunk})
+        db.commit()
+    return len(chunks)
+
+
+def _chunk_horizon(db: Session, table: str, older_than_days: int) -> date | None:
+    # Latest end of a chunk lying wholly before the cutoff: everything before it drops as whole chunks.
+    return db.execute(
+        text(
+            """
+            SELECT MAX(range_end)::date
+            FROM timescaledb_information.chunks
+            WHERE hypertable_name = :table
+              AND range_end <= NOW() - make_interval(days => :days)
+            """
+        ),
+        {"table": table, "days": older_than_days},
+    ).scalar_one()
+
+
+def downsample_expired_cell_days(db: Session, retention_days: int) -> tuple[date | None, int, dict[str, int]]:
+    """Roll expired daily cell rows into weekly rollups and drop their chunks in one transaction.
+
+    Returns (horizon, cell-days rolled up, chunks dropped per table). Rollups are
+    additive, so a week split across a chunk boundary is completed by a later pass.
+    """
+    horizon = _chunk_horizon(db, "cell_aggregates", retention_days)
+    if horizon is None:
+        return None, 0, {}
+    rolled_up = db.execute(
+        text(
+            """
+            WITH expired AS (
+                SELECT
+                    ca.h3_index,
+                    date_trunc('week', ca.time_bucket)::date AS week_bucket,
+                    SUM(ca.event_count) AS event_count,
+                    COUNT(*) AS active_days,
+                    COALESCE(SUM(rs.risk_score), 0) AS risk_score_sum,
+                    COALESCE(MAX(rs.risk_score), 0) AS max_risk_score,
+                    COUNT(*) FILTER (WHERE af.flagged) AS flagged_days
+                FROM cell_aggregates ca
+                LEFT JOIN risk_scores rs USING (h3_index, event_type, time_bucket)
+                LEFT JOIN anomaly_flags af USING (h3_index, event_type, time_bucket)
+                WHERE ca.event_type = :all_types
+                  AND ca.time_bucket < :horizon
+                GROUP BY ca.h3_index, date_trunc('week', ca.time_bucket)
+            ),
+            merged AS (
+                INSERT INTO cell_weekly_rollups (
+                    h3_index, week_bucket, event_count, active_days, risk_score_sum, max_risk_score, flagged_days
+                )
+                SELECT * FROM expired
+                ON CONFLICT (h3_index, week_bucket) DO UPDATE SET
+                    event_count = cell_weekly_rollups.event_count + EXCLUDED.event_count,
+                    active_days = cell_weekly_rollups.active_days + EXCLUDED.active_days,
+                    risk_score_sum = cell_weekly_rollups.risk_score_sum + EXCLUDED.risk_score_sum,
+                    max_risk_score = GREATEST(cell_weekly_rollups.max_risk_score, EXCLUDED.max_risk_score),
+                    flagged_days = cell_weekly_rollups.flagged_days + EXCLUDED.flagged_days
+            )
+            SELECT COALESCE(SUM(active_days), 0) FROM expired
+            """
+        ),
+        {"horizon": horizon, "all_types": ALL_EVENT_TYPES},
+    ).scalar_one()
+
+    dropped = {}
+    for table in DERIVED_TABLES:
+        dropped[table] = len(
+            db.execute(
+                text("SELECT drop_chunks(CAST(:table AS regclass), older_than => CAST(:horizon AS DATE))"),
+                {"table": table, "horizon": horizon},
+            ).all()
+        )
+    db.execute(text("DELETE FROM hotspots WHERE time_bucket < :horizon"), {"horizon": horizon})
+    db.execute(text("DELETE FROM gi_star_scores WHERE time_bucket < :horizon"), {"horizon": horizon})
+    db.commit()
+    return horizon, int(rolled_up), dropped
+
+
+def drop_expired_events(db: Session, retention_days: int) -> int:
+    """Drop raw event chunks older than the retention window; returns chunks dropped."""
+    dropped = db.execute(
+        text("SELECT drop_chunks('events', older_than => make_interval(days => :days))"), {"days": retention_days}
+    ).all()
+    db.commit()
+    return len(dropped)
+
+
+def run_storage_maintenance(db: Session) -> MaintenanceReport:
+    """Downsample and drop expired cell-days, drop expired events, then compress what remains old enough."""
+    report = MaintenanceReport()
+    if settings.derived_retention_days is not None:
+        horizon, rolled_up, dropped = downsample_expired_cell_days(db, settings.derived_retention_days)
+        report.rolled_up_before, report.rolled_up_cell_days = horizon, rolled_up
+        report.dropped_chunks.update(dropped)
+        if rolled_up:
+            db.execute(text("REFRESH MATERIALIZED VIEW mv_daily_risk"))
+            db.commit()
+    if settings.events_retention_days is not None:
+        report.dropped_chunks["events"] = drop_expired_events(db, settings.events_retention_days)
+
+    report.compressed_chunks["events"] = compress_old_chunks(db, "events", settings.events_compress_after_days)
+    for table in DERIVED_TABLES:
+        report.compressed_chunks[table] = compress_old_chunks(db, table, settings.derived_compress_after_days)
+    return report
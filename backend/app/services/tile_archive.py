@@ -0,0 +1,490 @@
+"""Offline tile archives (PMTiles v3 and MBTiles) for finalized risk dates.
+
+Archives are baked once per day by ``backend.app.utils.export_tile_archive`` and
+served read-only: PMTiles files are memory-mapped and tile payloads are returned
+as ``memoryview`` slices of the mapping, MBTiles files are opened immutable with
+SQLite's mmap I/O enabled.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+from bisect import bisect_right
+from datetime import date
+from pathlib import Path
+from typing import Any, NamedTuple
+
+ARCHIVE_FORMATS = ("pmtiles", "mbtiles")
+
+PMTILES_HEADER = struct.Struct("<7sBQQQQQQQQQQQBBBBBBiiiiBii")
+PMTILES_ROOT_BUDGET = 16384 - PMTILES_HEADER.size
+PMTILES_COMPRESSION_NONE = 1
+PMTILES_COMPRESSION_GZIP = 2
+PMTILES_TILE_TYPE_MVT = 1
+MAX_MERCATOR_LAT = 85.0511287798066
+
+Bounds = tuple[float, float, float, float]
+
+
+class DirectoryEntry(NamedTuple):
+    """One PMTiles directory entry; ``run_length == 0`` points at a leaf directory."""
+
+    tile_id: int
+    offset: int
+    length: int
+    run_length: int
+
+
+def archive_path(directory: Path, risk_date: date, archive_format: str) -> Path:
+    """Return canonical archive file name for one risk date."""
+    return directory / f"risk_{risk_date.isoformat()}.{archive_format}"
+
+
+def zxy_to_tile_id(z: int, x: int, y: int) -> int:
+    """Map z/x/y onto the PMTiles Hilbert-curve tile id."""
+    acc = ((1 << (z * 2)) - 1) // 3
+    level = z - 1
+    while level >= 0:
+        size = 1 << level
+        rx = size & x
+        ry = size & y
+        acc += ((3 * rx) ^ ry) << level
+        if ry == 0:
+            if rx != 0:
+                x = size - 1 - x
+                y = size - 1 - y
+            x, y = y, x
+        level -= 1
+    return acc
+
+
+def lnglat_to_tile(longitude: float, latitude: float, z: int) -> tuple[int, int]:
+    """Return the XYZ tile containing a WGS84 coordinate at zoom ``z``."""
+    n = 1 << z
+    latitude = max(min(latitude, MAX_MERCATOR_LAT), -MAX_MERCATOR_LAT)
+    x = int((longitude + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tiles_covering(bounds: Bounds, z: int) -> set[tuple[int, int]]:
+    """Return x/y tiles at zoom ``z`` intersecting a (min_lon, min_lat, max_lon, max_lat) box."""
+    min_x, min_y = lnglat_to_tile(bounds[0], bounds[3], z)
+    max_x, max_y = lnglat_to_tile(bounds[2], bounds[1], z)
+    return {(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)}
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _serialize_directory(entries: list[DirectoryEntry]) -> bytes:
+    buffer = bytearray()
+    _write_varint(buffer, len(entries))
+    last_id = 0
+    for entry in entries:
+        _write_varint(buffer, entry.tile_id - last_id)
+        last_id = entry.tile_id
+    for entry in entries:
+        _write_varint(buffer, entry.run_length)
+    for entry in entries:
+        _write_varint(buffer, entry.length)
+    for index, entry in enumerate(entries):
+        previous = entries[index - 1] if index > 0 else None
+        if previous is not None and entry.offset == previous.offset + previous.length:
+            _write_varint(buffer, 0)
+        else:
+            _write_varint(buffer, entry.offset + 1)
+    return gzip.compress(bytes(buffer))
+
+
+def _deserialize_directory(raw: bytes, compression: int) -> list[DirectoryEntry]:
+    data = gzip.decompress(raw) if compression == PMTILES_COMPRESSION_GZIP else raw
+    count, pos = _read_varint(data, 0)
+    tile_ids: list[int] = []
+    last_id = 0
+    for _ in range(count):
+        delta, pos = _read_varint(data, pos)
+        last_id += delta
+        tile_ids.append(last_id)
+    run_lengths: list[int] = []
+    for _ in range(count):
+        value, pos = _read_varint(data, pos)
+        run_lengths.append(value)
+    lengths: list[int] = []
+    for _ in range(count):
+        value, pos = _read_varint(data, pos)
+        lengths.append(value)
+    entries: list[DirectoryEntry] = []
+    for index in range(count):
+        value, pos = _read_varint(data, pos)
+        if value == 0 and index > 0:
+            offset = entries[index - 1].offset + entries[index - 1].length
+        else:
+            offset = value - 1
+        entries.append(DirectoryEntry(tile_ids[index], offset, lengths[index], run_lengths[index]))
+    return entries
+
+
+def _build_directories(entries: list[DirectoryEntry]) -> tuple[bytes, bytes]:
+    """Return (root, leaves); split into leaf directories when the root outgrows 16 KiB."""
+    root = _serialize_directory(entries)
+    if len(root) <= PMTILES_ROOT_BUDGET:
+        return root, b""
+
+    leaf_size = 4096
+    while True:
+        root_entries: list[DirectoryEntry] = []
+        leaves = bytearray()
+        for start in range(0, len(entries), leaf_size):
+            chunk = entries[start : start + leaf_size]
+            leaf = _serialize_directory(chunk)
+            root_entries.append(DirectoryEntry(chunk[0].tile_id, len(leaves), len(leaf), 0))
+            leaves += leaf
+        root = _serialize_directory(root_entries)
+        if len(root) <= PMTILES_ROOT_BUDGET:
+            return root, bytes(leaves)
+        leaf_size *= 2
+
+
+def _find_entry(entries: list[DirectoryEntry], tile_id: int) -> DirectoryEntry | None:
+    index = bisect_right(entries, tile_id, key=lambda entry: entry.tile_id) - 1
+    if index < 0:
+        return None
+    entry = entries[index]
+    if entry.run_length == 0 or tile_id < entry.tile_id + entry.run_length:
+        return entry
+    return None
+
+
+def _e7(value: float) -> int:
+    return int(round(value * 10_000_000))
+
+
+class PMTilesWriter:
+    """Streams tiles into a clustered PMTiles v3 archive; tiles must arrive in tile-id order."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._data = tempfile.TemporaryFile()
+        self._entries: list[DirectoryEntry] = []
+        self._contents: dict[bytes, tuple[int, int]] = {}
+        self._data_length = 0
+        self._min_zoom = 255
+        self._max_zoom = 0
+
+    def add_tile(self, z: int, x: int, y: int, tile: bytes) -> None:
+        """Append one tile payload, de-duplicating identical content."""
+        tile_id = zxy_to_tile_id(z, x, y)
+        if self._entries and tile_id < self._entries[-1].tile_id + self._entries[-1].run_length:
+            raise ValueError("PMTiles tiles must be added in ascending tile-id order")
+
+        digest = hashlib.sha256(tile).digest()
+        location = self._contents.get(digest)
+        if location is None:
+            location = (self._data_length, len(tile))
+            self._data.write(tile)
+            self._data_length += len(tile)
+            self._contents[digest] = location
+
+        last = self._entries[-1] if self._entries else None
+        if last is not None and last.offset == location[0] and last.tile_id + last.run_length == tile_id:
+            self._entries[-1] = last._replace(run_length=last.run_length + 1)
+        else:
+            self._entries.append(DirectoryEntry(tile_id, location[0], location[1], 1))
+        self._min_zoom = min(self._min_zoom, z)
+        self._max_zoom = max(self._max_zoom, z)
+
+    def finalize(self, metadata: dict[str, Any], bounds: Bounds) -> None:
+        """Write header, directories, metadata and tile data to the target path."""
+        root, leaves = _build_directories(self._entries)
+        metadata_bytes = gzip.compress(json.dumps(metadata).encode("utf-8"))
+
+        root_offset = PMTILES_HEADER.size
+        metadata_offset = root_offset + len(root)
+        leaves_offset = metadata_offset + len(metadata_bytes)
+        data_offset = leaves_offset + len(leaves)
+        min_zoom = self._min_zoom if self._entries else 0
+        max_zoom = self._max_zoom if self._entries else 0
+        header = PMTILES_HEADER.pack(
+            b"PMTiles",
+            3,
+            root_offset,
+            len(root),
+            metadata_offset,
+            len(metadata_bytes),
+            leaves_offset,
+            len(leaves),
+            data_offset,
+            self._data_length,
+            sum(entry.run_length for entry in self._entries),
+            len(self._entries),
+            len(self._contents),
+            1,
+            PMTILES_COMPRESSION_GZIP,
+            PMTILES_COMPRESSION_NONE,
+            PMTILES_TILE_TYPE_MVT,
+            min_zoom,
+            max_zoom,
+            _e7(bounds[0]),
+            _e7(bounds[1]),
+            _e7(bounds[2]),
+            _e7(bounds[3]),
+            min_zoom,
+            _e7((bounds[0] + bounds[2]) / 2),
+            _e7((bounds[1] + bounds[3]) / 2),
+        )
+        with self._path.open("wb") as handle:
+            handle.write(header)
+            handle.write(root)
+            handle.write(metadata_bytes)
+            handle.write(leaves)
+            self._data.seek(0)
+            while chunk := self._data.read(1 << 20):
+                handle.write(chunk)
+        self._data.close()
+
+
+class MBTilesWriter:
+    """Writes tiles into an MBTiles 1.3 SQLite archive (TMS row order)."""
+
+    def __init__(self, path: Path) -> None:
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(
+            """
+            CREATE TABLE metadata (name TEXT, value TEXT);
+            CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB);
+            CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row);
+            """
+        )
+        self._min_zoom = 255
+        self._max_zoom = 0
+
+    def add_tile(self, z: int, x: int, y: int, tile: bytes) -> None:
+        """Insert one tile payload."""
+        self._conn.execute(
+            "INSERT INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)",
+            (z, x, (1 << z) - 1 - y, tile),
+        )
+        self._min_zoom = min(self._min_zoom, z)
+        self._max_zoom = max(self._max_zoom, z)
+
+    def finalize(self, metadata: dict[str, Any], bounds: Bounds) -> None:
+        """Write MBTiles metadata and close the database."""
+        min_zoom = self._min_zoom if self._min_zoom != 255 else 0
+        rows = {
+            "name": str(metadata.get("name", "risk")),
+            "format": "pbf",
+            "type": "overlay",
+            "minzoom": str(min_zoom),
+            "maxzoom": str(self._max_zoom),
+            "bounds": ",".join(f"{value:.7f}" for value in bounds),
+            "json": json.dumps(metadata),
+        }
+        self._conn.executemany("INSERT INTO metadata (name, value) VALUES (?, ?)", rows.items())
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+        self._conn.close()
+
+
+class PMTilesArchive:
+    """Memory-mapped PMTiles reader returning zero-copy tile views."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        fields = PMTILES_HEADER.unpack_from(self._mmap, 0)
+        if fields[0] != b"PMTiles" or fields[1] != 3:
+            self.close()
+            raise ValueError(f"Not a PMTiles v3 archive: {path}")
+        root_offset, root_length = fields[2], fields[3]
+        self._leaves_offset = fields[6]
+        self._data_offset = fields[8]
+        self._compression = fields[14]
+        self.min_zoom = fields[17]
+        self.max_zoom = fields[18]
+        self._root = _deserialize_directory(self._mmap[root_offset : root_offset + root_length], self._compression)
+        self._leaves: dict[int, list[DirectoryEntry]] = {}
+
+    def _leaf(self, offset: int, length: int) -> list[DirectoryEntry]:
+        leaf = self._leaves.get(offset)
+        if leaf is None:
+            start = self._leaves_offset + offset
+            leaf = _deserialize_directory(self._mmap[start : start + length], self._compression)
+            self._leaves[offset] = leaf
+        return leaf
+
+    def get_tile(self, z: int, x: int, y: int) -> memoryview | None:
+        """Return tile payload as a view into the mapping, or None when absent."""
+        tile_id = zxy_to_tile_id(z, x, y)
+        entries = self._root
+        for _ in range(4):
+            entry = _find_entry(entries, tile_id)
+            if entry is None:
+                return None
+            if entry.run_length > 0:
+                start = self._data_offset + entry.offset
+                return self._view[start : start + entry.length]
+            entries = self._leaf(entry.offset, entry.length)
+        return None
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        self._view.release()
+        self._mmap.close()
+
+
+class MBTilesArchive:
+    """Read-only MBTiles reader using SQLite mmap I/O on an immutable file."""
+
+    def __init__(self, path: Path, mmap_size: int = 1 << 30) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self._lock = threading.Lock()
+        metadata = dict(self._conn.execute("SELECT name, value FROM metadata").fetchall())
+        self.min_zoom = int(metadata.get("minzoom", 0))
+        self.max_zoom = int(metadata.get("maxzoom", 0))
+
+    def get_tile(self, z: int, x: int, y: int) -> bytes | None:
+        """Return tile payload or None when absent."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, (1 << z) - 1 - y),
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def close(self) -> None:
+        """Close the SQLite handle."""
+        self._conn.close()
+
+
+TileArchive = PMTilesArchive | MBTilesArchive
+
+
+def open_tile_archive(path: Path) -> TileArchive:
+    """Open an archive by file extension."""
+    if path.suffix == ".pmtiles":
+        return PMTilesArchive(path)
+    if path.suffix == ".mbtiles":
+        return MBTilesArchive(path)
+    raise ValueError(f"Unsupported tile archive format: {path.suffix}")
+
+
+class TileArchiveStore:
+    """Per-date archive registry; archives are opened once and stay mapped.
+
+    A newly published archive (atomic rename by the exporter) is picked up on
+    the next lookup because a changed inode invalidates the cached handle. The
+    replaced handle is closed once no ``read_tile`` call is reading from it; a
+    PMTiles mapping that still backs tile views being sent is retried on later
+    lookups instead.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._archives: dict[date, tuple[int, TileArchive]] = {}
+        self._retired: list[TileArchive] = []
+        self._readers: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, risk_date: date) -> TileArchive | None:
+        """Return the mapped archive for a date, or None when the date is not baked.
+
+        The handle may be closed by a later republish; use ``read_tile`` to read from it.
+        """
+        return self._lookup(risk_date, pin=False)
+
+    def read_tile(self, risk_date: date, z: int, x: int, y: int) -> bytes | memoryview | None:
+        """Read one tile from the date's archive, or None when no archive covers the date and zoom.
+
+        A tile the archive does not hold is empty. The archive is pinned for the read,
+        so a concurrent republish cannot close it in between.
+        """
+        archive = self._lookup(risk_date, pin=True)
+        if archive is None:
+            return None
+        try:
+            if not archive.min_zoom <= z <= archive.max_zoom:
+                return None
+            tile = archive.get_tile(z, x, y)
+            return tile if tile is not None else b""
+        finally:
+            with self._lock:
+                remaining = self._readers[id(archive)] - 1
+                if remaining:
+                    self._readers[id(archive)] = remaining
+                else:
+                    del self._readers[id(archive)]
+                self._close_retired()
+
+    def close(self) -> None:
+        """Close every open archive that is not being read."""
+        with self._lock:
+            self._retired.extend(archive for _, archive in self._archives.values())
+            self._archives.clear()
+            self._close_retired()
+
+    def _lookup(self, risk_date: date, pin: bool) -> TileArchive | None:
+        for archive_format in ARCHIVE_FORMATS:
+            path = archive_path(self._directory, risk_date, archive_format)
+            try:
+                inode = os.stat(path).st_ino
+            except FileNotFoundError:
+                continue
+            with self._lock:
+                self._close_retired()
+                cached = self._archives.get(risk_date)
+                if cached is not None and cached[0] == inode:
+                    archive = cached[1]
+                else:
+                    archive = open_tile_archive(path)
+                    self._archives[risk_date] = (inode, archive)
+                    if cached is not None:
+                        self._retired.append(cached[1])
+                        self._close_retired()
+                if pin:
+                    self._readers[id(archive)] = self._readers.get(id(archive), 0) + 1
+                return archive
+        return None
+
+    def _close_retired(self) -> None:
+        # Archives being read stay open; closing a mapping fails with BufferError while a
+        # served tile view still points into it.
+        still_open: list[TileArchive] = []
+        for archive in self._retired:
+            if id(archive) in self._readers:
+                still_open.append(archive)
+                continue
+            try:
+                archive.close()
+            except BufferError:
+                still_open.append(archive)
+        self._retired = still_open
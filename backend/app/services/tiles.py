@@ -0,0 +1,162 @@
+"""Vector tile rendering from the mv_daily_risk read model."""
+
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.app.models.event import ALL_EVENT_TYPES
+
+TILE_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+RISK_TILE_SQL = text(
+    """
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+    ),
+    source AS (
+        SELECT
+            to_hex(m.h3_index) AS h3_index,
+            m.time_bucket,
+            m.event_count,
+            m.rolling_7d_avg,
+            m.growth_rate,
+            m.risk_score,
+            m.risk_level,
+            m.flagged,
+            ST_AsMVTGeom(ST_Transform(m.geom, 3857), b.geom, 4096, 64, true) AS geom
+        FROM mv_daily_risk m
+        CROSS JOIN bounds b
+        WHERE ST_Intersects(ST_Transform(m.geom, 3857), b.geom)
+          AND m.event_type = :event_type
+          AND (CAST(:risk_date AS DATE) IS NULL OR m.time_bucket = :risk_date)
+          AND (
+              CAST(:risk_levels AS text[]) IS NULL
+              OR m.risk_level::text = ANY(CAST(:risk_levels AS text[]))
+          )
+    )
+    SELECT ST_AsMVT(source, 'risk', 4096, 'geom') AS tile
+    FROM source
+    """
+)
+
+
+def render_risk_tile(
+    db: Session,
+    z: int,
+    x: int,
+    y: int,
+    risk_date: date | None = None,
+    risk_levels: list[str] | None = None,
+    event_type: str = ALL_EVENT_TYPES,
+) -> bytes:
+    """Render one risk MVT with ST_AsMVT; empty tiles come back as b''."""
+    tile = db.execute(
+        RISK_TILE_SQL,
+        {"z": z, "x": x, "y": y, "risk_date": risk_date, "risk_levels": risk_levels, "event_type": event_type},
+    ).scalar_one_or_none()
+    return bytes(tile) if tile else b""
+
+
+async def render_risk_tile_async(
+    db: AsyncSession,
+    z: int,
+    x: int,
+    y: int,
+    risk_date: date | None = None,
+    risk_levels: list[str] | None = None,
+    event_type: str = ALL_EVENT_TYPES,
+) -> bytes:
+    """Async variant of ``render_risk_tile`` for the API read path."""
+    result = await db.execute(
+        RISK_TILE_SQL,
+        {"z": z, "x": x, "y": y, "risk_date": risk_date, "risk_levels": risk_levels, "event_type": event_type},
+    )
+    tile = result.scalar_one_or_none()
+    return bytes(tile) if tile else b""
+
+
+# One feature per hexagon; per-day attributes are dense strings aligned to the
+# day offsets of [start_date, end_date] so clients can index them by day:
+#   levels  - one char per day: l/m/h/c, '-' when the cell has no score that day
+#   flagged - one char per day: '1' when the anomaly flag is set
+#   scores  - comma-separated scores rounded to 0.1, empty when missing
+RISK_SERIES_TILE_SQL = text(
+    """
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(:z, :x, :y) AS geom
+    ),
+    daily AS (
+        SELECT m.h3_index, m.time_bucket, m.risk_score, m.risk_level, m.flagged
+        FROM mv_daily_risk m
+        CROSS JOIN bounds b
+        WHERE m.event_type = :event_type
+          AND m.time_bucket BETWEEN :start_date AND :end_date
+          AND ST_Intersects(ST_Transform(m.geom, 3857), b.geom)
+          AND (
+              CAST(:risk_levels AS text[]) IS NULL
+              OR m.risk_level::text = ANY(CAST(:risk_levels AS text[]))
+          )
+    ),
+    days AS (
+        SELECT generate_series(CAST(:start_date AS DATE), CAST(:end_date AS DATE), INTERVAL '1 day')::date AS day
+    ),
+    series AS (
+        SELECT
+            c.h3_index,
+            string_agg(COALESCE(round(d.risk_score::numeric, 1)::text, ''), ',' ORDER BY days.day) AS scores,
+            string_agg(COALESCE(left(d.risk_level::text, 1), '-'), '' ORDER BY days.day) AS levels,
+            string_agg(CASE WHEN d.flagged THEN '1' ELSE '0' END, '' ORDER BY days.day) AS flagged,
+            MAX(d.risk_score) AS max_score
+        FROM (SELECT DISTINCT h3_index FROM daily) c
+        CROSS JOIN days
+        LEFT JOIN daily d
+          ON d.h3_index = c.h3_index
+         AND d.time_bucket = days.day
+        GROUP BY c.h3_index
+    ),
+    source AS (
+        SELECT
+            to_hex(s.h3_index) AS h3_index,
+            s.scores,
+            s.levels,
+            s.flagged,
+            s.max_score,
+            ST_AsMVTGeom(ST_Transform(h3.geom, 3857), b.geom, 4096, 64, true) AS geom
+        FROM series s
+        JOIN h3_cells h3
+          ON h3.h3_index = s.h3_index
+        CROSS JOIN bounds b
+    )
+    SELECT ST_AsMVT(source, 'risk_series', 4096, 'geom') AS tile
+    FROM source
+    """
+)
+
+
+async def render_risk_series_tile(
+    db: AsyncSession,
+    z: int,
+    x: int,
+    y: int,
+    start_date: date,
+    end_date: date,
+    risk_levels: list[str] | None = None,
+    event_type: str = ALL_EVENT_TYPES,
+) -> bytes:
+    """Render one MVT holding each hexagon once with per-day attribute strings."""
+    result = await db.execute(
+        RISK_SERIES_TILE_SQL,
+        {
+            "z": z,
+            "x": x,
+            "y": y,
+            "start_date": start_date,
+            "end_date": end_date,
+            "risk_levels": risk_levels,
+            "event_type": event_type,
+        },
+    )
+    tile = result.scalar_one_or_none()
+    return bytes(tile) if tile else b""
@@ -6,6 +6,7 @@ import argparse
 
 from sqlalchemy import select
 
+from backend.app.core.revocation import publish_token_version
 from backend.app.core.security import get_password_hash
 from backend.app.db.session import SessionLocal
 from backend.app.models.user import User, UserRole
@@ -26,13 +27,15 @@ def parse_args() -> argparse.Namespace:
 
 
 def upsert_user(username: str, password: str, role: UserRole) -> str:
-    """Create user if missing; otherwise rotate credentials and role."""
+    """Create user if missing; otherwise rotate credentials and role and revoke old tokens."""
     with SessionLocal() as db:
         existing = db.scalar(select(User).where(User.username == username))
         if existing:
             existing.hashed_password = get_password_hash(password)
             existing.role = role
+            existing.token_version += 1
             db.commit()
+            publish_token_version(existing.username, existing.token_version)
             return "updated"
 
         db.add(
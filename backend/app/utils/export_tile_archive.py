@@ -0,0 +1,144 @@
+"""CLI utility to bake the risk tile pyramid for finalized dates into offline archives."""
+
+from __future__ import annotations
+
+import argparse
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import get_settings
+from backend.app.db.session import SessionLocal
+from backend.app.models.event import ALL_EVENT_TYPES
+from backend.app.services.tile_archive import (
+    ARCHIVE_FORMATS,
+    Bounds,
+    MBTilesWriter,
+    PMTilesWriter,
+    archive_path,
+    tiles_covering,
+    zxy_to_tile_id,
+)
+from backend.app.services.tiles import render_risk_tile
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse date range, zoom range and output options."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Bake risk vector tiles into PMTiles/MBTiles archives.")
+    parser.add_argument("--start-date", required=True, type=date.fromisoformat, help="First risk date (YYYY-MM-DD).")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="Last risk date; defaults to --start-date.")
+    parser.add_argument("--format", default="pmtiles", choices=ARCHIVE_FORMATS, help="Archive format.")
+    parser.add_argument(
+        "--output-dir",
+        default=settings.tile_archive_dir or ".",
+        help="Directory receiving risk_<date>.<format> archives.",
+    )
+    parser.add_argument("--min-zoom", type=int, default=0, help="Lowest zoom level to bake.")
+    parser.add_argument("--max-zoom", type=int, default=settings.tile_archive_max_zoom, help="Highest zoom level.")
+    return parser.parse_args()
+
+
+def cell_bounds_for_date(db: Session, risk_date: date) -> list[Bounds]:
+    """Return the lon/lat bounding box of every scored cell on a date."""
+    rows = db.execute(
+        text(
+            """
+            SELECT ST_XMin(geom) AS min_lon, ST_YMin(geom) AS min_lat, ST_XMax(geom) AS max_lon, ST_YMax(geom) AS max_lat
+            FROM mv_daily_risk
+            WHERE event_type = :event_type
+              AND time_bucket = :risk_date
+            """
+        ),
+        {"event_type": ALL_EVENT_TYPES, "risk_date": risk_date},
+    ).all()
+    return [(row.min_lon, row.min_lat, row.max_lon, row.max_lat) for row in rows]
+
+
+def bake_tile_archive(
+    db: Session,
+    risk_date: date,
+    output_path: Path,
+    min_zoom: int = 0,
+    max_zoom: int = 12,
+) -> int:
+    """Render every non-empty tile for a date and publish the archive atomically."""
+    cell_bounds = cell_bounds_for_date(db, risk_date)
+    if not cell_bounds:
+        return 0
+
+    tiles: set[tuple[int, int, int]] = set()
+    for z in range(min_zoom, max_zoom + 1):
+        for bounds in cell_bounds:
+            tiles.update((z, x, y) for x, y in tiles_covering(bounds, z))
+
+    archive_format = output_path.suffix.lstrip(".")
+    staging_path = output_path.with_name(f".{output_path.name}.partial")
+    staging_path.unlink(missing_ok=True)
+    writer = PMTilesWriter(staging_path) if archive_format == "pmtiles" else MBTilesWriter(staging_path)
+
+    written = 0
+    for z, x, y in sorted(tiles, key=lambda tile: zxy_to_tile_id(*tile)):
+        tile = render_risk_tile(db, z, x, y, risk_date=risk_date)
+        if tile:
+            writer.add_tile(z, x, y, tile)
+            written += 1
+
+    extent = (
+        min(bounds[0] for bounds in cell_bounds),
+        min(bounds[1] for bounds in cell_bounds),
+        max(bounds[2] for bounds in cell_bounds),
+        max(bounds[3] for bounds in cell_bounds),
+    )
+    writer.finalize(
+        {
+            "name": f"risk_{risk_date.isoformat()}",
+            "risk_date": risk_date.isoformat(),
+            "vector_layers": [
+                {
+                    "id": "risk",
+                    "minzoom": min_zoom,
+                    "maxzoom": max_zoom,
+                    "fields": {
+                        "h3_index": "String",
+                        "time_bucket": "String",
+                        "event_count": "Number",
+                        "rolling_7d_avg": "Number",
+                        "growth_rate": "Number",
+                        "risk_score": "Number",
+                        "risk_level": "String",
+                        "flagged": "Boolean",
+                    },
+                }
+            ],
+        },
+        extent,
+    )
+    os.replace(staging_path, output_path)
+    return written
+
+
+def main() -> None:
+    """Entrypoint for tile archive export."""
+    args = parse_args()
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    end_date = args.end_date or args.start_date
+
+    current = args.start_date
+    with SessionLocal() as db:
+        while current <= end_date:
+            output_path = archive_path(output_dir, current, args.format)
+            written = bake_tile_archive(db, current, output_path, args.min_zoom, args.max_zoom)
+            if written:
+                print(f"Wrote {written} tiles for {current} to {output_path}.")
+            else:
+                print(f"No scored cells for {current}. Skipping.")
+            current += timedelta(days=1)
+
+
+if __name__ == "__main__":
+    main()
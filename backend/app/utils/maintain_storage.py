@@ -0,0 +1,26 @@
+"""CLI utility to run one storage maintenance pass and report the size change."""
+
+from __future__ import annotations
+
+from backend.app.db.session import SessionLocal
+from backend.app.services.storage_maintenance import run_storage_maintenance, table_sizes
+
+
+def main() -> None:
+    """Entrypoint for storage maintenance."""
+    with SessionLocal() as db:
+        before = table_sizes(db)
+        report = run_storage_maintenance(db)
+        after = table_sizes(db)
+
+    if report.rolled_up_before is not None:
+        print(f"Rolled up {report.rolled_up_cell_days} cell-days before {report.rolled_up_before} into weekly rollups.")
+    for table in before:
+        print(
+            f"{table}: compressed={report.compressed_chunks.get(table, 0)} dropped={report.dropped_chunks.get(table, 0)} "
+            f"size={before[table] / 2**20:,.1f} MiB -> {after[table] / 2**20:,.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,63 @@
-"""CLI utility to seed events from a CSV file."""
+"""CLI utility to bulk-load events from CSV, NDJSON, GeoJSON or Parquet files."""
 
 from __future__ import annotations
 
 import argparse
-import csv
-import json
-from datetime import datetime
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-from backend.app.db.session import SessionLocal
-from backend.app.schemas.event import EventUploadItem
-from backend.app.services.ingestion import ingest_events
+from backend.app.core.config import get_settings
+from backend.app.services.bulk_load import FORMATS, build_tasks, load_shard
+
+settings = get_settings()
 
 
 def parse_args() -> argparse.Namespace:
-    """Read CSV file location and delimiter options."""
-    parser = argparse.ArgumentParser(description="Bulk-load events from CSV.")
-    parser.add_argument("--csv", required=True, help="Path to CSV file.")
+    """Read input location, format and parallelism options."""
+    parser = argparse.ArgumentParser(description="Bulk-load events; interrupted loads resume from their checkpoint.")
+    parser.add_argument("--input", "--csv", dest="input", required=True, help="Path to the source file (may be .gz).")
+    parser.add_argument("--format", choices=sorted(FORMATS), default=None, help="Override format detection.")
     parser.add_argument("--delimiter", default=",", help="CSV delimiter. Default is ','.")
-    return parser.parse_args()
-
-
-def parse_row(row: dict[str, str]) -> EventUploadItem:
-    """Transform CSV row into validated schema object."""
-    attrs_raw = row.get("attributes_json")
-    attributes = json.loads(attrs_raw) if attrs_raw else None
-    return EventUploadItem(
-        event_type=row["event_type"],
-        event_timestamp=datetime.fromisoformat(row["event_timestamp"]),
-        longitude=float(row["longitude"]),
-        latitude=float(row["latitude"]),
-        attributes_json=attributes,
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size, help="Rows per COPY batch and commit.")
+    parser.add_argument(
+        "--deduplicate",
+        action="store_true",
+        default=settings.ingest_deduplicate,
+        help="Skip events already stored (event_key column or content hash).",
     )
-
-
-def load_events(csv_path: Path, delimiter: str) -> list[EventUploadItem]:
-    """Load and validate events from CSV."""
-    with csv_path.open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle, delimiter=delimiter)
-        return [parse_row(row) for row in reader]
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel parser/loader processes.")
+    return parser.parse_args()
 
 
 def main() -> None:
     """Entrypoint for event seed utility."""
     args = parse_args()
-    csv_path = Path(args.csv)
-    if not csv_path.exists():
-        raise FileNotFoundError(f"CSV file does not exist: {csv_path}")
+    source = Path(args.input)
+    if not source.exists():
+        raise FileNotFoundError(f"Input file does not exist: {source}")
 
-    events = load_events(csv_path, args.delimiter)
-    if not events:
-        print("No rows found in CSV. Nothing to ingest.")
+    tasks, already_done = build_tasks(source, args.format, args.batch_size, args.delimiter, args.deduplicate)
+    if already_done:
+        print(f"Resuming: {already_done} shard(s) already loaded.")
+    if not tasks:
+        print(f"Nothing to load from {source}.")
         return
 
-    with SessionLocal() as db:
-        inserted = ingest_events(db, events)
-    print(f"Inserted {inserted} event records from {csv_path}.")
+    inserted = rejected = 0
+    # Spawned workers build their own engine and connection instead of inheriting the parent's pool.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(tasks)), mp_context=context) as pool:
+        futures = [pool.submit(load_shard, task) for task in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            inserted += result.inserted
+            rejected += result.rejected
+            for error in result.errors:
+                print(f"Rejected: {error}")
+            print(f"Shard {result.shard} done: {result.inserted} inserted, {result.rejected} rejected.")
+    print(f"Inserted {inserted} event records from {source} ({rejected} rejected).")
 
 
 if __name__ == "__main__":
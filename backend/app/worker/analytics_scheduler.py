@@ -0,0 +1,213 @@
+"""Debounced analytics scheduler driven by ingestion NOTIFY signals.
+
+    python -m backend.app.worker.analytics_scheduler
+
+Every committed ingest batch is logged in ``ingest_batches`` and sends
+``events_ingested`` with the row id and its min/max event timestamps. The
+scheduler merges signals into one pending day range and dispatches a single
+``run_analytics_pipeline`` once ingestion has been quiet for
+``ANALYTICS_TRIGGER_DEBOUNCE_SECONDS``, or at the latest
+``ANALYTICS_TRIGGER_MAX_DELAY_SECONDS`` after the first signal, so steady feeds
+still refresh risk maps within minutes. The range is widened forward (capped at
+today) by the engine's rolling and risk normalization windows, because new counts
+also change the rolling averages, growth rates and score bounds of the following
+days.
+
+Postgres does not queue notifications for a listener that is gone, so the
+batch log is what makes signals durable: a dispatched range deletes its rows,
+and every (re)connect merges the rows still in the log after LISTEN starts.
+Batches committed while the scheduler was stopped or disconnected are
+therefore dispatched when it is back; the connection is retried with capped
+exponential backoff.
+"""
+
+from __future__ import annotations
+
+import logging
+import signal
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as day_time
+from types import FrameType
+from typing import cast
+
+import orjson
+import psycopg
+from sqlalchemy.exc import OperationalError
+
+from backend.app.analytics.engine import AnalyticsEngine
+from backend.app.core.config import get_settings
+from backend.app.db.session import engine
+from backend.app.services.ingestion import INGESTED_CHANNEL
+from backend.app.worker.tasks import run_analytics_pipeline
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+POLL_SECONDS = 5.0
+MAX_BACKOFF_SECONDS = 30.0
+LOGGED_BATCHES_SQL = """
+    SELECT id, min_event_timestamp, max_event_timestamp, event_count
+    FROM ingest_batches
+    ORDER BY id
+"""
+DELETE_BATCHES_SQL = "DELETE FROM ingest_batches WHERE id = ANY(%s)"
+
+
+@dataclass
+class PendingRange:
+    """Merged day range of ingest batches not yet dispatched."""
+
+    first_day: date
+    last_day: date
+    events: int
+    first_signal: float
+    last_signal: float
+    batch_ids: set[int] = field(default_factory=set)
+
+    def merge(self, batch_id: int, first_day: date, last_day: date, events: int, now: float) -> None:
+        """Widen the range to cover another batch; a batch seen twice is counted once."""
+        if batch_id in self.batch_ids:
+            return
+        self.batch_ids.add(batch_id)
+        self.first_day = min(self.first_day, first_day)
+        self.last_day = max(self.last_day, last_day)
+        self.events += events
+        self.last_signal = now
+
+    def due_in(self, now: float) -> float:
+        """Seconds until dispatch: debounce after the last signal, bounded by the max delay after the first."""
+        quiet_at = self.last_signal + settings.analytics_trigger_debounce_seconds
+        deadline = self.first_signal + settings.analytics_trigger_max_delay_seconds
+        return min(quiet_at, deadline) - now
+
+
+def add_batch(
+    pending: PendingRange | None, batch_id: int, first_day: date, last_day: date, events: int
+) -> PendingRange:
+    """Merge one ingest batch into the pending range, starting one when there is none."""
+    now = time.monotonic()
+    if pending is None:
+        return PendingRange(first_day, last_day, events, first_signal=now, last_signal=now, batch_ids={batch_id})
+    pending.merge(batch_id, first_day, last_day, events, now)
+    return pending
+
+
+def parse_signal(payload: str) -> tuple[int, date, date, int]:
+    """Decode an ``events_ingested`` payload into (batch id, first day, last day, events) in UTC."""
+    data = orjson.loads(payload)
+    first = datetime.fromisoformat(data["min"]).astimezone(UTC).date()
+    last = datetime.fromisoformat(data["max"]).astimezone(UTC).date()
+    return int(data["id"]), first, last, int(data["count"])
+
+
+def load_logged_batches(listener: psycopg.Connection, pending: PendingRange | None) -> PendingRange | None:
+    """Merge every batch still in ``ingest_batches``, including any whose NOTIFY was missed."""
+    for batch_id, min_timestamp, max_timestamp, events in listener.execute(LOGGED_BATCHES_SQL):
+        first_day = min_timestamp.astimezone(UTC).date()
+        last_day = max_timestamp.astimezone(UTC).date()
+        pending = add_batch(pending, batch_id, first_day, last_day, events)
+    return pending
+
+
+def dispatch_window(first_day: date, last_day: date, today: date) -> tuple[datetime, datetime]:
+    """Pipeline window for a merged range, extended by the days its counts feed into but not past today.
+
+    Those are the rolling lookback and the trailing risk normalization window of later days.
+    """
+    lookback = timedelta(days=max(AnalyticsEngine.rolling_lookback_days, AnalyticsEngine.risk_normalization_days - 1))
+    end_day = max(last_day, min(last_day + lookback, today))
+    return datetime.combine(first_day, day_time.min, tzinfo=UTC), datetime.combine(end_day, day_time.max, tzinfo=UTC)
+
+
+def dispatch(pending: PendingRange, listener: psycopg.Connection) -> None:
+    """Queue one pipeline run for the pending range, then drop its batches from the log.
+
+    A failure between the two leaves the batches logged, so the range is run
+    again after a reconnect rather than lost; pipeline runs are idempotent.
+    """
+    start_dt, end_dt = dispatch_window(pending.first_day, pending.last_day, datetime.now(UTC).date())
+    task = run_analytics_pipeline.delay(start_dt.isoformat(), end_dt.isoformat())
+    listener.execute(DELETE_BATCHES_SQL, (sorted(pending.batch_ids),))
+    logger.info(
+        "Dispatched analytics run %s for %s..%s after %d ingested events",
+        task.id,
+        start_dt.date(),
+        end_dt.date(),
+        pending.events,
+    )
+
+
+def dispatch_due(pending: PendingRange | None, listener: psycopg.Connection) -> PendingRange | None:
+    """Dispatch the pending range once it is due; returns what is still pending."""
+    if pending is not None and pending.due_in(time.monotonic()) <= 0:
+        dispatch(pending, listener)
+        return None
+    return pending
+
+
+def listen(listener: psycopg.Connection, pending: PendingRange | None, stop: list[bool]) -> PendingRange | None:
+    """Merge signals into ``pending`` and dispatch due ranges until ``stop[0]`` is set."""
+    while not stop[0]:
+        timeout = POLL_SECONDS if pending is None else max(min(pending.due_in(time.monotonic()), POLL_SECONDS), 0)
+        for notify in listener.notifies(timeout=timeout):
+            try:
+                batch_id, first_day, last_day, events = parse_signal(notify.payload)
+            except (KeyError, TypeError, ValueError):
+                logger.warning("Ignoring malformed %s payload: %r", INGESTED_CHANNEL, notify.payload)
+                continue
+            pending = add_batch(pending, batch_id, first_day, last_day, events)
+        pending = dispatch_due(pending, listener)
+    return pending
+
+
+def run(stop: list[bool]) -> None:
+    """LISTEN for ingest signals and dispatch debounced runs until ``stop[0]`` is set, reconnecting on errors.
+
+    On stop the pending range is dispatched; if the database is unreachable by
+    then, its batches stay logged for the next start.
+    """
+    pending: PendingRange | None = None
+    backoff = 0.5
+    while not stop[0]:
+        try:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                listener = cast(psycopg.Connection, connection.connection.driver_connection)
+                try:
+                    listener.execute(f"LISTEN {INGESTED_CHANNEL}")
+                    # Batches committed from here on also NOTIFY; merge() drops the overlap.
+                    pending = load_logged_batches(listener, pending)
+                    logger.info("Listening on %s", INGESTED_CHANNEL)
+                    backoff = 0.5
+                    pending = listen(listener, pending, stop)
+                    if pending is not None:
+                        dispatch(pending, listener)
+                        pending = None
+                except psycopg.OperationalError:
+                    # The pool cannot see errors raised by the raw driver connection.
+                    connection.invalidate()
+                    raise
+        except (psycopg.OperationalError, OperationalError) as exc:
+            logger.warning("Lost %s listener connection, reconnecting in %.1fs: %s", INGESTED_CHANNEL, backoff, exc)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+
+
+def main() -> None:
+    """Entrypoint for the analytics scheduler; SIGTERM/SIGINT dispatch any pending range and exit."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    stop = [False]
+
+    def request_stop(signum: int, frame: FrameType | None) -> None:
+        _ = frame
+        logger.info("Received signal %d, stopping", signum)
+        stop[0] = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    run(stop)
+
+
+if __name__ == "__main__":
+    main()
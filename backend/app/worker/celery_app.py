@@ -1,6 +1,7 @@
 """Celery app setup."""
 
 from celery import Celery
+from celery.schedules import crontab
 
 from backend.app.core.config import get_settings
 
@@ -8,6 +9,17 @@ settings = get_settings()
 
 celery_app = Celery("risk_intelligence_engine", broker=settings.redis_url, backend=settings.redis_url)
 celery_app.conf.update(
-    task_routes={"backend.app.worker.tasks.run_analytics_pipeline": {"queue": "analytics"}},
+    task_routes={
+        "backend.app.worker.tasks.run_analytics_pipeline": {"queue": "analytics"},
+        "backend.app.worker.tasks.run_pipeline_stage": {"queue": "analytics"},
+        "backend.app.worker.tasks.publish_pipeline_run": {"queue": "analytics"},
+        "backend.app.worker.tasks.run_storage_maintenance_task": {"queue": "analytics"},
+    },
     task_track_started=True,
+    beat_schedule={
+        "storage-maintenance": {
+            "task": "backend.app.worker.tasks.run_storage_maintenance_task",
+            "schedule": crontab(hour=3, minute=30),
+        },
+    },
 )
@@ -0,0 +1,222 @@
+"""Consumer-group worker that drains the ingest stream into ``events``.
+
+Run one or more per deployment:
+
+    python -m backend.app.worker.ingest_consumer --name ingest-1
+
+Each iteration first reclaims entries left pending by dead consumers, then
+reads new entries until ``INGEST_STREAM_BATCH_SIZE`` are collected or
+``INGEST_STREAM_LINGER_MS`` passes, and COPYs them in one transaction. Entries
+are acknowledged and deleted only after the commit. Events without a caller
+key are keyed by their stream entry id, so a batch redelivered after a crash
+between commit and acknowledgement is merged away by ``uq_events_key``. A batch
+that keeps failing is moved to ``DEAD_LETTER_KEY`` after
+``INGEST_STREAM_MAX_ATTEMPTS`` tries instead of blocking the stream.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import time
+from dataclasses import dataclass, field
+from types import FrameType
+
+import psycopg
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.app.core.cache import redis_client
+from backend.app.core.config import get_settings
+from backend.app.core.ingest_stream import (
+    CONSUMER_GROUP,
+    DEAD_LETTER_KEY,
+    EVENT_FIELD,
+    STREAM_KEY,
+    ensure_consumer_group,
+)
+from backend.app.db.session import SessionLocal
+from backend.app.schemas.event import EventUploadItem
+from backend.app.services.ingestion import copy_events
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MAX_BACKOFF_SECONDS = 30.0
+
+Entry = tuple[bytes, dict[bytes, bytes]]
+
+
+@dataclass
+class DrainStats:
+    """Running totals for one consumer process."""
+
+    batches: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    dead_lettered: int = 0
+    failures: dict[bytes, int] = field(default_factory=dict)
+
+
+def parse_entries(entries: list[Entry]) -> tuple[list[EventUploadItem], set[bytes]]:
+    """Decode stream entries into events; returns (events, ids of malformed entries)."""
+    events: list[EventUploadItem] = []
+    malformed: set[bytes] = set()
+    for entry_id, fields in entries:
+        try:
+            item = EventUploadItem.model_validate_json(fields[EVENT_FIELD])
+        except (KeyError, ValidationError):
+            malformed.add(entry_id)
+            continue
+        if item.event_key is None and not settings.ingest_deduplicate:
+            item.event_key = f"stream:{entry_id.decode()}"
+        events.append(item)
+    return events, malformed
+
+
+def claim_stale(consumer: str, count: int) -> list[Entry]:
+    """Take over entries another consumer read but never acknowledged."""
+    _, entries, *_ = redis_client.xautoclaim(  # type: ignore[misc]
+        STREAM_KEY, CONSUMER_GROUP, consumer, settings.ingest_stream_claim_idle_ms, "0-0", count=count
+    )
+    return [(entry_id, fields) for entry_id, fields in entries if fields]
+
+
+def read_batch(consumer: str, batch_size: int) -> list[Entry]:
+    """Block for the first entries, then keep reading until the batch fills or the linger window closes."""
+    entries: list[Entry] = []
+    block_ms = settings.ingest_stream_block_ms
+    deadline: float | None = None
+    while len(entries) < batch_size:
+        if deadline is not None:
+            block_ms = int((deadline - time.monotonic()) * 1000)
+            if block_ms <= 0:
+                break
+        response = redis_client.xreadgroup(
+            CONSUMER_GROUP, consumer, {STREAM_KEY: ">"}, count=batch_size - len(entries), block=block_ms
+        )
+        if not response:
+            break
+        entries.extend(response[0][1])  # type: ignore[index]
+        if deadline is None:
+            deadline = time.monotonic() + settings.ingest_stream_linger_ms / 1000
+    return entries
+
+
+def acknowledge(entry_ids: list[bytes]) -> None:
+    """Ack and delete entries so the stream length tracks the unwritten backlog."""
+    if not entry_ids:
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.xack(STREAM_KEY, CONSUMER_GROUP, *entry_ids)
+    pipe.xdel(STREAM_KEY, *entry_ids)
+    pipe.execute()
+
+
+def dead_letter(entries: list[Entry], error: str) -> None:
+    """Park entries that cannot be written, with the last error, then acknowledge them."""
+    pipe = redis_client.pipeline(transaction=False)
+    for entry_id, fields in entries:
+        pipe.xadd(DEAD_LETTER_KEY, {EVENT_FIELD: fields.get(EVENT_FIELD, b""), b"entry_id": entry_id, b"error": error[:1000]})
+    pipe.execute()
+    acknowledge([entry_id for entry_id, _ in entries])
+
+
+def write_batch(entries: list[Entry], stats: DrainStats) -> None:
+    """COPY one batch in a single transaction, then acknowledge it; failed batches stay pending."""
+    events, malformed = parse_entries(entries)
+    batch_key = entries[0][0]
+    with SessionLocal() as db:
+        try:
+            inserted = copy_events(db, events, precheck=False) if events else 0
+            db.commit()
+        except (psycopg.Error, SQLAlchemyError) as exc:
+            db.rollback()
+            attempts = stats.failures[batch_key] = stats.failures.get(batch_key, 0) + 1
+            if attempts < settings.ingest_stream_max_attempts:
+                raise
+            logger.error("Dead-lettering %d stream entries after %d attempts: %s", len(entries), attempts, exc)
+            dead_letter(entries, str(exc))
+            stats.failures.pop(batch_key, None)
+            stats.dead_lettered += len(entries)
+            return
+
+    if malformed:
+        dead_letter([entry for entry in entries if entry[0] in malformed], "malformed event")
+    acknowledge([entry_id for entry_id, _ in entries if entry_id not in malformed])
+    stats.failures.pop(batch_key, None)
+    stats.batches += 1
+    stats.inserted += inserted
+    stats.duplicates += len(events) - inserted
+    stats.rejected += len(malformed)
+
+
+def drain(consumer: str, batch_size: int, stop: list[bool]) -> DrainStats:
+    """Consume until ``stop[0]`` is set; a failing batch is retried with capped exponential backoff."""
+    ensure_consumer_group()
+    stats = DrainStats()
+    retry: list[Entry] = []
+    backoff = 0.5
+    while not stop[0]:
+        entries = retry or claim_stale(consumer, batch_size) or read_batch(consumer, batch_size)
+        if not entries:
+            continue
+        try:
+            write_batch(entries, stats)
+        except (psycopg.Error, SQLAlchemyError) as exc:
+            logger.warning("Ingest batch of %d entries failed, retrying in %.1fs: %s", len(entries), backoff, exc)
+            retry = entries
+            time.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+            continue
+        retry = []
+        backoff = 0.5
+        logger.info(
+            "Ingested batch entries=%d total_inserted=%d duplicates=%d rejected=%d",
+            len(entries),
+            stats.inserted,
+            stats.duplicates,
+            stats.rejected,
+        )
+    return stats
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse consumer name and batch size."""
+    parser = argparse.ArgumentParser(description="Drain the Redis ingest stream into events.")
+    parser.add_argument("--name", default=f"{socket.gethostname()}-{os.getpid()}", help="Consumer name in the group.")
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_stream_batch_size, help="Entries per COPY.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Entrypoint for the ingest stream consumer; SIGTERM/SIGINT finish the current batch and exit."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    args = parse_args()
+    stop = [False]
+
+    def request_stop(signum: int, frame: FrameType | None) -> None:
+        _ = frame
+        logger.info("Received signal %d, stopping after the current batch", signum)
+        stop[0] = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    stats = drain(args.name, args.batch_size, stop)
+    logger.info(
+        "Consumer %s stopped: batches=%d inserted=%d duplicates=%d rejected=%d dead_lettered=%d",
+        args.name,
+        stats.batches,
+        stats.inserted,
+        stats.duplicates,
+        stats.rejected,
+        stats.dead_lettered,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,76 @@
 
 from datetime import datetime
 
-from backend.app.analytics.engine import AnalyticsEngine
+from celery import chain
+from celery.result import AsyncResult
+from sqlalchemy.exc import OperationalError
+
+from backend.app.analytics.pipeline import STAGES, create_run, get_run, newly_flagged_cells, run_stage
+from backend.app.core.pipeline_events import publish_pipeline_result
 from backend.app.db.session import SessionLocal
+from backend.app.services.storage_maintenance import run_storage_maintenance
 from backend.app.worker.celery_app import celery_app
 
-analytics_engine = AnalyticsEngine()
+
+def dispatch_run(run_id: int) -> AsyncResult:
+    """Queue the stage chain for a run; stages it already committed are skipped."""
+    stages = [run_pipeline_stage.si(run_id, stage) for stage in STAGES]
+    return chain(*stages, publish_pipeline_run.si(run_id)).apply_async()
 
 
 @celery_app.task(name="backend.app.worker.tasks.run_analytics_pipeline")
-def run_analytics_pipeline(start_datetime: str, end_datetime: str, resolution: int = 8) -> str:
-    """Execute full analytics pipeline. Retries on transient DB errors."""
+def run_analytics_pipeline(start_datetime: str, end_datetime: str, resolution: int = 8) -> int:
+    """Record a pipeline run for the window and queue its stage chain; returns the run id."""
+    start_dt = datetime.fromisoformat(start_datetime)
+    end_dt = datetime.fromisoformat(end_datetime)
+    db = SessionLocal()
+    try:
+        run_id = create_run(db, start_dt, end_dt, resolution)
+    finally:
+        db.close()
+    dispatch_run(run_id)
+    return run_id
+
+
+@celery_app.task(
+    name="backend.app.worker.tasks.run_pipeline_stage",
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def run_pipeline_stage(run_id: int, stage: str) -> str:
+    """Run one checkpointed stage. Retries on transient DB errors; a committed stage is never rerun."""
     db = SessionLocal()
     try:
-        analytics_engine.run_pipeline(
-            db=db,
-            start_dt=datetime.fromisoformat(start_datetime),
-            end_dt=datetime.fromisoformat(end_datetime),
-            resolution=resolution,
+        result = run_stage(db, run_id, stage)
+        return "skipped" if result.skipped else "completed"
+    finally:
+        db.close()
+
+
+@celery_app.task(name="backend.app.worker.tasks.publish_pipeline_run")
+def publish_pipeline_run(run_id: int) -> int:
+    """Announce a completed run with the cells its anomaly stage newly flagged; returns the data version."""
+    db = SessionLocal()
+    try:
+        run = get_run(db, run_id)
+        return publish_pipeline_result(
+            run.start_datetime.date(), run.end_datetime.date(), newly_flagged_cells(run)
         )
-        return "completed"
     finally:
         db.close()
 
+
+@celery_app.task(name="backend.app.worker.tasks.run_storage_maintenance_task")
+def run_storage_maintenance_task() -> dict[str, object]:
+    """Compress, downsample and expire old chunks; scheduled daily by Celery beat."""
+    db = SessionLocal()
+    try:
+        report = run_storage_maintenance(db)
+        return {
+            "compressed_chunks": report.compressed_chunks,
+            "dropped_chunks": report.dropped_chunks,
+            "rolled_up_cell_days": report.rolled_up_cell_days,
+        }
+    finally:
+        db.close()
@@ -0,0 +1,65 @@
+"""Daily anomaly scoring cost: online baselines vs recomputing a window.
+
+Folds ``--history`` days of Poisson counts into decayed Welford baselines for
+``--series`` series, then times the daily step the anomaly stage makes, one
+``score_days`` call for the new day, against a vectorized mean/std over each
+series' whole window (the work the window recompute did per run):
+
+    python -m backend.benchmarks.anomaly_throughput --series 300000 --history 90
+
+No database is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.app.analytics.baselines import RunningStats, decay_factor, fold, score_days
+
+FIRST_DAY = 20_454  # 2026-01-01 as days since the epoch
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse series count and history options."""
+    parser = argparse.ArgumentParser(description="Benchmark online anomaly baselines against window recomputes.")
+    parser.add_argument("--series", type=int, default=300_000, help="(cell, event type) series.")
+    parser.add_argument("--history", type=int, default=90, help="Days already folded into the baselines.")
+    parser.add_argument("--half-life", type=float, default=28.0, help="Baseline half-life in days.")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Entrypoint for the anomaly throughput benchmark."""
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    history = rng.poisson(3.0, size=(args.series, args.history)).astype(np.float64)
+    series = np.arange(args.series, dtype=np.int64)
+    decay = decay_factor(args.half_life)
+
+    stats = RunningStats.empty(args.series)
+    for day in range(args.history):
+        fold(stats, series, history[:, day], decay)
+    stats.through[:] = FIRST_DAY + args.history - 1
+
+    today = rng.poisson(3.0, size=args.series).astype(np.float64)
+    started = time.perf_counter()
+    score_days(stats, series, np.full(args.series, FIRST_DAY + args.history, dtype=np.int64), today, decay, 7)
+    online = time.perf_counter() - started
+
+    started = time.perf_counter()
+    window = np.concatenate([history, today[:, None]], axis=1)
+    window.mean(axis=1)
+    window.std(axis=1)
+    recompute = time.perf_counter() - started
+    print(
+        f"series={args.series} history={args.history} "
+        f"online_day_s={online:.3f} window_recompute_s={recompute:.3f} speedup={recompute / online:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
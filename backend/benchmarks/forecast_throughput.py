@@ -0,0 +1,64 @@
+"""Forecast stage throughput on a synthetic cells x days history.
+
+Generates Poisson daily counts with a per-cell level, trend and weekly cycle and
+times ``forecast_cells`` over the whole matrix, the same call the pipeline's
+forecast stage makes after its binary COPY read:
+
+    python -m backend.benchmarks.forecast_throughput --cells 300000 --days 56
+
+No database is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+
+from backend.app.analytics.forecast import forecast_cells
+
+FIRST_DAY = date(2026, 1, 5)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse matrix size and smoothing options."""
+    parser = argparse.ArgumentParser(description="Benchmark vectorized per-cell risk forecasting.")
+    parser.add_argument("--cells", type=int, default=300_000, help="Cells (matrix rows).")
+    parser.add_argument("--days", type=int, default=56, help="History days (matrix columns).")
+    parser.add_argument("--horizon", type=int, default=3, help="Days to project.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timings to take; the best is reported.")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def synthetic_history(cells: int, days: int, seed: int) -> np.ndarray:
+    """Poisson counts around a per-cell level, linear trend and Saturday peak."""
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(days)
+    level = rng.gamma(2.0, 2.0, size=(cells, 1))
+    trend = rng.normal(0.0, 0.05, size=(cells, 1))
+    weekly = 1.0 + 0.5 * ((offsets + FIRST_DAY.weekday()) % 7 == 5)
+    rate = np.clip(level + trend * offsets[None, :], 0.1, None) * weekly[None, :]
+    return rng.poisson(rate).astype(np.float64)
+
+
+def main() -> None:
+    """Entrypoint for the forecast throughput benchmark."""
+    args = parse_args()
+    matrix = synthetic_history(args.cells, args.days, args.seed)
+    timings = []
+    for _ in range(args.repeats):
+        started = time.perf_counter()
+        forecast_cells(matrix, FIRST_DAY, args.horizon, alpha=0.5, beta=0.1)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(
+        f"cells={args.cells} days={args.days} horizon={args.horizon} "
+        f"best_s={best:.3f} cells_per_s={args.cells / best:,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""H3 key representation benchmark: hex VARCHAR vs 64-bit BIGINT.
+
+Builds two temporary copies of a cell-day table at a realistic size (all
+resolution-8 cells around a centre, one row per cell per day), one keyed by
+hex strings and one by integers, and reports primary-key index size, the time
+of the mv_daily_risk-style join between two such tables and the memory the
+engine's per-cell grouping dict needs for each key type:
+
+    python -m backend.benchmarks.h3_key_types --ring 60 --days 90
+
+Defaults give ~11k cells x 90 days (~1M rows per table). Nothing outside
+session-local temporary tables is touched.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date, timedelta
+
+import h3
+from h3.api import basic_int as h3_int
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.db.session import SessionLocal
+
+KEY_TYPES = {"varchar": "VARCHAR(32)", "bigint": "BIGINT"}
+START_DATE = date(2026, 1, 1)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse table size options."""
+    parser = argparse.ArgumentParser(description="Benchmark H3 keys stored as VARCHAR vs BIGINT.")
+    parser.add_argument("--ring", type=int, default=60, help="grid_disk radius around the centre cell.")
+    parser.add_argument("--days", type=int, default=90, help="Days per cell.")
+    parser.add_argument("--repeats", type=int, default=3, help="Join timings to take; the best is reported.")
+    return parser.parse_args()
+
+
+def build_tables(db: Session, label: str, column_type: str, keys: list[int] | list[str], days: int) -> None:
+    """Create counts/scores temp tables keyed by ``column_type`` and load one row per cell-day."""
+    for table in (f"bench_counts_{label}", f"bench_scores_{label}"):
+        db.execute(
+            text(
+                f"""
+                CREATE TEMP TABLE {table} (
+                    h3_index {column_type} NOT NULL,
+                    time_bucket DATE NOT NULL,
+                    value DOUBLE PRECISION NOT NULL,
+                    PRIMARY KEY (h3_index, time_bucket)
+                )
+                """
+            )
+        )
+        element_type = column_type.split("(")[0]
+        db.execute(
+            text(
+                f"""
+                INSERT INTO {table} (h3_index, time_bucket, value)
+                SELECT cell, CAST(:start_date AS DATE) + day, random() * 100
+                FROM unnest(CAST(:cells AS {element_type}[])) AS cell
+                CROSS JOIN generate_series(0, :days - 1) AS day
+                """
+            ),
+            {"cells": keys, "start_date": START_DATE, "days": days},
+        )
+        db.execute(text(f"ANALYZE {table}"))
+
+
+def index_bytes(db: Session, label: str) -> int:
+    """Size of the counts table's primary-key index."""
+    return db.execute(
+        text("SELECT pg_relation_size(CAST(:index AS regclass))"), {"index": f"bench_counts_{label}_pkey"}
+    ).scalar_one()
+
+
+def join_seconds(db: Session, label: str, days: int, repeats: int) -> float:
+    """Best wall time of the cell-day join over the last week."""
+    statement = text(
+        f"""
+        SELECT COUNT(*), SUM(c.value * s.value)
+        FROM bench_counts_{label} c
+        JOIN bench_scores_{label} s
+          ON s.h3_index = c.h3_index
+         AND s.time_bucket = c.time_bucket
+        WHERE c.time_bucket >= :since
+        """
+    )
+    since = START_DATE + timedelta(days=max(days - 7, 0))
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        db.execute(statement, {"since": since}).one()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def grouping_bytes(cells: list[int], days: int, as_hex: bool) -> int:
+    """Peak memory of the engine's (cell, day) -> count grouping with hex or integer keys.
+
+    Every entry gets its own key object, as when keys come from ``latlng_to_cell`` per event.
+    """
+    hex_cells = [h3.int_to_str(cell) for cell in cells]
+    day_buckets = [START_DATE + timedelta(days=offset) for offset in range(days)]
+    tracemalloc.start()
+    grouped: dict[tuple[int | str, date], int] = defaultdict(int)
+    for hex_cell in hex_cells:
+        for bucket in day_buckets:
+            cell = h3.str_to_int(hex_cell)
+            key = h3.int_to_str(cell) if as_hex else cell
+            grouped[(key, bucket)] += 1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Entrypoint for the key type benchmark."""
+    args = parse_args()
+    cells = sorted(h3_int.grid_disk(h3_int.latlng_to_cell(38.5, -97.0, 8), args.ring))
+    print(f"cells={len(cells)} days={args.days} rows_per_table={len(cells) * args.days:,}")
+    with SessionLocal() as db:
+        for label, column_type in KEY_TYPES.items():
+            # Keys as both the database and the engine hold them: hex strings before, ints now.
+            keys: list[int] | list[str] = [h3.int_to_str(cell) for cell in cells] if label == "varchar" else cells
+            build_tables(db, label, column_type, keys, args.days)
+            print(
+                f"key={label} index_mb={index_bytes(db, label) / 1e6:.1f} "
+                f"join_ms={join_seconds(db, label, args.days, args.repeats) * 1000:.1f} "
+                f"grouping_mb={grouping_bytes(cells, min(args.days, 7), as_hex=label == 'varchar') / 1e6:.1f}"
+            )
+        db.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Event ingestion throughput benchmark: row-wise INSERT vs batched COPY.
+
+Generates synthetic events, loads them through the previous ``executemany``
+INSERT path and through ``ingest_events`` (COPY) at several batch sizes, and
+reports rows/sec. Benchmark rows are tagged with their own event type and
+deleted afterwards:
+
+    python -m backend.benchmarks.ingestion_throughput --rows 200000 --batch-sizes 1000 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.db.session import SessionLocal
+from backend.app.schemas.event import EventUploadItem
+from backend.app.services.ingestion import ingest_events
+
+BENCHMARK_EVENT_TYPE = "benchmark_ingest"
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse row count and batch size options."""
+    parser = argparse.ArgumentParser(description="Benchmark event ingestion throughput.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic events per run.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000], help="COPY batch sizes.")
+    return parser.parse_args()
+
+
+def synthetic_events(count: int) -> list[EventUploadItem]:
+    """Random points over the continental US spread across 90 days."""
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    return [
+        EventUploadItem(
+            event_type=BENCHMARK_EVENT_TYPE,
+            event_timestamp=start + timedelta(seconds=random.randrange(90 * 86_400)),
+            longitude=random.uniform(-124.0, -67.0),
+            latitude=random.uniform(25.0, 49.0),
+            attributes_json={"severity": random.randint(1, 5)},
+        )
+        for _ in range(count)
+    ]
+
+
+def insert_executemany(db: Session, events: list[EventUploadItem]) -> int:
+    """Previous ingestion path: one executemany INSERT in a single transaction."""
+    db.execute(
+        text(
+            """
+            INSERT INTO events (event_type, event_timestamp, geom, attributes_json, created_at)
+            VALUES (
+                :event_type,
+                :event_timestamp,
+                ST_SetSRID(ST_MakePoint(:longitude, :latitude), 4326)::geometry,
+                CAST(:attributes_json AS jsonb),
+                NOW()
+            )
+            """
+        ),
+        [
+            {
+                "event_type": item.event_type,
+                "event_timestamp": item.event_timestamp,
+                "longitude": item.longitude,
+                "latitude": item.latitude,
+                "attributes_json": json.dumps(item.attributes_json),
+            }
+            for item in events
+        ],
+    )
+    db.commit()
+    return len(events)
+
+
+def cleanup(db: Session) -> None:
+    """Remove benchmark rows."""
+    db.execute(text("DELETE FROM events WHERE event_type = :event_type"), {"event_type": BENCHMARK_EVENT_TYPE})
+    db.commit()
+
+
+def main() -> None:
+    """Entrypoint for the ingestion benchmark."""
+    args = parse_args()
+    events = synthetic_events(args.rows)
+    runs = [("insert-executemany", lambda db: insert_executemany(db, events))]
+    runs += [(f"copy batch={size}", lambda db, size=size: ingest_events(db, events, batch_size=size)) for size in args.batch_sizes]
+
+    with SessionLocal() as db:
+        cleanup(db)
+        for label, load in runs:
+            started = time.perf_counter()
+            inserted = load(db)
+            elapsed = time.perf_counter() - started
+            print(f"path={label} rows={inserted} seconds={elapsed:.2f} rows_per_sec={inserted / elapsed:,.0f}")
+            cleanup(db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""Query-plan regression checks and trend report for the hot SQL paths.
+
+Each registered query is the statement the application actually runs, built
+through the same builders and constants. It is run under
+``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` against a deterministic reference
+dataset, and its plan is checked for the expected indexes, no sequential scans
+on large relations, Timescale chunk exclusion and a shared-buffer budget.
+``backend/tests/test_query_plans.py`` asserts these checks; this CLI appends
+one JSON line per query to a trend report and prints deltas against the
+previous run:
+
+    python -m backend.benchmarks.query_plans --load-reference --report query_plan_trend.jsonl
+
+``--load-reference`` truncates the event and derived tables, so only use it
+against a scratch database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import orjson
+from h3.api import basic_int as h3_int
+from shapely.geometry import Polygon
+from sqlalchemy import TextClause, text
+from sqlalchemy.orm import Session
+
+from backend.app.analytics.engine import CELL_COUNTS_IN_WINDOW_SQL, EVENTS_IN_WINDOW_SQL, AnalyticsEngine
+from backend.app.api.v1.endpoints.area import AREA_CELLS_SQL
+from backend.app.api.v1.endpoints.events import build_event_query
+from backend.app.api.v1.endpoints.hotspots import build_hotspot_query
+from backend.app.api.v1.endpoints.risk import CELL_HISTORY_SQL, build_forecast_query, build_risk_query
+from backend.app.db.session import SessionLocal
+from backend.app.models.event import ALL_EVENT_TYPES
+from backend.app.services.tiles import RISK_SERIES_TILE_SQL, RISK_TILE_SQL
+
+REFERENCE_START = date(2025, 9, 1)
+REFERENCE_DAYS = 120
+REFERENCE_EVENTS = 100_000
+REFERENCE_CENTER = (38.5, -97.0)
+REFERENCE_RING = 18
+PROBE_DAY = REFERENCE_START + timedelta(days=75)
+PROBE_CELL = h3_int.latlng_to_cell(*REFERENCE_CENTER, 8)
+# The reference set carries the all-types rollup plus one per-type series.
+PROBE_EVENT_TYPE = "fire_incident"
+SCAN_NODE_TYPES = {"Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan", "Custom Scan"}
+
+
+def tile_for(latitude: float, longitude: float, zoom: int) -> tuple[int, int, int]:
+    """Web Mercator z/x/y of the tile containing a point."""
+    n = 1 << zoom
+    x = int((longitude + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(latitude))) / math.pi) / 2.0 * n)
+    return zoom, x, y
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A hot statement with the plan properties it must keep.
+
+    ``indexes``: at least one of these index names (matched as a suffix, so chunk
+    copies count) must be used. ``no_seq_scan``: relations, or hypertables whose
+    chunks, must not be sequentially scanned. ``max_chunks``: per hypertable, the
+    most chunks that may actually be executed. ``max_shared_blocks``: budget for
+    shared hits plus reads on a warm cache.
+    """
+
+    name: str
+    build: Callable[[], tuple[TextClause, dict[str, Any]]]
+    indexes: tuple[str, ...] = ()
+    no_seq_scan: tuple[str, ...] = ()
+    max_chunks: dict[str, int] = field(default_factory=dict)
+    max_shared_blocks: int = 1_000
+
+
+@dataclass
+class PlanSummary:
+    """The parts of an EXPLAIN ANALYZE plan that the checks and the trend report use."""
+
+    query: str
+    execution_ms: float
+    planning_ms: float
+    shared_blocks: int
+    indexes: list[str]
+    seq_scans: list[str]
+    chunks: dict[str, int]
+    violations: list[str] = field(default_factory=list)
+
+
+def _week_before(day: date) -> date:
+    return day - timedelta(days=6)
+
+
+HOT_QUERIES: tuple[HotQuery, ...] = (
+    HotQuery(
+        name="events_page_recent_week",
+        build=lambda: build_event_query(
+            None,
+            datetime.combine(_week_before(PROBE_DAY), datetime.min.time(), UTC),
+            datetime.combine(PROBE_DAY, datetime.max.time(), UTC),
+            None,
+            None,
+            None,
+            500,
+        ),
+        indexes=("idx_events_timestamp",),
+        no_seq_scan=("events",),
+        max_chunks={"events": 2},
+        max_shared_blocks=1_500,
+    ),
+    HotQuery(
+        name="events_bbox_day",
+        build=lambda: build_event_query(
+            None,
+            datetime.combine(PROBE_DAY, datetime.min.time(), UTC),
+            datetime.combine(PROBE_DAY, datetime.max.time(), UTC),
+            "-97.05,38.45,-96.95,38.55",
+            None,
+            None,
+            500,
+        ),
+        no_seq_scan=("events",),
+        max_chunks={"events": 1},
+        max_shared_blocks=3_000,
+    ),
+    HotQuery(
+        name="risk_top_n",
+        build=lambda: build_risk_query(PROBE_DAY, None, None, None, None, None, 100),
+        indexes=("idx_mv_daily_risk_type_time_score",),
+        no_seq_scan=("mv_daily_risk",),
+        max_shared_blocks=300,
+    ),
+    HotQuery(
+        name="risk_top_n_event_type",
+        build=lambda: build_risk_query(PROBE_DAY, None, None, None, None, None, 100, PROBE_EVENT_TYPE),
+        indexes=("idx_mv_daily_risk_type_time_score",),
+        no_seq_scan=("mv_daily_risk",),
+        max_shared_blocks=300,
+    ),
+    HotQuery(
+        name="forecast_top_n",
+        build=lambda: build_forecast_query(REFERENCE_START + timedelta(days=REFERENCE_DAYS), None, None, None, 100),
+        indexes=("idx_risk_forecasts_target_score",),
+        no_seq_scan=("risk_forecasts",),
+        max_shared_blocks=300,
+    ),
+    HotQuery(
+        name="risk_cell_history",
+        build=lambda: (
+            CELL_HISTORY_SQL,
+            {"h3_index": PROBE_CELL, "event_type": ALL_EVENT_TYPES, "start_date": REFERENCE_START, "end_date": PROBE_DAY},
+        ),
+        indexes=("uq_mv_daily_risk_h3_type_time",),
+        no_seq_scan=("mv_daily_risk",),
+        max_shared_blocks=300,
+    ),
+    HotQuery(
+        name="risk_area_cells",
+        build=lambda: (
+            AREA_CELLS_SQL,
+            {
+                "cells": sorted(h3_int.grid_disk(PROBE_CELL, 3)),
+                "event_type": ALL_EVENT_TYPES,
+                "start_date": _week_before(PROBE_DAY),
+                "end_date": PROBE_DAY,
+            },
+        ),
+        indexes=("uq_mv_daily_risk_h3_type_time",),
+        no_seq_scan=("mv_daily_risk",),
+        max_shared_blocks=1_500,
+    ),
+    HotQuery(
+        name="hotspots_top_k",
+        build=lambda: build_hotspot_query(_week_before(PROBE_DAY), PROBE_DAY, 100, None, None, 1000),
+        indexes=("uq_hotspots_type_time_rank",),
+        no_seq_scan=("hotspots",),
+        max_shared_blocks=800,
+    ),
+    HotQuery(
+        name="risk_tile",
+        build=lambda: (
+            RISK_TILE_SQL,
+            dict(zip("zxy", tile_for(*REFERENCE_CENTER, 8), strict=True))
+            | {"risk_date": PROBE_DAY, "risk_levels": None, "event_type": ALL_EVENT_TYPES},
+        ),
+        indexes=("idx_mv_daily_risk_type_time", "idx_mv_daily_risk_type_time_score"),
+        no_seq_scan=("mv_daily_risk",),
+        max_shared_blocks=3_000,
+    ),
+    HotQuery(
+        name="risk_series_tile_two_weeks",
+        build=lambda: (
+            RISK_SERIES_TILE_SQL,
+            dict(zip("zxy", tile_for(*REFERENCE_CENTER, 8), strict=True))
+            | {
+                "start_date": PROBE_DAY - timedelta(days=13),
+                "end_date": PROBE_DAY,
+                "risk_levels": None,
+                "event_type": ALL_EVENT_TYPES,
+            },
+        ),
+        indexes=("idx_mv_daily_risk_type_time", "idx_mv_daily_risk_type_time_score"),
+        no_seq_scan=("mv_daily_risk",),
+        max_shared_blocks=15_000,
+    ),
+    HotQuery(
+        name="engine_events_one_day",
+        build=lambda: (
+            EVENTS_IN_WINDOW_SQL,
+            {
+                "start_dt": datetime.combine(PROBE_DAY, datetime.min.time(), UTC),
+                "end_dt": datetime.combine(PROBE_DAY + timedelta(days=1), datetime.min.time(), UTC),
+            },
+        ),
+        no_seq_scan=("events",),
+        max_chunks={"events": 1},
+        max_shared_blocks=3_000,
+    ),
+    HotQuery(
+        name="engine_cell_counts_week",
+        build=lambda: (CELL_COUNTS_IN_WINDOW_SQL, {"start_date": _week_before(PROBE_DAY), "end_date": PROBE_DAY}),
+        no_seq_scan=(),
+        max_chunks={"cell_aggregates": 2},
+        # Every event type's rows plus the rollup; the reference set has two series per cell-day.
+        max_shared_blocks=12_000,
+    ),
+)
+
+
+def load_reference_dataset(db: Session) -> None:
+    """Replace event and derived rows with a deterministic reference dataset and analyze it."""
+    db.execute(
+        text(
+            """
+            TRUNCATE TABLE hotspots, gi_star_scores, cell_weekly_rollups, risk_forecasts, anomaly_baselines, anomaly_flags, risk_scores, cell_aggregates, h3_cells, events
+            RESTART IDENTITY CASCADE
+            """
+        )
+    )
+    cells = sorted(h3_int.grid_disk(PROBE_CELL, REFERENCE_RING))
+    db.execute(
+        text(
+            """
+            INSERT INTO h3_cells (h3_index, resolution, geom)
+            VALUES (:h3_index, 8, ST_GeomFromText(:wkt, 4326))
+            """
+        ),
+        [
+            {"h3_index": cell, "wkt": Polygon([(lng, lat) for lat, lng in h3_int.cell_to_boundary(cell)]).wkt}
+            for cell in cells
+        ],
+    )
+    end_date = REFERENCE_START + timedelta(days=REFERENCE_DAYS - 1)
+    params = {"start_date": REFERENCE_START, "end_date": end_date, "days": REFERENCE_DAYS, "events": REFERENCE_EVENTS}
+    db.execute(text("SELECT setseed(0.42)"))
+    db.execute(
+        text(
+            """
+            INSERT INTO events (event_type, event_timestamp, geom)
+            SELECT
+                (ARRAY['fire_incident', 'power_outage', 'traffic_collision'])[1 + floor(random() * 3)::int],
+                CAST(:start_date AS TIMESTAMPTZ) + random() * make_interval(days => :days),
+                ST_SetSRID(ST_MakePoint(-97.0 + (random() - 0.5) * 0.6, 38.5 + (random() - 0.5) * 0.5), 4326)
+            FROM generate_series(1, :events)
+            """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO cell_aggregates (h3_index, time_bucket, event_count, rolling_7d_avg, growth_rate)
+            SELECT h3_index, day::date, 1 + floor(random() * 20)::int, random() * 10, random() * 2 - 0.5
+            FROM h3_cells
+            CROSS JOIN generate_series(CAST(:start_date AS DATE), CAST(:end_date AS DATE), INTERVAL '1 day') AS day
+            """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO cell_aggregates (h3_index, event_type, time_bucket, event_count, rolling_7d_avg, growth_rate)
+            SELECT h3_index, :event_type, time_bucket, GREATEST(event_count / 3, 1), rolling_7d_avg / 3, growth_rate
+            FROM cell_aggregates
+            """
+        ),
+        {"event_type": PROBE_EVENT_TYPE},
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO risk_scores (h3_index, event_type, time_bucket, risk_score, risk_level)
+            SELECT
+                h3_index,
+                event_type,
+                time_bucket,
+                event_count * 5.0,
+                CASE
+                    WHEN event_count * 5 <= 25 THEN 'low'
+                    WHEN event_count * 5 <= 50 THEN 'medium'
+                    WHEN event_count * 5 <= 75 THEN 'high'
+                    ELSE 'critical'
+                END::risk_level
+            FROM cell_aggregates
+            """
+        )
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO anomaly_flags (h3_index, event_type, time_bucket, anomaly_score, flagged)
+            SELECT h3_index, event_type, time_bucket, random() * 3, random() > 0.97
+            FROM cell_aggregates
+            """
+        )
+    )
+    db.commit()
+    engine = AnalyticsEngine()
+    engine.compute_gi_star(db, REFERENCE_START, end_date)
+    engine.materialize_hotspots(db, REFERENCE_START, end_date)
+    engine.refresh_materialized_views(db)
+    engine.forecast_risk(db, end_date)
+    db.commit()
+    db.execute(text("ANALYZE events, h3_cells, cell_aggregates, risk_scores, anomaly_flags, gi_star_scores, hotspots, mv_daily_risk, risk_forecasts"))
+    db.commit()
+
+
+def _walk(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def chunk_owners(db: Session) -> dict[str, str]:
+    """Map chunk table names to their hypertable."""
+    rows = db.execute(text("SELECT chunk_name, hypertable_name FROM timescaledb_information.chunks")).all()
+    return {row.chunk_name: row.hypertable_name for row in rows}
+
+
+def explain(db: Session, hot_query: HotQuery, owners: dict[str, str]) -> PlanSummary:
+    """Run the query once to warm the cache, then EXPLAIN ANALYZE it and summarize the plan."""
+    statement, params = hot_query.build()
+    db.execute(statement, params).all()
+    document = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement.text}"), params).scalar_one()
+    db.rollback()
+    root = document[0]
+
+    indexes: list[str] = []
+    seq_scans: list[str] = []
+    chunks: dict[str, int] = {}
+    for node in _walk(root["Plan"]):
+        if "Index Name" in node:
+            indexes.append(node["Index Name"])
+        relation = node.get("Relation Name")
+        if relation is None or node.get("Actual Loops", 1) == 0:
+            continue
+        owner = owners.get(relation, relation)
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.append(owner)
+        if relation in owners and node["Node Type"] in SCAN_NODE_TYPES:
+            chunks[owner] = chunks.get(owner, 0) + 1
+
+    plan = root["Plan"]
+    return PlanSummary(
+        query=hot_query.name,
+        execution_ms=root["Execution Time"],
+        planning_ms=root["Planning Time"],
+        shared_blocks=plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+        indexes=sorted(set(indexes)),
+        seq_scans=sorted(set(seq_scans)),
+        chunks=chunks,
+    )
+
+
+def check_plan(hot_query: HotQuery, summary: PlanSummary) -> list[str]:
+    """Return the plan properties this query no longer has."""
+    violations = []
+    if hot_query.indexes and not any(
+        index.endswith(expected) for index in summary.indexes for expected in hot_query.indexes
+    ):
+        violations.append(f"uses none of {list(hot_query.indexes)} (indexes: {summary.indexes})")
+    for relation in hot_query.no_seq_scan:
+        if relation in summary.seq_scans:
+            violations.append(f"sequential scan on {relation}")
+    for hypertable, limit in hot_query.max_chunks.items():
+        if summary.chunks.get(hypertable, 0) > limit:
+            violations.append(f"scans {summary.chunks[hypertable]} {hypertable} chunks (max {limit})")
+    if summary.shared_blocks > hot_query.max_shared_blocks:
+        violations.append(f"touches {summary.shared_blocks} shared blocks (budget {hot_query.max_shared_blocks})")
+    return violations
+
+
+def run_checks(db: Session) -> list[PlanSummary]:
+    """Explain and check every registered hot query."""
+    owners = chunk_owners(db)
+    summaries = []
+    for hot_query in HOT_QUERIES:
+        summary = explain(db, hot_query, owners)
+        summary.violations = check_plan(hot_query, summary)
+        summaries.append(summary)
+    return summaries
+
+
+def previous_run(report: Path) -> dict[str, dict[str, Any]]:
+    """Latest recorded entry per query from an existing trend report."""
+    latest: dict[str, dict[str, Any]] = {}
+    if report.exists():
+        for line in report.read_bytes().splitlines():
+            if line.strip():
+                entry = orjson.loads(line)
+                latest[entry["query"]] = entry
+    return latest
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse dataset and report options."""
+    parser = argparse.ArgumentParser(description="Check hot query plans and record a trend report.")
+    parser.add_argument("--load-reference", action="store_true", help="Truncate and load the reference dataset first.")
+    parser.add_argument("--report", type=Path, default=Path("query_plan_trend.jsonl"), help="JSON lines trend file.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Entrypoint for the query plan report; exits 1 when any plan check fails."""
+    args = parse_args()
+    with SessionLocal() as db:
+        if args.load_reference:
+            load_reference_dataset(db)
+        summaries = run_checks(db)
+
+    previous = previous_run(args.report)
+    run_at = datetime.now(UTC).isoformat()
+    revision = os.environ.get("GITHUB_SHA", "")[:12] or "local"
+    with args.report.open("ab") as handle:
+        for summary in summaries:
+            entry = {"run_at": run_at, "revision": revision, **summary.__dict__}
+            handle.write(orjson.dumps(entry) + b"\n")
+            before = previous.get(summary.query)
+            delta = f" (was {before['execution_ms']:.2f}ms, {before['shared_blocks']} blocks)" if before else ""
+            status = "FAIL " + "; ".join(summary.violations) if summary.violations else "ok"
+            print(
+                f"query={summary.query} ms={summary.execution_ms:.2f} blocks={summary.shared_blocks}"
+                f"{delta} status={status}"
+            )
+    if any(summary.violations for summary in summaries):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Concurrent load benchmark for the read endpoints.
+
+Drives a running API with a fixed number of concurrent clients and reports
+throughput and latency percentiles, so sync and async builds of the read path
+can be compared per API process at the same concurrency:
+
+    uvicorn backend.app.main:app --workers 1 &
+    python -m backend.benchmarks.read_path_concurrency --base-url http://localhost:8000/v1 \\
+        --risk-date 2026-02-20 --concurrency 64 --duration 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse target, workload and concurrency options."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent read throughput.")
+    parser.add_argument("--base-url", default="http://localhost:8000/v1", help="API base URL.")
+    parser.add_argument("--risk-date", required=True, help="Date with scored cells (YYYY-MM-DD).")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent in-flight requests.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run.")
+    parser.add_argument("--zoom", type=int, default=8, help="Tile zoom for the tile workload.")
+    return parser.parse_args()
+
+
+def build_paths(risk_date: str, zoom: int) -> list[str]:
+    """Mixed workload: mostly tiles (cache misses spread over x/y), plus risk, hotspots and events."""
+    size = 1 << zoom
+    tiles = [f"/tiles/{zoom}/{random.randrange(size)}/{random.randrange(size)}.mvt?risk_date={risk_date}" for _ in range(200)]
+    return tiles + [
+        f"/risk/{risk_date}",
+        f"/hotspots?start_date={risk_date}&end_date={risk_date}",
+        "/events?limit=100",
+    ]
+
+
+async def worker(client: httpx.AsyncClient, paths: list[str], deadline: float, latencies: list[float], errors: list[int]) -> None:
+    """Issue requests back-to-back until the deadline."""
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(random.choice(paths))
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the load and print a one-line summary."""
+    paths = build_paths(args.risk_date, args.zoom)
+    latencies: list[float] = []
+    errors: list[int] = []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60.0) as client:
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(worker(client, paths, deadline, latencies, errors) for _ in range(args.concurrency)))
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"requests={len(latencies)} errors={len(errors)} rps={len(latencies) / args.duration:.1f} "
+        f"p50={quantiles[49] * 1000:.1f}ms p99={quantiles[98] * 1000:.1f}ms concurrency={args.concurrency}"
+    )
+
+
+def main() -> None:
+    """Entrypoint for the read-path benchmark."""
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
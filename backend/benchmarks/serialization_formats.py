@@ -0,0 +1,76 @@
+"""Response format benchmark for the bulk read endpoints.
+
+Requests the same payload in each negotiated format and reports median
+response time (first byte to last) and body size, so the encoding cost of
+JSON, NDJSON, MessagePack and Arrow IPC can be compared on identical rows:
+
+    python -m backend.benchmarks.serialization_formats --base-url http://localhost:8000/v1 \\
+        --risk-date 2026-02-20 --repeats 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import httpx
+
+FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "msgpack": "application/msgpack",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse target and repetition options."""
+    parser = argparse.ArgumentParser(description="Compare response time and size across formats.")
+    parser.add_argument("--base-url", default="http://localhost:8000/v1", help="API base URL.")
+    parser.add_argument("--risk-date", required=True, help="Date with scored cells (YYYY-MM-DD).")
+    parser.add_argument("--repeats", type=int, default=10, help="Requests per endpoint and format.")
+    return parser.parse_args()
+
+
+def build_paths(risk_date: str) -> dict[str, str]:
+    """Full-day risk stream, a large hotspot page and a large event page."""
+    return {
+        "risk": f"/risk/{risk_date}",
+        "hotspots": f"/hotspots?start_date={risk_date}&end_date={risk_date}&limit=5000",
+        "events": "/events?limit=5000",
+    }
+
+
+def measure(client: httpx.Client, path: str, media_type: str, repeats: int) -> tuple[float, int] | None:
+    """Return median seconds and body bytes, or None when the server cannot produce the format."""
+    timings: list[float] = []
+    size = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = client.get(path, headers={"Accept": media_type})
+        body = response.content
+        timings.append(time.perf_counter() - started)
+        if response.status_code == 406:
+            return None
+        response.raise_for_status()
+        size = len(body)
+    return statistics.median(timings), size
+
+
+def main() -> None:
+    """Entrypoint for the serialization benchmark."""
+    args = parse_args()
+    with httpx.Client(base_url=args.base_url, timeout=120.0) as client:
+        for endpoint, path in build_paths(args.risk_date).items():
+            for name, media_type in FORMATS.items():
+                measured = measure(client, path, media_type, args.repeats)
+                if measured is None:
+                    print(f"endpoint={endpoint} format={name} unavailable")
+                    continue
+                seconds, size = measured
+                print(f"endpoint={endpoint} format={name} median={seconds * 1000:.1f}ms bytes={size}")
+
+
+if __name__ == "__main__":
+    main()
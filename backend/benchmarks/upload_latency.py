@@ -0,0 +1,99 @@
+"""Producer latency benchmark: synchronous COPY upload vs write-behind stream upload.
+
+Drives a running API with many concurrent small uploads, the shape of sensor
+and CAD feeds, and reports throughput and producer latency percentiles for
+``/events/upload`` and ``/events/upload/async``. Run an ingest consumer
+alongside so the async backlog drains:
+
+    python -m backend.app.worker.ingest_consumer &
+    python -m backend.benchmarks.upload_latency --base-url http://localhost:8000/v1 \\
+        --token "$TOKEN" --events-per-request 10 --concurrency 64 --duration 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import httpx
+
+BENCHMARK_EVENT_TYPE = "benchmark_upload"
+PATHS = {"sync": "/events/upload", "async": "/events/upload/async"}
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse target, payload and concurrency options."""
+    parser = argparse.ArgumentParser(description="Benchmark upload producer latency.")
+    parser.add_argument("--base-url", default="http://localhost:8000/v1", help="API base URL.")
+    parser.add_argument("--token", required=True, help="Analyst or admin bearer token.")
+    parser.add_argument("--modes", nargs="+", choices=sorted(PATHS), default=["sync", "async"], help="Upload paths to run.")
+    parser.add_argument("--events-per-request", type=int, default=10, help="Events in each upload.")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent in-flight uploads.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per mode.")
+    return parser.parse_args()
+
+
+def synthetic_payload(count: int) -> dict[str, Any]:
+    """Random events over the continental US in the last 90 days."""
+    now = datetime.now(UTC)
+    return {
+        "events": [
+            {
+                "event_type": BENCHMARK_EVENT_TYPE,
+                "event_timestamp": (now - timedelta(seconds=random.randrange(90 * 86_400))).isoformat(),
+                "longitude": random.uniform(-124.0, -67.0),
+                "latitude": random.uniform(25.0, 49.0),
+            }
+            for _ in range(count)
+        ]
+    }
+
+
+async def worker(
+    client: httpx.AsyncClient, path: str, size: int, deadline: float, latencies: list[float], errors: list[int]
+) -> None:
+    """Upload back-to-back until the deadline."""
+    while time.perf_counter() < deadline:
+        payload = synthetic_payload(size)
+        started = time.perf_counter()
+        response = await client.post(path, json=payload)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run each mode in turn and print one summary line per mode."""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"Authorization": f"Bearer {args.token}"}
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, headers=headers, timeout=60.0) as client:
+        for mode in args.modes:
+            latencies: list[float] = []
+            errors: list[int] = []
+            deadline = time.perf_counter() + args.duration
+            await asyncio.gather(
+                *(
+                    worker(client, PATHS[mode], args.events_per_request, deadline, latencies, errors)
+                    for _ in range(args.concurrency)
+                )
+            )
+            quantiles = statistics.quantiles(latencies, n=100)
+            events_per_sec = (len(latencies) - len(errors)) * args.events_per_request / args.duration
+            print(
+                f"mode={mode} requests={len(latencies)} errors={len(errors)} events_per_sec={events_per_sec:,.0f} "
+                f"p50={quantiles[49] * 1000:.1f}ms p99={quantiles[98] * 1000:.1f}ms concurrency={args.concurrency}"
+            )
+
+
+def main() -> None:
+    """Entrypoint for the upload latency benchmark."""
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,17 @@
--- Hotspot feed benchmark for temporal range + risk filter.
+-- Hotspot feed benchmark: per-day top-K from the precomputed hotspots table.
 EXPLAIN (ANALYZE, BUFFERS, VERBOSE)
 SELECT
-    r.h3_index,
-    r.time_bucket,
-    r.risk_score,
-    r.risk_level,
-    c.growth_rate,
-    COALESCE(a.flagged, false) AS anomaly_flagged
-FROM risk_scores r
-JOIN cell_aggregates c
-  ON c.h3_index = r.h3_index
- AND c.time_bucket = r.time_bucket
-LEFT JOIN anomaly_flags a
-  ON a.h3_index = r.h3_index
- AND a.time_bucket = r.time_bucket
-WHERE r.time_bucket BETWEEN DATE '2026-01-01' AND DATE '2026-02-20'
-  AND (r.risk_level IN ('high', 'critical') OR COALESCE(a.flagged, false) = true)
-ORDER BY r.time_bucket DESC, r.risk_score DESC
-LIMIT 2000;
+    h3_index,
+    time_bucket,
+    rank,
+    risk_score,
+    risk_level,
+    growth_rate,
+    anomaly_flagged,
+    reasons
+FROM hotspots
+WHERE event_type = 'all'
+  AND time_bucket BETWEEN DATE '2026-01-01' AND DATE '2026-02-20'
+  AND rank <= 100
+ORDER BY event_type, time_bucket DESC, rank
+LIMIT 1000;
@@ -17,6 +17,7 @@ source AS (
     FROM mv_daily_risk m
     CROSS JOIN bounds b
     WHERE ST_Intersects(ST_Transform(m.geom, 3857), b.geom)
+      AND m.event_type = 'all'
       AND m.time_bucket = DATE '2026-02-20'
       AND m.risk_level::text = ANY(ARRAY['high', 'critical'])
 )
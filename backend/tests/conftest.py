@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import Generator, Iterable, Mapping
+from datetime import date
 
+import h3
 import pytest
 from fastapi.testclient import TestClient
+from shapely.geometry import Polygon
 from sqlalchemy import text
+from sqlalchemy.orm import Session
 
 from backend.app.db.session import SessionLocal
 from backend.app.main import app
@@ -27,7 +31,15 @@ def clean_database() -> Generator[None, None, None]:
             text(
                 """
                 TRUNCATE TABLE
+                    analytics_runs,
+                    hotspots,
+                    cell_weekly_rollups,
+                    ingest_batches,
+                    ingest_checkpoints,
+                    anomaly_baselines,
                     anomaly_flags,
+                    gi_star_scores,
+                    risk_forecasts,
                     risk_scores,
                     cell_aggregates,
                     h3_cells,
@@ -40,3 +52,39 @@ def clean_database() -> Generator[None, None, None]:
         db.commit()
     yield
 
+
+
+def seed_h3_cells(db: Session, cells: Iterable[str]) -> None:
+    """Insert the hexagon geometry of each H3 cell, skipping cells already present."""
+    for cell in cells:
+        polygon = Polygon([(lng, lat) for lat, lng in h3.cell_to_boundary(cell)])
+        db.execute(
+            text(
+                """
+                INSERT INTO h3_cells (h3_index, resolution, geom)
+                VALUES (:h3_index, :resolution, ST_GeomFromText(:wkt, 4326))
+                ON CONFLICT (h3_index) DO NOTHING
+                """
+            ),
+            {"h3_index": h3.str_to_int(cell), "resolution": h3.get_resolution(cell), "wkt": polygon.wkt},
+        )
+
+
+def seed_cell_counts(db: Session, counts: Mapping[tuple[str, date], int]) -> None:
+    """Insert the cells and one all-types cell_aggregates row per (cell, day) with a flat trend."""
+    seed_h3_cells(db, {cell for cell, _ in counts})
+    for (cell, day), count in counts.items():
+        db.execute(
+            text(
+                """
+                INSERT INTO cell_aggregates (h3_index, time_bucket, event_count, rolling_7d_avg, growth_rate)
+                VALUES (:h3_index, :day, :count, :count, 0)
+                """
+            ),
+            {"h3_index": h3.str_to_int(cell), "day": day, "count": count},
+        )
+
+
+def neighbor_of(cell: str) -> str:
+    """Return one cell adjacent to ``cell``."""
+    return next(other for other in h3.grid_disk(cell, 1) if other != cell)
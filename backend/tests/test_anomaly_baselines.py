@@ -0,0 +1,78 @@
+"""Tests for online anomaly baselines and the anomaly stage built on them."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import h3
+import numpy as np
+from sqlalchemy import text
+
+from backend.app.analytics.baselines import RunningStats, decay_factor, score_days
+from backend.app.analytics.engine import AnalyticsEngine
+from backend.app.db.session import SessionLocal
+from backend.tests.conftest import seed_cell_counts
+
+
+def test_online_scores_match_decayed_statistics_of_prior_days() -> None:
+    """Each day scores against the weighted mean/spread of every earlier day, missing days counted as zero."""
+    decay = decay_factor(14.0)
+    offsets = [np.array([0, 1, 4, 5, 9, 10, 11, 20]), np.array([2, 3, 4, 12])]
+    series = np.concatenate([np.full(part.size, position) for position, part in enumerate(offsets)])
+    days = np.concatenate(offsets).astype(np.int64) + 20_000
+    values = np.random.default_rng(1).poisson(3.0, size=series.size).astype(np.float64)
+    stats = RunningStats.empty(2)
+
+    zscores, after = score_days(stats, series, days, values, decay, min_days=3)
+
+    for position in range(2):
+        rows = np.flatnonzero(series == position)
+        elapsed = days[rows] - days[rows[0]]
+        history = np.zeros(elapsed[-1] + 1)
+        history[elapsed] = values[rows]
+        for row, day in zip(rows, elapsed, strict=True):
+            weights = decay ** np.arange(day)[::-1]
+            expected = 0.0
+            if day >= 3:
+                mean = np.average(history[:day], weights=weights)
+                spread = np.sqrt(np.average((history[:day] - mean) ** 2, weights=weights))
+                expected = (values[row] - mean) / spread if spread > 0 else 0.0
+            assert np.isclose(zscores[row], expected)
+        weights = decay ** np.arange(elapsed[-1] + 1)[::-1]
+        assert np.isclose(stats.weight[position], weights.sum())
+        assert np.isclose(stats.mean[position], np.average(history, weights=weights))
+        assert (after.weight[rows[-1]], stats.through[position]) == (stats.weight[position], days[rows[-1]])
+
+
+def test_anomaly_stage_flags_spikes_and_reruns_are_idempotent() -> None:
+    """Incremental days, a full re-run and a backfill inside folded days all give the same scores and state."""
+    busy = h3.latlng_to_cell(38.5, -97.0, 8)
+    new = h3.latlng_to_cell(34.0, -118.0, 8)
+    first_day = date(2026, 2, 1)
+    counts = {(busy, first_day + timedelta(days=offset)): 3 + offset % 2 for offset in range(14)}
+    counts[(busy, date(2026, 2, 15))] = 15
+    counts[(new, date(2026, 2, 2))] = 9
+    with SessionLocal() as db:
+        seed_cell_counts(db, counts)
+
+        engine = AnalyticsEngine()
+        select_flags = text("SELECT h3_index, time_bucket, anomaly_score, flagged FROM anomaly_flags ORDER BY 1, 2")
+        select_baselines = text("SELECT h3_index, through_bucket, weight, mean, m2 FROM anomaly_baselines ORDER BY 1")
+        assert engine.detect_anomalies(db, first_day, date(2026, 2, 14)) == 15
+        assert engine.detect_anomalies(db, date(2026, 2, 15), date(2026, 2, 15)) == 1
+        incremental = (db.execute(select_flags).all(), db.execute(select_baselines).all())
+
+        assert engine.detect_anomalies(db, first_day, date(2026, 2, 15)) == 16
+        assert (db.execute(select_flags).all(), db.execute(select_baselines).all()) == incremental
+        assert engine.detect_anomalies(db, date(2026, 2, 10), date(2026, 2, 12)) == 6
+        assert (db.execute(select_flags).all(), db.execute(select_baselines).all()) == incremental
+        db.commit()
+
+    flags, baselines = incremental
+    assert [(row.h3_index, row.time_bucket) for row in flags if row.flagged] == [
+        (h3.str_to_int(busy), date(2026, 2, 15))
+    ]
+    assert {row.h3_index: row.through_bucket for row in baselines} == {
+        h3.str_to_int(busy): date(2026, 2, 15),
+        h3.str_to_int(new): date(2026, 2, 2),
+    }
@@ -0,0 +1,75 @@
+"""Integration tests for the sharded, resumable bulk event loader."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from backend.app.db.session import SessionLocal
+from backend.app.services.bulk_load import build_tasks, load_id_for, load_shard
+
+
+def write_events_csv(path: Path, count: int) -> None:
+    """Write a CSV feed with one malformed trailing row."""
+    lines = ["event_type,event_timestamp,longitude,latitude,attributes_json"]
+    lines += [f"power_outage,2026-02-20T{index % 24:02d}:00:00+00:00,{-97 + index / 100},38.5," for index in range(count)]
+    lines.append("power_outage,not-a-date,-97.0,38.5,")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def count_events() -> int:
+    """Count loaded events."""
+    with SessionLocal() as db:
+        return db.execute(text("SELECT COUNT(*) FROM events")).scalar_one()
+
+
+def test_sharded_csv_load_checkpoints_and_skips_completed_shards(tmp_path: Path) -> None:
+    """Every row lands once across byte-range shards, and a rerun finds nothing left to do."""
+    source = tmp_path / "events.csv"
+    write_events_csv(source, 40)
+
+    with patch("backend.app.services.bulk_load.SHARD_BYTES", 200):
+        tasks, done = build_tasks(source, None, batch_size=7)
+        assert done == 0 and len(tasks) > 1
+        results = [load_shard(task) for task in tasks]
+        assert sum(result.inserted for result in results) == 40
+        assert sum(result.rejected for result in results) == 1
+        assert count_events() == 40
+
+        tasks, done = build_tasks(source, None, batch_size=7)
+    assert tasks == [] and done == len(results)
+
+
+def test_interrupted_load_resumes_from_committed_offset(tmp_path: Path) -> None:
+    """A shard with a committed checkpoint restarts after the last committed row."""
+    source = tmp_path / "events.ndjson.gz"
+    events = [
+        {"event_type": "fire_incident", "event_timestamp": "2026-02-20T10:00:00+00:00", "longitude": -97.0 + i / 100, "latitude": 38.5}
+        for i in range(10)
+    ]
+    payload = "".join(json.dumps(event) + "\n" for event in events).encode()
+    source.write_bytes(gzip.compress(payload))
+    first_four = len("".join(json.dumps(event) + "\n" for event in events[:4]).encode())
+
+    with SessionLocal() as db:
+        db.execute(
+            text(
+                "INSERT INTO ingest_checkpoints (load_id, shard, committed_offset, inserted) VALUES (:load_id, 0, :offset, 4)"
+            ),
+            {"load_id": load_id_for(source), "offset": first_four},
+        )
+        db.commit()
+
+    tasks, _ = build_tasks(source, None, batch_size=3)
+    assert len(tasks) == 1 and tasks[0].resume_offset == first_four
+    assert load_shard(tasks[0]).inserted == 6
+
+    with SessionLocal() as db:
+        longitudes = db.execute(text("SELECT ST_X(geom) FROM events ORDER BY ST_X(geom)")).scalars().all()
+        checkpoint = db.execute(text("SELECT inserted, completed FROM ingest_checkpoints")).one()
+    assert [round(value, 2) for value in longitudes] == [round(-97.0 + i / 100, 2) for i in range(4, 10)]
+    assert (checkpoint.inserted, checkpoint.completed) == (10, True)
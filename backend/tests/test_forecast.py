@@ -0,0 +1,61 @@
+"""Tests for vectorized risk forecasting and the forecast read endpoint."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import h3
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.app.analytics.engine import AnalyticsEngine
+from backend.app.analytics.forecast import forecast_cells, risk_levels
+from backend.app.db.session import SessionLocal
+from backend.tests.conftest import seed_cell_counts
+
+
+def test_forecast_follows_trend_and_weekday_pattern_for_every_cell() -> None:
+    """Each row gets its own projection: a linear ramp continues, a flat series stays flat, weekly peaks recur."""
+    first_day = date(2026, 1, 5)  # a Monday
+    ramp = np.arange(28, dtype=np.float64)
+    flat = np.full(28, 4.0)
+    saturday_peaks = np.array([9.0 if offset % 7 == 5 else 1.0 for offset in range(28)])
+    forecast = forecast_cells(np.vstack([ramp, flat, saturday_peaks]), first_day, 7, alpha=0.5, beta=0.1)
+
+    assert forecast.first_target == date(2026, 2, 2)
+    np.testing.assert_allclose(forecast.counts[0, :3], [28.0, 29.0, 30.0])
+    np.testing.assert_allclose(forecast.counts[1], 4.0)
+    assert forecast.counts[2].argmax() == 5
+    assert (forecast.lower <= forecast.counts).all() and (forecast.counts <= forecast.upper).all()
+    assert risk_levels(np.array([[10.0, 40.0, 60.0, 90.0]])).tolist() == [["low", "medium", "high", "critical"]]
+
+
+def test_forecast_stage_writes_projections_served_by_risk_api(client: TestClient) -> None:
+    """The stage reads the history window in bulk, replaces projected days and the API ranks them."""
+    rising = h3.latlng_to_cell(38.5, -97.0, 8)
+    quiet = h3.latlng_to_cell(34.0, -118.0, 8)
+    end_date = date(2026, 2, 28)
+    counts: dict[tuple[str, date], int] = {}
+    for offset in range(14):
+        day = end_date - timedelta(days=13 - offset)
+        counts[(rising, day)] = 2 + offset
+        counts[(quiet, day)] = 1
+    with SessionLocal() as db:
+        seed_cell_counts(db, counts)
+        engine = AnalyticsEngine()
+        assert engine.forecast_risk(db, end_date) == 6
+        assert engine.forecast_risk(db, end_date) == 6
+        db.commit()
+        assert db.execute(text("SELECT COUNT(*) FROM risk_forecasts")).scalar_one() == 6
+
+    response = client.get("/v1/risk/forecast/2026-03-01", params={"limit": 10})
+    assert response.status_code == 200
+    rows = response.json()
+    assert [row["h3_index"] for row in rows] == [rising, quiet]
+    assert rows[0]["issued_on"] == "2026-02-28" and rows[0]["horizon_days"] == 1
+    assert rows[0]["predicted_event_count"] > 14
+    assert rows[0]["predicted_risk_level"] in {"high", "critical"}
+
+    in_parent = client.get("/v1/risk/forecast/2026-03-03", params={"h3_parent": h3.cell_to_parent(quiet, 5)})
+    assert [row["h3_index"] for row in in_parent.json()] == [quiet]
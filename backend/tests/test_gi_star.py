@@ -0,0 +1,76 @@
+"""Tests for Getis-Ord Gi* neighborhood statistics and their use in hotspots."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import h3
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.app.analytics.engine import AnalyticsEngine
+from backend.app.analytics.spatial_stats import gi_star, neighbor_graph
+from backend.app.db.session import SessionLocal
+from backend.tests.conftest import seed_cell_counts
+
+
+def test_sparse_gi_star_matches_dense_formula_per_resolution() -> None:
+    """Sparse products give the textbook Gi* with a dense weight matrix, scoring each resolution separately."""
+    center = h3.latlng_to_cell(38.5, -97.0, 8)
+    fine = sorted(h3.str_to_int(cell) for cell in h3.grid_disk(center, 3))
+    coarse = sorted(h3.str_to_int(cell) for cell in h3.grid_disk(h3.cell_to_parent(center, 7), 2))
+    cells = np.array(sorted(fine + coarse), dtype=np.int64)
+    matrix = np.random.default_rng(3).poisson(4.0, size=(cells.size, 5)).astype(np.float64)
+
+    zscores, degrees = gi_star(cells, matrix, rings=1)
+
+    for members in (fine, coarse):
+        rows = np.searchsorted(cells, members)
+        size = len(members)
+        weights = np.array(
+            [[1.0 if other in h3.grid_disk(h3.int_to_str(cell), 1) else 0.0 for other in map(h3.int_to_str, members)]
+             for cell in members]
+        )
+        values = matrix[rows]
+        weight_sums = weights.sum(axis=1)[:, None]
+        expected = (weights @ values - values.mean(axis=0) * weight_sums) / (
+            values.std(axis=0) * np.sqrt((size * weight_sums - weight_sums**2) / (size - 1))
+        )
+        np.testing.assert_allclose(zscores[rows], expected)
+        np.testing.assert_array_equal(degrees[rows], weights.sum(axis=1))
+    assert neighbor_graph(cells[np.isin(cells, fine)], 1) is neighbor_graph(np.array(fine, dtype=np.int64), 1)
+
+
+def test_gi_star_stage_marks_clusters_not_isolated_spikes(client: TestClient) -> None:
+    """A surging neighborhood becomes spatial_cluster hotspots; an equally large lone spike does not."""
+    bucket_date = date(2026, 2, 20)
+    center = h3.latlng_to_cell(38.5, -97.0, 8)
+    cluster = set(h3.grid_disk(center, 1))
+    spike = sorted(h3.grid_ring(center, 3))[0]
+    counts = {(cell, bucket_date): 20 if cell in cluster or cell == spike else 1 for cell in h3.grid_disk(center, 3)}
+    with SessionLocal() as db:
+        seed_cell_counts(db, counts)
+        for cell, _ in counts:
+            db.execute(
+                text("INSERT INTO risk_scores (h3_index, time_bucket, risk_score, risk_level) VALUES (:h3_index, :day, 20, 'low')"),
+                {"h3_index": h3.str_to_int(cell), "day": bucket_date},
+            )
+        engine = AnalyticsEngine()
+        assert engine.compute_gi_star(db, bucket_date, bucket_date) == 37
+        assert engine.compute_gi_star(db, bucket_date, bucket_date) == 37
+        engine.materialize_hotspots(db, bucket_date, bucket_date)
+        db.commit()
+        neighbors = db.execute(
+            text("SELECT neighbor_count FROM gi_star_scores WHERE h3_index = :h3_index"),
+            {"h3_index": h3.str_to_int(center)},
+        ).scalar_one()
+    assert neighbors == 7
+
+    params = {"start_date": bucket_date.isoformat(), "end_date": bucket_date.isoformat()}
+    payload = client.get("/v1/hotspots", params=params).json()
+    assert {row["h3_index"] for row in payload} == cluster
+    assert all(row["reasons"] == ["spatial_cluster"] and row["gi_zscore"] >= 1.96 for row in payload)
+
+    strongest = client.get("/v1/hotspots", params={**params, "min_gi_zscore": 5})
+    assert [row["h3_index"] for row in strongest.json()] == [center]
@@ -2,15 +2,45 @@
 
 from __future__ import annotations
 
+import asyncio
+import io
+import json
+import threading
+from collections.abc import Callable, Iterator
 from datetime import UTC, date, datetime, timedelta
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import h3
+import orjson
+import psycopg
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
 
+from backend.app.analytics.engine import AnalyticsEngine
+from backend.app.analytics.pipeline import STAGES, create_run, get_run, run_all
+from backend.app.api.params import encode_cursor
+from backend.app.core.cache import redis_client
+from backend.app.core.ingest_stream import DEAD_LETTER_KEY, EVENT_FIELD, STREAM_KEY, ensure_consumer_group
+from backend.app.core.pipeline_events import (
+    PIPELINE_CHANNEL,
+    PipelineBroadcaster,
+    publish_pipeline_result,
+    sse_frame,
+)
+from backend.app.core.revocation import TokenStatusCache, token_status_cache
 from backend.app.core.security import get_password_hash
-from backend.app.db.session import SessionLocal
+from backend.app.db.session import SessionLocal, engine
+from backend.app.schemas.event import EventUploadItem
+from backend.app.services.ingestion import ingest_events
+from backend.app.services.storage_maintenance import compress_old_chunks, downsample_expired_cell_days
+from backend.app.worker import analytics_scheduler
+from backend.app.worker.analytics_scheduler import PendingRange, dispatch_window, parse_signal
+from backend.app.worker.ingest_consumer import DrainStats, read_batch, write_batch
+from backend.tests.conftest import neighbor_of, seed_cell_counts, seed_h3_cells
 
 
 def create_token(client: TestClient, username: str = "analyst_1", role: str = "analyst") -> str:
@@ -31,6 +61,44 @@ def create_token(client: TestClient, username: str = "analyst_1", role: str = "a
     return response.json()["access_token"]
 
 
+def seed_risk_cells(bucket_date: date, cells: list[tuple[str, float, str, bool]]) -> None:
+    """Insert scored H3 cells (h3_index, score, level, flagged) for one day and refresh mv_daily_risk."""
+    with SessionLocal() as db:
+        seed_h3_cells(db, [h3_index for h3_index, *_ in cells])
+        for h3_index, score, level, flagged in cells:
+            cell_id = h3.str_to_int(h3_index)
+            params = {"h3_index": cell_id, "bucket_date": bucket_date, "score": score, "level": level}
+            db.execute(
+                text(
+                    """
+                    INSERT INTO cell_aggregates (h3_index, time_bucket, event_count, rolling_7d_avg, growth_rate)
+                    VALUES (:h3_index, :bucket_date, 5, 2.0, 0.5)
+                    """
+                ),
+                params,
+            )
+            db.execute(
+                text(
+                    """
+                    INSERT INTO risk_scores (h3_index, time_bucket, risk_score, risk_level)
+                    VALUES (:h3_index, :bucket_date, :score, CAST(:level AS risk_level))
+                    """
+                ),
+                params,
+            )
+            db.execute(
+                text(
+                    """
+                    INSERT INTO anomaly_flags (h3_index, time_bucket, anomaly_score, flagged)
+                    VALUES (:h3_index, :bucket_date, :anomaly_score, :flagged)
+                    """
+                ),
+                {"h3_index": cell_id, "bucket_date": bucket_date, "anomaly_score": 2.5 if flagged else 0.1, "flagged": flagged},
+            )
+        db.execute(text("REFRESH MATERIALIZED VIEW mv_daily_risk"))
+        db.commit()
+
+
 def test_event_ingestion_and_listing(client: TestClient) -> None:
     """Upload spatial-temporal events then query them back."""
     token = create_token(client)
@@ -68,12 +136,495 @@ def test_event_ingestion_and_listing(client: TestClient) -> None:
     assert all(item["event_type"] == "fire_incident" for item in payload)
 
 
+def test_ingestion_skips_replayed_events_by_key_and_content_hash() -> None:
+    """Replayed keyed events and, with deduplication on, identical content are inserted once."""
+    replay = [
+        EventUploadItem(
+            event_type="power_outage",
+            event_timestamp=datetime(2026, 2, 20, hour, tzinfo=UTC),
+            longitude=-97.0,
+            latitude=38.5,
+            event_key=f"feed-a-{hour}",
+        )
+        for hour in range(3)
+    ]
+    unkeyed = EventUploadItem(
+        event_type="fire_incident",
+        event_timestamp=datetime(2026, 2, 20, 9, tzinfo=UTC),
+        longitude=-97.1,
+        latitude=38.4,
+        attributes_json={"source": "ops-feed-a"},
+    )
+    with SessionLocal() as db:
+        assert ingest_events(db, replay) == 3
+        assert ingest_events(db, replay + replay[:1]) == 0
+        assert ingest_events(db, [unkeyed, unkeyed], deduplicate=True) == 1
+        assert ingest_events(db, [unkeyed], deduplicate=True) == 0
+        assert ingest_events(db, [unkeyed]) == 1
+        assert db.execute(text("SELECT COUNT(*) FROM events")).scalar_one() == 5
+
+
+def test_ingestion_keeps_a_reused_key_at_a_new_timestamp() -> None:
+    """Duplicates are exact (event_key, event_timestamp) pairs; the same key at another time is a new event."""
+    first = EventUploadItem(
+        event_type="power_outage",
+        event_timestamp=datetime(2026, 2, 20, 1, tzinfo=UTC),
+        longitude=-97.0,
+        latitude=38.5,
+        event_key="feed-b-1",
+    )
+    later = first.model_copy(update={"event_timestamp": datetime(2026, 2, 20, 5, tzinfo=UTC)})
+    between = first.model_copy(update={"event_timestamp": datetime(2026, 2, 20, 3, tzinfo=UTC)})
+    with SessionLocal() as db:
+        assert ingest_events(db, [first, later]) == 2
+        assert ingest_events(db, [first, between, later]) == 1
+        assert ingest_events(db, [between, between]) == 0
+        assert db.execute(text("SELECT COUNT(*) FROM events WHERE event_key = 'feed-b-1'")).scalar_one() == 3
+
+
+def test_naive_timestamps_are_stored_and_deduplicated_as_utc() -> None:
+    """Timestamps without an offset mean UTC for the pre-check and the stored row, whatever the session time zone."""
+    naive = EventUploadItem(
+        event_type="power_outage",
+        event_timestamp=datetime(2026, 2, 20, 1),
+        longitude=-97.0,
+        latitude=38.5,
+        event_key="feed-c-1",
+    )
+    assert naive.event_timestamp == datetime(2026, 2, 20, 1, tzinfo=UTC)
+    unvalidated = naive.model_copy(update={"event_timestamp": datetime(2026, 2, 20, 1)})
+    with SessionLocal() as db:
+        db.execute(text("SET TIME ZONE 'America/New_York'"))
+        try:
+            assert ingest_events(db, [naive]) == 1
+            assert ingest_events(db, [unvalidated]) == 0
+            stored = db.execute(text("SELECT event_timestamp FROM events WHERE event_key = 'feed-c-1'")).scalar_one()
+        finally:
+            db.execute(text("RESET TIME ZONE"))
+            db.commit()
+    assert stored == datetime(2026, 2, 20, 1, tzinfo=UTC)
+
+def test_streaming_upload_accepts_ndjson_and_csv_with_row_errors(client: TestClient) -> None:
+    """Streamed uploads insert valid rows in batches and report rejected lines."""
+    token = create_token(client)
+    good = {"event_type": "power_outage", "event_timestamp": "2026-02-20T10:00:00+00:00", "longitude": -97.0, "latitude": 38.5}
+    ndjson = "\n".join([json.dumps(good), json.dumps({**good, "latitude": 123.0}), "not json", json.dumps(good)])
+
+    with patch("backend.app.api.v1.endpoints.events.settings.ingest_batch_size", 1):
+        response = client.post(
+            "/v1/events/upload/stream",
+            content=ndjson.encode(),
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/x-ndjson"},
+        )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["inserted"], body["rejected"]) == (2, 2)
+    assert [batch["inserted"] for batch in body["batches"]] == [1, 1]
+    assert [error["line"] for error in body["errors"]] == [2, 3]
+    assert body["errors"][0]["error"].startswith("latitude:")
+
+    csv_body = (
+        "event_type,event_timestamp,longitude,latitude,attributes_json\n"
+        'fire_incident,2026-02-20T11:00:00+00:00,-97.1,38.4,"{""severity"": ""high""}"\n'
+        "fire_incident,not-a-date,-97.1,38.4,\n"
+    )
+    response = client.post(
+        "/v1/events/upload/stream",
+        content=csv_body.encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+    )
+    assert (response.json()["inserted"], response.json()["rejected"]) == (1, 1)
+
+
+def test_streaming_upload_reports_sqlalchemy_batch_failures(client: TestClient) -> None:
+    """A batch failing inside SQLAlchemy is rolled back and reported; later batches still commit."""
+    token = create_token(client)
+    good = {"event_type": "power_outage", "event_timestamp": "2026-02-20T10:00:00+00:00", "longitude": -97.0, "latitude": 38.5}
+    dropped = OperationalError("COMMIT", {}, Exception("server closed the connection unexpectedly"))
+    calls = iter([dropped])
+
+    def flaky_ingest(db: Session, events: list[EventUploadItem], batch_size: int) -> int:
+        failure = next(calls, None)
+        if failure is not None:
+            raise failure
+        return ingest_events(db, events, batch_size)
+
+    with (
+        patch("backend.app.api.v1.endpoints.events.settings.ingest_batch_size", 1),
+        patch("backend.app.api.v1.endpoints.events.ingest_events", side_effect=flaky_ingest),
+    ):
+        response = client.post(
+            "/v1/events/upload/stream",
+            content="\n".join([json.dumps(good), json.dumps(good)]).encode(),
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/x-ndjson"},
+        )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["inserted"] == 1
+    assert [batch["error"] for batch in body["batches"]] == ["server closed the connection unexpectedly", None]
+    assert response.json()["errors"][0]["line"] == 3
+
+    unsupported = client.post(
+        "/v1/events/upload/stream",
+        content=b"{}",
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+    )
+    assert unsupported.status_code == 415
+
+
+def test_async_upload_queues_events_for_stream_consumer(client: TestClient) -> None:
+    """Async uploads return 202 from Redis; the consumer writes them once, even when redelivered."""
+    redis_client.delete(STREAM_KEY, DEAD_LETTER_KEY)
+    token = create_token(client)
+    good = {"event_type": "power_outage", "event_timestamp": "2026-02-20T10:00:00+00:00", "longitude": -97.0, "latitude": 38.5}
+
+    response = client.post(
+        "/v1/events/upload/async",
+        json={"events": [good, {**good, "longitude": -97.1}]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 202
+    assert (response.json()["queued"], response.json()["backlog"]) == (2, 2)
+    redis_client.xadd(STREAM_KEY, {EVENT_FIELD: b'{"event_type": "x"}'})
+
+    ensure_consumer_group()
+    entries = read_batch("test-consumer", batch_size=100)
+    assert len(entries) == 3
+    stats = DrainStats()
+    write_batch(entries, stats)
+    assert (stats.inserted, stats.rejected) == (2, 1)
+    assert redis_client.xlen(STREAM_KEY) == 0
+    assert redis_client.xlen(DEAD_LETTER_KEY) == 1
+    # A batch redelivered after its commit is merged away by the entry-id event keys.
+    write_batch(entries[:2], stats)
+    assert (stats.inserted, stats.duplicates) == (2, 2)
+    with SessionLocal() as db:
+        assert db.execute(text("SELECT COUNT(*) FROM events")).scalar_one() == 2
+
+    with patch("backend.app.api.v1.endpoints.events.settings.ingest_stream_max_backlog", 1):
+        refused = client.post(
+            "/v1/events/upload/async",
+            json={"events": [good, good]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    assert refused.status_code == 503
+    assert refused.headers["Retry-After"] == "5"
+
+
+def test_committed_ingest_batches_signal_debounced_analytics_runs() -> None:
+    """Each committed batch is logged and NOTIFYs its day range; the scheduler merges, debounces and widens it."""
+    events = [
+        EventUploadItem(event_type="power_outage", event_timestamp=datetime(2026, 2, day, 12, tzinfo=UTC), longitude=-97.0, latitude=38.5)
+        for day in (18, 20)
+    ]
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        listener = connection.connection.driver_connection
+        listener.execute("LISTEN events_ingested")
+        with SessionLocal() as db:
+            ingest_events(db, events)
+            batch_id = db.execute(text("SELECT id FROM ingest_batches")).scalar_one()
+        notifies = list(listener.notifies(timeout=5, stop_after=1))
+    assert parse_signal(notifies[0].payload) == (batch_id, date(2026, 2, 18), date(2026, 2, 20), 2)
+
+    pending = PendingRange(date(2026, 2, 18), date(2026, 2, 20), 2, first_signal=0.0, last_signal=0.0, batch_ids={1})
+    pending.merge(2, date(2026, 2, 10), date(2026, 2, 11), 1, now=290.0)
+    pending.merge(2, date(2026, 2, 10), date(2026, 2, 11), 1, now=295.0)
+    assert (pending.first_day, pending.last_day, pending.events) == (date(2026, 2, 10), date(2026, 2, 20), 3)
+    # Steady signals cannot postpone a run past the max delay after the first one.
+    assert pending.due_in(290.0) == 10.0
+
+    start_dt, end_dt = dispatch_window(date(2026, 2, 10), date(2026, 2, 20), today=date(2026, 2, 24))
+    assert (start_dt, end_dt.date()) == (datetime(2026, 2, 10, tzinfo=UTC), date(2026, 2, 24))
+
+
+def test_scheduler_dispatches_batches_committed_while_it_was_not_listening() -> None:
+    """Batches logged without a listener are merged on connect, and dispatching removes them from the log."""
+    with SessionLocal() as db:
+        for day in (3, 5):
+            ingest_events(
+                db,
+                [EventUploadItem(event_type="power_outage", event_timestamp=datetime(2026, 1, day, 8, tzinfo=UTC), longitude=-97.0, latitude=38.5)],
+            )
+    fake_pipeline = MagicMock()
+    fake_pipeline.delay.return_value = SimpleNamespace(id="task-catch-up-001")
+    with (
+        engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection,
+        patch.object(analytics_scheduler, "run_analytics_pipeline", fake_pipeline),
+    ):
+        listener = connection.connection.driver_connection
+        pending = analytics_scheduler.load_logged_batches(listener, None)
+        assert pending is not None
+        assert (pending.first_day, pending.last_day, pending.events, len(pending.batch_ids)) == (
+            date(2026, 1, 3),
+            date(2026, 1, 5),
+            2,
+            2,
+        )
+        analytics_scheduler.dispatch(pending, listener)
+
+    start_dt, end_dt = dispatch_window(date(2026, 1, 3), date(2026, 1, 5), datetime.now(UTC).date())
+    fake_pipeline.delay.assert_called_once_with(start_dt.isoformat(), end_dt.isoformat())
+    with SessionLocal() as db:
+        assert db.execute(text("SELECT COUNT(*) FROM ingest_batches")).scalar_one() == 0
+
+
+def test_scheduler_reconnects_after_listener_errors_and_reloads_logged_batches() -> None:
+    """A dropped LISTEN connection or failed connect is retried with backoff; batches still logged are picked up again."""
+    stop = [False]
+    logged = (7, datetime(2026, 2, 18, 12, tzinfo=UTC), datetime(2026, 2, 20, 12, tzinfo=UTC), 2)
+    payload = orjson.dumps(
+        {"id": 7, "min": "2026-02-18T12:00:00+00:00", "max": "2026-02-20T12:00:00+00:00", "count": 2}
+    ).decode()
+
+    def dropped(timeout: float) -> Iterator[SimpleNamespace]:
+        yield SimpleNamespace(payload=payload)
+        raise psycopg.OperationalError("server closed the connection unexpectedly")
+
+    def quiet(timeout: float) -> Iterator[SimpleNamespace]:
+        stop[0] = True
+        yield SimpleNamespace(payload=payload)
+
+    def listening(notifies: Callable[[float], Iterator[SimpleNamespace]], rows: list[tuple[object, ...]]) -> MagicMock:
+        connection = MagicMock()
+        connection.connection.driver_connection.notifies.side_effect = notifies
+        connection.connection.driver_connection.execute.return_value = rows
+        handle = MagicMock()
+        handle.execution_options.return_value.__enter__.return_value = connection
+        return handle
+
+    first, second = listening(dropped, []), listening(quiet, [logged])
+    fake_engine = MagicMock()
+    fake_engine.connect.side_effect = [first, OperationalError("connect", None, Exception("refused")), second]
+    with (
+        patch.object(analytics_scheduler, "engine", fake_engine),
+        patch.object(analytics_scheduler.time, "sleep") as sleep,
+        patch.object(analytics_scheduler, "dispatch") as dispatch,
+    ):
+        analytics_scheduler.run(stop)
+
+    assert [call.args[0] for call in sleep.call_args_list] == [0.5, 1.0]
+    first.execution_options.return_value.__enter__.return_value.invalidate.assert_called_once()
+    pending = dispatch.call_args.args[0]
+    assert (dispatch.call_count, pending.first_day, pending.last_day, pending.events, pending.batch_ids) == (
+        1,
+        date(2026, 2, 18),
+        date(2026, 2, 20),
+        2,
+        {7},
+    )
+
+def test_ingest_events_copies_in_batches() -> None:
+    """COPY ingestion writes every row with its geometry and attributes across batch commits."""
+    events = [
+        EventUploadItem(
+            event_type="power_outage",
+            event_timestamp=datetime(2026, 2, 20, hour, tzinfo=UTC),
+            longitude=-97.0 + hour / 100,
+            latitude=38.5,
+            attributes_json={"hour": hour} if hour % 2 else None,
+        )
+        for hour in range(5)
+    ]
+    with SessionLocal() as db:
+        assert ingest_events(db, iter(events), batch_size=2) == 5
+        rows = db.execute(
+            text("SELECT ST_X(geom) AS longitude, ST_SRID(geom) AS srid, attributes_json FROM events ORDER BY event_timestamp")
+        ).all()
+    assert [round(row.longitude, 2) for row in rows] == [-97.0, -96.99, -96.98, -96.97, -96.96]
+    assert {row.srid for row in rows} == {4326}
+    assert [row.attributes_json for row in rows] == [None, {"hour": 1}, None, {"hour": 3}, None]
+
+
+def test_storage_maintenance_downsamples_expired_cell_days_and_compresses_events() -> None:
+    """Expired cell-days become one weekly rollup and their chunks go; old event chunks compress once."""
+    cell = h3.latlng_to_cell(38.5, -97.0, 8)
+    recent = datetime.now(UTC).date()
+    seed_risk_cells(date(2020, 1, 6), [(cell, 40.0, "medium", True)])
+    seed_risk_cells(date(2020, 1, 7), [(cell, 80.0, "critical", False)])
+    seed_risk_cells(recent, [(cell, 10.0, "low", False)])
+    old_event = EventUploadItem(
+        event_type="power_outage", event_timestamp=datetime(2020, 1, 6, tzinfo=UTC), longitude=-97.0, latitude=38.5
+    )
+
+    with SessionLocal() as db:
+        ingest_events(db, [old_event])
+        horizon, rolled_up, dropped = downsample_expired_cell_days(db, retention_days=365)
+        assert horizon is not None and horizon <= recent - timedelta(days=365)
+        assert rolled_up == 2
+        assert dropped["cell_aggregates"] >= 1
+        rollup = db.execute(
+            text(
+                """
+                SELECT week_bucket, event_count, active_days, risk_score_sum, max_risk_score, flagged_days
+                FROM cell_weekly_rollups
+                """
+            )
+        ).one()
+        assert tuple(rollup) == (date(2020, 1, 6), 10, 2, 120.0, 80.0, 1)
+        assert db.execute(text("SELECT time_bucket FROM cell_aggregates")).scalars().all() == [recent]
+
+        assert compress_old_chunks(db, "events", older_than_days=365) == 1
+        assert compress_old_chunks(db, "events", older_than_days=365) == 0
+        assert db.execute(text("SELECT COUNT(*) FROM events")).scalar_one() == 1
+
+
+def test_pipeline_stores_integer_cells_and_api_returns_hex(client: TestClient) -> None:
+    """The engine writes 64-bit H3 ids; reads convert them back to hex strings at the edge."""
+    cell = h3.latlng_to_cell(38.5, -97.0, 8)
+    lat, lng = h3.cell_to_latlng(cell)
+    bucket_date = date(2026, 2, 18)
+    events = [
+        EventUploadItem(
+            event_type="power_outage",
+            event_timestamp=datetime(2026, 2, 18, hour, tzinfo=UTC),
+            longitude=lng,
+            latitude=lat,
+        )
+        for hour in (1, 2, 3)
+    ]
+    with SessionLocal() as db:
+        ingest_events(db, events)
+        AnalyticsEngine().run_pipeline(
+            db, datetime(2026, 2, 18, tzinfo=UTC), datetime(2026, 2, 18, 23, 59, 59, tzinfo=UTC)
+        )
+        stored = db.execute(text("SELECT h3_index, event_type, event_count FROM cell_aggregates ORDER BY event_type")).all()
+    assert [tuple(row) for row in stored] == [(h3.str_to_int(cell), "all", 3), (h3.str_to_int(cell), "power_outage", 3)]
+
+    risk = client.get(f"/v1/risk/{bucket_date.isoformat()}")
+    assert [row["h3_index"] for row in risk.json()] == [cell]
+    history = client.get(
+        f"/v1/risk/cells/{cell}/history", params={"start_date": "2026-02-18", "end_date": "2026-02-18"}
+    )
+    assert history.json()["event_count"] == [3]
+
+
+def test_pipeline_keeps_per_event_type_rows_and_reads_filter_by_type(client: TestClient) -> None:
+    """One aggregation pass writes each event type and the all-types rollup; reads select a type."""
+    fire_cell = h3.latlng_to_cell(38.5, -97.0, 8)
+    outage_cell = h3.latlng_to_cell(38.9, -97.4, 8)
+    events = [
+        EventUploadItem(
+            event_type=event_type,
+            event_timestamp=datetime(2026, 2, 18, hour, tzinfo=UTC),
+            longitude=h3.cell_to_latlng(cell)[1],
+            latitude=h3.cell_to_latlng(cell)[0],
+        )
+        for event_type, cell, hours in (("fire_incident", fire_cell, (1, 2, 3)), ("power_outage", outage_cell, (4,)))
+        for hour in hours
+    ]
+    with SessionLocal() as db:
+        ingest_events(db, events)
+        assert AnalyticsEngine().aggregate_events(
+            db, datetime(2026, 2, 18, tzinfo=UTC), datetime(2026, 2, 18, 23, 59, 59, tzinfo=UTC)
+        ) == 4
+        AnalyticsEngine().run_pipeline(
+            db, datetime(2026, 2, 18, tzinfo=UTC), datetime(2026, 2, 18, 23, 59, 59, tzinfo=UTC)
+        )
+        counts = db.execute(text("SELECT event_type, SUM(event_count) FROM cell_aggregates GROUP BY event_type")).all()
+    assert dict(counts) == {"all": 4, "fire_incident": 3, "power_outage": 1}
+
+    rollup = client.get("/v1/risk/2026-02-18")
+    assert {row["h3_index"] for row in rollup.json()} == {fire_cell, outage_cell}
+    fires = client.get("/v1/risk/2026-02-18", params={"event_type": "fire_incident"})
+    assert [row["h3_index"] for row in fires.json()] == [fire_cell]
+    history = client.get(
+        f"/v1/risk/cells/{outage_cell}/history",
+        params={"start_date": "2026-02-18", "end_date": "2026-02-18", "event_type": "power_outage"},
+    )
+    assert history.json()["event_count"] == [1]
+    hotspots = client.get(
+        "/v1/hotspots", params={"start_date": "2026-02-18", "end_date": "2026-02-18", "event_type": "flood"}
+    )
+    assert hotspots.json() == []
+
+    token = create_token(client)
+    rollup_event = {"event_type": "all", "event_timestamp": "2026-02-18T10:00:00+00:00", "longitude": -97.0, "latitude": 38.5}
+    upload = client.post("/v1/events/upload", json={"events": [rollup_event]}, headers={"Authorization": f"Bearer {token}"})
+    assert upload.status_code == 422
+
+
+def test_aggregation_rolls_up_events_stored_with_the_reserved_type() -> None:
+    """Rows stored as 'all' outside API validation count towards the rollup without colliding with it."""
+    cell = h3.latlng_to_cell(38.5, -97.0, 8)
+    lat, lng = h3.cell_to_latlng(cell)
+    with SessionLocal() as db:
+        for event_type in ("all", "fire_incident"):
+            db.execute(
+                text(
+                    """
+                    INSERT INTO events (event_type, event_timestamp, geom)
+                    VALUES (:event_type, '2026-02-18T06:00:00+00:00', ST_SetSRID(ST_MakePoint(:lng, :lat), 4326))
+                    """
+                ),
+                {"event_type": event_type, "lng": lng, "lat": lat},
+            )
+        written = AnalyticsEngine().aggregate_events(
+            db, datetime(2026, 2, 18, tzinfo=UTC), datetime(2026, 2, 18, 23, 59, 59, tzinfo=UTC)
+        )
+        counts = db.execute(text("SELECT event_type, event_count FROM cell_aggregates")).all()
+    assert written == 2
+    assert dict(counts) == {"all": 2, "fire_incident": 1}
+
+
+def test_incremental_risk_scoring_matches_a_full_window_run() -> None:
+    """Each day normalizes against its own trailing window, so one-day runs reproduce the full-window scores."""
+    busy = h3.latlng_to_cell(38.5, -97.0, 8)
+    quiet = h3.latlng_to_cell(34.0, -118.0, 8)
+    first_day = date(2026, 2, 1)
+    days = [first_day + timedelta(days=offset) for offset in range(10)]
+    counts = {(busy, day): 2 + 3 * offset for offset, day in enumerate(days)} | {(quiet, day): 1 + offset % 3 for offset, day in enumerate(days)}
+    select_scores = text("SELECT h3_index, event_type, time_bucket, risk_score, risk_level FROM risk_scores ORDER BY 1, 2, 3")
+    engine = AnalyticsEngine()
+    with SessionLocal() as db:
+        seed_cell_counts(db, counts)
+        assert engine.compute_risk_scores(db, days[0], days[-1]) == 20
+        full_window = db.execute(select_scores).all()
+        db.execute(text("DELETE FROM risk_scores"))
+        for day in days:
+            assert engine.compute_risk_scores(db, day, day) == 2
+        assert db.execute(select_scores).all() == full_window
+        db.rollback()
+
+def test_failed_pipeline_stage_resumes_without_rerunning_committed_stages(client: TestClient) -> None:
+    """A failing stage rolls back and marks the run failed; resuming skips the stages already committed."""
+    cell = h3.latlng_to_cell(38.5, -97.0, 8)
+    lat, lng = h3.cell_to_latlng(cell)
+    occurred_at = datetime(2026, 2, 18, 6, tzinfo=UTC)
+    with SessionLocal() as db:
+        ingest_events(
+            db, [EventUploadItem(event_type="power_outage", event_timestamp=occurred_at, longitude=lng, latitude=lat)]
+        )
+        run_id = create_run(db, datetime(2026, 2, 18, tzinfo=UTC), datetime(2026, 2, 18, 23, 59, tzinfo=UTC))
+        with patch.object(AnalyticsEngine, "detect_anomalies", side_effect=RuntimeError("boom")), pytest.raises(RuntimeError):
+            run_all(db, run_id)
+        run = get_run(db, run_id)
+        assert (run.status, run.completed_stages, run.failed_attempts) == ("failed", ["aggregate", "score"], 1)
+        assert run.last_error == "anomalies: boom"
+        assert db.execute(text("SELECT COUNT(*) FROM anomaly_flags")).scalar_one() == 0
+
+        with patch.object(AnalyticsEngine, "aggregate_events", side_effect=AssertionError("rerun")):
+            results = run_all(db, run_id)
+        assert [result.skipped for result in results] == [True, True, False, False, False, False, False]
+        run = get_run(db, run_id)
+        assert run.status == "completed"
+        assert run.row_counts == {
+            "aggregate": 2, "score": 2, "anomalies": 2, "gi_star": 1, "hotspots": 0, "refresh": 2, "forecast": 3
+        }
+
+    token = create_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    record = client.get(f"/v1/analytics/runs/{run_id}", headers=headers).json()
+    assert (record["status"], record["pending_stages"]) == ("completed", [])
+    assert client.post(f"/v1/analytics/runs/{run_id}/resume", headers=headers).status_code == 409
+    assert client.get("/v1/analytics/runs/999999", headers=headers).status_code == 404
+
+
 def test_analytics_endpoint_queues_celery_job(client: TestClient) -> None:
-    """Verify analytics API delegates heavy processing to Celery."""
+    """The run is recorded before its stage chain is queued, so the returned run id can be looked up."""
     token = create_token(client, username="analyst_2")
     fake_task = SimpleNamespace(id="task-integration-001")
 
-    with patch("backend.app.api.v1.endpoints.analytics.run_analytics_pipeline.delay", return_value=fake_task):
+    with patch("backend.app.api.v1.endpoints.analytics.dispatch_run", return_value=fake_task):
         response = client.post(
             "/v1/analytics/run",
             params={"resolution": 8},
@@ -81,7 +632,11 @@ def test_analytics_endpoint_queues_celery_job(client: TestClient) -> None:
         )
 
     assert response.status_code == 200
-    assert response.json() == {"task_id": "task-integration-001", "status": "queued"}
+    body = response.json()
+    assert (body["task_id"], body["status"]) == ("task-integration-001", "queued")
+    record = client.get(f"/v1/analytics/runs/{body['run_id']}", headers={"Authorization": f"Bearer {token}"})
+    assert record.status_code == 200
+    assert (record.json()["status"], record.json()["pending_stages"]) == ("pending", list(STAGES))
 
 
 def test_vector_tile_endpoint_returns_mvt(client: TestClient) -> None:
@@ -93,7 +648,7 @@ def test_vector_tile_endpoint_returns_mvt(client: TestClient) -> None:
                 """
                 INSERT INTO h3_cells (h3_index, resolution, geom)
                 VALUES (
-                    'testcell001',
+                    613173446228049919,
                     8,
                     ST_GeomFromText('POLYGON((-97.2 38.2, -97.2 38.8, -96.8 38.8, -96.8 38.2, -97.2 38.2))', 4326)
                 )
@@ -104,7 +659,7 @@ def test_vector_tile_endpoint_returns_mvt(client: TestClient) -> None:
             text(
                 """
                 INSERT INTO cell_aggregates (h3_index, time_bucket, event_count, rolling_7d_avg, growth_rate)
-                VALUES ('testcell001', :bucket_date, 10, 7.5, 0.33)
+                VALUES (613173446228049919, :bucket_date, 10, 7.5, 0.33)
                 """
             ),
             {"bucket_date": bucket_date},
@@ -113,7 +668,7 @@ def test_vector_tile_endpoint_returns_mvt(client: TestClient) -> None:
             text(
                 """
                 INSERT INTO risk_scores (h3_index, time_bucket, risk_score, risk_level)
-                VALUES ('testcell001', :bucket_date, 82.0, 'critical'::risk_level)
+                VALUES (613173446228049919, :bucket_date, 82.0, 'critical'::risk_level)
                 """
             ),
             {"bucket_date": bucket_date},
@@ -122,7 +677,7 @@ def test_vector_tile_endpoint_returns_mvt(client: TestClient) -> None:
             text(
                 """
                 INSERT INTO anomaly_flags (h3_index, time_bucket, anomaly_score, flagged)
-                VALUES ('testcell001', :bucket_date, 2.7, true)
+                VALUES (613173446228049919, :bucket_date, 2.7, true)
                 """
             ),
             {"bucket_date": bucket_date},
@@ -134,3 +689,359 @@ def test_vector_tile_endpoint_returns_mvt(client: TestClient) -> None:
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/vnd.mapbox-vector-tile"
     assert len(response.content) > 0
+
+
+def test_series_tile_endpoint_encodes_date_range(client: TestClient) -> None:
+    """One series tile covers several days; oversize ranges are rejected."""
+    start = date(2026, 2, 1)
+    with SessionLocal() as db:
+        db.execute(
+            text(
+                """
+                INSERT INTO h3_cells (h3_index, resolution, geom)
+                VALUES (
+                    613173446228049919,
+                    8,
+                    ST_GeomFromText('POLYGON((-97.2 38.2, -97.2 38.8, -96.8 38.8, -96.8 38.2, -97.2 38.2))', 4326)
+                )
+                """
+            )
+        )
+        for offset, (score, level) in enumerate([(12.0, "low"), (82.0, "critical")]):
+            bucket = start + timedelta(days=offset * 2)
+            db.execute(
+                text(
+                    """
+                    INSERT INTO cell_aggregates (h3_index, time_bucket, event_count, rolling_7d_avg, growth_rate)
+                    VALUES (613173446228049919, :bucket, 3, 1.5, 0.1)
+                    """
+                ),
+                {"bucket": bucket},
+            )
+            db.execute(
+                text(
+                    """
+                    INSERT INTO risk_scores (h3_index, time_bucket, risk_score, risk_level)
+                    VALUES (613173446228049919, :bucket, :score, CAST(:level AS risk_level))
+                    """
+                ),
+                {"bucket": bucket, "score": score, "level": level},
+            )
+        db.execute(text("REFRESH MATERIALIZED VIEW mv_daily_risk"))
+        db.commit()
+
+    response = client.get(
+        "/v1/tiles/series/0/0/0.mvt",
+        params={"start_date": start.isoformat(), "end_date": (start + timedelta(days=2)).isoformat()},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+    assert b"risk_series" in response.content
+    assert b"l-c" in response.content
+
+    too_long = client.get(
+        "/v1/tiles/series/0/0/0.mvt",
+        params={"start_date": start.isoformat(), "end_date": (start + timedelta(days=120)).isoformat()},
+    )
+    assert too_long.status_code == 422
+
+
+def test_event_listing_keyset_pagination_bbox_and_ndjson(client: TestClient) -> None:
+    """Page events by cursor, filter by bbox, and stream the same rows as NDJSON."""
+    token = create_token(client, username="analyst_3")
+    now = datetime.now(UTC).replace(microsecond=0)
+    events = [
+        {
+            "event_type": "power_outage",
+            "event_timestamp": (now - timedelta(minutes=offset)).isoformat(),
+            "longitude": longitude,
+            "latitude": 38.5,
+        }
+        for offset, longitude in enumerate([-97.0, -97.1, -120.0])
+    ]
+    upload = client.post("/v1/events/upload", json={"events": events}, headers={"Authorization": f"Bearer {token}"})
+    assert upload.status_code == 200
+
+    first_page = client.get("/v1/events", params={"limit": 2})
+    assert first_page.status_code == 200
+    assert len(first_page.json()) == 2
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = client.get("/v1/events", params={"limit": 2, "cursor": cursor})
+    assert second_page.status_code == 200
+    assert [item["longitude"] for item in second_page.json()] == [-120.0]
+    assert "X-Next-Cursor" not in second_page.headers
+
+    in_bbox = client.get("/v1/events", params={"bbox": "-98,38,-96,39"})
+    assert {item["longitude"] for item in in_bbox.json()} == {-97.0, -97.1}
+
+    streamed = client.get("/v1/events", headers={"Accept": "application/x-ndjson"})
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [line["longitude"] for line in lines] == [-97.0, -97.1, -120.0]
+
+    assert client.get("/v1/events", params={"cursor": "not-a-cursor"}).status_code == 400
+    for tampered in (encode_cursor("x", "y"), encode_cursor("2026-02-20T12:00:00", 5), encode_cursor(now, "5")):
+        assert client.get("/v1/events", params={"cursor": tampered}).status_code == 400
+
+
+def test_risk_for_date_filters_pages_and_streams(client: TestClient) -> None:
+    """Risk reads support level/score/bbox/parent filters, top-N cursor pages and a streamed full day."""
+    bucket_date = date(2026, 2, 20)
+    near = h3.latlng_to_cell(38.5, -97.0, 8)
+    neighbour = neighbor_of(near)
+    far = h3.latlng_to_cell(34.0, -118.0, 8)
+    seed_risk_cells(
+        bucket_date,
+        [(near, 90.0, "critical", True), (neighbour, 60.0, "high", False), (far, 10.0, "low", False)],
+    )
+    url = f"/v1/risk/{bucket_date.isoformat()}"
+
+    full_day = client.get(url)
+    assert full_day.status_code == 200
+    assert [row["h3_index"] for row in full_day.json()] == [near, neighbour, far]
+    assert full_day.json()[0]["anomaly_flagged"] is True
+
+    first_page = client.get(url, params={"limit": 2})
+    assert [row["h3_index"] for row in first_page.json()] == [near, neighbour]
+    second_page = client.get(url, params={"limit": 2, "cursor": first_page.headers["X-Next-Cursor"]})
+    assert [row["h3_index"] for row in second_page.json()] == [far]
+    for tampered in (encode_cursor("x", near), encode_cursor(True, near), encode_cursor(None, near)):
+        assert client.get(url, params={"cursor": tampered}).status_code == 400
+
+    levels = client.get(url, params={"risk_level": "high,critical", "min_score": 70})
+    assert [row["h3_index"] for row in levels.json()] == [near]
+
+    in_bbox = client.get(url, params={"bbox": "-98,38,-96,39"})
+    assert {row["h3_index"] for row in in_bbox.json()} == {near, neighbour}
+
+    in_parent = client.get(url, params={"h3_parent": h3.cell_to_parent(far, 5)})
+    assert [row["h3_index"] for row in in_parent.json()] == [far]
+
+    assert client.get(url, params={"risk_level": "extreme"}).status_code == 422
+
+
+def test_cell_history_returns_parallel_arrays(client: TestClient) -> None:
+    """A cell's history is one object of arrays ordered by day."""
+    cell = h3.latlng_to_cell(38.5, -97.0, 8)
+    seed_risk_cells(date(2026, 2, 21), [(cell, 40.0, "medium", False)])
+    seed_risk_cells(date(2026, 2, 20), [(cell, 90.0, "critical", True)])
+    url = f"/v1/risk/cells/{cell}/history"
+
+    response = client.get(url, params={"start_date": "2026-02-01", "end_date": "2026-02-28"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["dates"] == ["2026-02-20", "2026-02-21"]
+    assert body["risk_score"] == [90.0, 40.0]
+    assert body["risk_level"] == ["critical", "medium"]
+    assert body["anomaly_flagged"] == [True, False]
+
+    empty = client.get(url, params={"start_date": "2025-01-01", "end_date": "2025-01-31"})
+    assert empty.json()["dates"] == []
+    assert client.get(url, params={"start_date": "2025-01-01", "end_date": "2026-02-28"}).status_code == 422
+
+
+def test_area_queries_resolve_h3_cover_sets(client: TestClient) -> None:
+    """Bbox, radius and k-ring reads expand to H3 cell sets and return matching risk rows."""
+    bucket_date = date(2026, 2, 20)
+    near = h3.latlng_to_cell(38.5, -97.0, 8)
+    neighbour = neighbor_of(near)
+    far = h3.latlng_to_cell(34.0, -118.0, 8)
+    seed_risk_cells(
+        bucket_date,
+        [(near, 90.0, "critical", True), (neighbour, 60.0, "high", False), (far, 10.0, "low", False)],
+    )
+    window = {"start_date": bucket_date.isoformat(), "end_date": bucket_date.isoformat()}
+
+    in_bbox = client.get("/v1/risk/area/bbox", params={**window, "bbox": "-97.1,38.4,-96.9,38.6"})
+    assert in_bbox.status_code == 200
+    assert [row["h3_index"] for row in in_bbox.json()] == [near, neighbour]
+
+    lat, lng = h3.cell_to_latlng(near)
+    in_radius = client.get(
+        "/v1/risk/area/radius", params={**window, "latitude": lat, "longitude": lng, "radius_m": 100}
+    )
+    assert [row["h3_index"] for row in in_radius.json()] == [near]
+
+    in_kring = client.get("/v1/risk/area/kring", params={**window, "h3_index": near, "k": 1})
+    assert [row["h3_index"] for row in in_kring.json()] == [near, neighbour]
+
+    assert client.get("/v1/risk/area/kring", params={**window, "h3_index": "nope"}).status_code == 422
+    assert client.get("/v1/risk/area/bbox", params={**window, "bbox": "-130,20,-60,50"}).status_code == 422
+
+
+def test_bulk_reads_negotiate_binary_formats(client: TestClient) -> None:
+    """Risk reads return the same rows as JSON, MessagePack and Arrow IPC."""
+    msgpack = pytest.importorskip("msgpack")
+    pa = pytest.importorskip("pyarrow")
+    bucket_date = date(2026, 2, 20)
+    near = h3.latlng_to_cell(38.5, -97.0, 8)
+    far = h3.latlng_to_cell(34.0, -118.0, 8)
+    seed_risk_cells(bucket_date, [(near, 90.0, "critical", True), (far, 10.0, "low", False)])
+    url = f"/v1/risk/{bucket_date.isoformat()}"
+
+    as_json = client.get(url, params={"limit": 10})
+    packed = client.get(url, params={"limit": 10}, headers={"Accept": "application/msgpack"})
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert [row["h3_index"] for row in msgpack.Unpacker(io.BytesIO(packed.content))] == [
+        row["h3_index"] for row in as_json.json()
+    ]
+
+    arrow = client.get(url, headers={"Accept": "application/vnd.apache.arrow.stream"})
+    table = pa.ipc.open_stream(arrow.content).read_all()
+    assert table.column("h3_index").to_pylist() == [near, far]
+    assert table.column("anomaly_flagged").to_pylist() == [True, False]
+
+
+def test_hotspots_read_ranked_precomputed_table(client: TestClient) -> None:
+    """Hotspots are materialized with rank and reasons, then served with top_k, bbox and cursor pages."""
+    bucket_date = date(2026, 2, 20)
+    near = h3.latlng_to_cell(38.5, -97.0, 8)
+    neighbour = neighbor_of(near)
+    far = h3.latlng_to_cell(34.0, -118.0, 8)
+    quiet = h3.latlng_to_cell(40.0, -100.0, 8)
+    seed_risk_cells(
+        bucket_date,
+        [
+            (near, 90.0, "critical", False),
+            (neighbour, 30.0, "medium", True),
+            (far, 70.0, "high", False),
+            (quiet, 5.0, "low", False),
+        ],
+    )
+    with SessionLocal() as db:
+        AnalyticsEngine().materialize_hotspots(db, bucket_date, bucket_date)
+        db.commit()
+
+    params = {"start_date": bucket_date.isoformat(), "end_date": bucket_date.isoformat()}
+    response = client.get("/v1/hotspots", params=params)
+    assert response.status_code == 200
+    payload = response.json()
+    assert [(row["h3_index"], row["rank"]) for row in payload] == [(near, 1), (far, 2), (neighbour, 3)]
+    assert payload[2]["reasons"] == ["anomaly"]
+
+    top_two = client.get("/v1/hotspots", params={**params, "top_k": 2, "bbox": "-98,38,-96,39"})
+    assert [row["h3_index"] for row in top_two.json()] == [near]
+
+    first_page = client.get("/v1/hotspots", params={**params, "limit": 2})
+    second_page = client.get(
+        "/v1/hotspots", params={**params, "limit": 2, "cursor": first_page.headers["X-Next-Cursor"]}
+    )
+    assert [row["h3_index"] for row in second_page.json()] == [neighbour]
+    for tampered in (encode_cursor("yesterday", 1), encode_cursor(bucket_date, "x"), encode_cursor(bucket_date, 1.5)):
+        assert client.get("/v1/hotspots", params={**params, "cursor": tampered}).status_code == 400
+
+    too_long = client.get("/v1/hotspots", params={"start_date": "2025-01-01", "end_date": "2026-01-01"})
+    assert too_long.status_code == 422
+
+
+def test_pipeline_results_are_published_and_fanned_out() -> None:
+    """A committed run is published once on Redis and copied to every SSE client queue."""
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(PIPELINE_CHANNEL)
+    cell = h3.latlng_to_cell(38.5, -97.0, 8)
+    version = publish_pipeline_result(date(2026, 2, 19), date(2026, 2, 20), [(h3.str_to_int(cell), date(2026, 2, 20))])
+
+    message = pubsub.get_message(timeout=5)
+    pubsub.close()
+    assert message is not None
+    payload = json.loads(message["data"])
+    assert payload["version"] == version
+    assert payload["dates"] == ["2026-02-19", "2026-02-20"]
+    assert payload["flagged_cells"] == [{"h3_index": cell, "time_bucket": "2026-02-20"}]
+
+    broadcaster = PipelineBroadcaster(queue_size=2)
+    clients: list[asyncio.Queue[bytes]] = [asyncio.Queue(maxsize=2), asyncio.Queue(maxsize=2)]
+    broadcaster._queues.update(clients)
+    for frame_id in range(3):
+        broadcaster.broadcast(sse_frame("pipeline", b"{}", event_id=frame_id))
+    # Full queues drop their oldest frame instead of blocking the fan-out.
+    assert [queue.get_nowait().split(b"\n")[0] for queue in clients] == [b"id: 1", b"id: 1"]
+
+
+def create_token_for_existing(client: TestClient, username: str) -> str:
+    """Request a fresh JWT for a user created by ``create_token``."""
+    response = client.post("/v1/auth/token", json={"username": username, "password": "secure-pass-123"})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_token_auth_uses_claims_and_honours_revocation(client: TestClient) -> None:
+    """Authenticated calls skip Postgres; denylisted and version-bumped tokens are rejected."""
+    fake_task = SimpleNamespace(id="task-auth-001")
+    analyst_token = create_token(client, username="analyst_4")
+    admin_token = create_token(client, username="admin_1", role="admin")
+    second_token = create_token_for_existing(client, "analyst_4")
+
+    def run_analytics(token: str) -> int:
+        with patch("backend.app.api.v1.endpoints.analytics.dispatch_run", return_value=fake_task):
+            return client.post("/v1/analytics/run", headers={"Authorization": f"Bearer {token}"}).status_code
+
+    with patch("backend.app.core.revocation.AsyncSessionLocal", side_effect=AssertionError("no DB on auth path")):
+        assert run_analytics(analyst_token) == 200
+
+    assert client.post("/v1/auth/revoke", headers={"Authorization": f"Bearer {analyst_token}"}).status_code == 204
+    assert run_analytics(analyst_token) == 401
+
+    revoke_all = client.post("/v1/auth/users/analyst_4/revoke", headers={"Authorization": f"Bearer {admin_token}"})
+    assert revoke_all.status_code == 204
+    assert run_analytics(second_token) == 401
+    assert run_analytics(create_token_for_existing(client, "analyst_4")) == 200
+
+
+def test_revocation_overrides_cached_active_verdicts(client: TestClient) -> None:
+    """Tokens already cached as active are rejected right after revocation, well inside the cache TTL."""
+    fake_task = SimpleNamespace(id="task-auth-002")
+    analyst_token = create_token(client, username="analyst_5")
+    admin_token = create_token(client, username="admin_2", role="admin")
+    second_token = create_token_for_existing(client, "analyst_5")
+
+    def run_analytics(token: str) -> int:
+        with patch("backend.app.api.v1.endpoints.analytics.dispatch_run", return_value=fake_task):
+            return client.post("/v1/analytics/run", headers={"Authorization": f"Bearer {token}"}).status_code
+
+    with patch.object(token_status_cache, "_ttl", 3600):
+        assert run_analytics(analyst_token) == 200
+        assert run_analytics(second_token) == 200
+
+        assert client.post("/v1/auth/revoke", headers={"Authorization": f"Bearer {analyst_token}"}).status_code == 204
+        assert run_analytics(analyst_token) == 401
+        assert run_analytics(second_token) == 200
+
+        revoke_all = client.post("/v1/auth/users/analyst_5/revoke", headers={"Authorization": f"Bearer {admin_token}"})
+        assert revoke_all.status_code == 204
+        assert run_analytics(second_token) == 401
+        assert run_analytics(admin_token) == 200
+
+
+def test_token_status_cache_revocations_from_threads_win_over_in_flight_checks() -> None:
+    """Evicting from a worker thread is safe while verdicts are stored, and a verdict read before it is not cached."""
+    cache = TokenStatusCache(3600)
+    cache.set("jti-cached", True, "analyst_6", cache.generation())
+    in_flight = cache.generation()
+
+    revoker = threading.Thread(target=cache.evict_user, args=("analyst_6",))
+    revoker.start()
+    revoker.join()
+    cache.set("jti-in-flight", True, "analyst_6", in_flight)
+    assert (cache.get("jti-cached"), cache.get("jti-in-flight")) == (None, None)
+
+    stop = threading.Event()
+
+    def revoke_repeatedly() -> None:
+        while not stop.is_set():
+            cache.evict_user("analyst_7")
+
+    revokers = [threading.Thread(target=revoke_repeatedly) for _ in range(2)]
+    for thread in revokers:
+        thread.start()
+    try:
+        for index in range(20_000):
+            cache.set(f"jti-{index}", True, "analyst_7", cache.generation())
+    finally:
+        stop.set()
+        for thread in revokers:
+            thread.join()
+    cache.evict_user("analyst_7")
+    assert cache.get("jti-19999") is None
@@ -0,0 +1,38 @@
+"""Query-plan regression tests for the hot read and analytics paths."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+
+import pytest
+
+from backend.app.db.session import SessionLocal
+from backend.benchmarks.query_plans import (
+    HOT_QUERIES,
+    HotQuery,
+    check_plan,
+    chunk_owners,
+    explain,
+    load_reference_dataset,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_database() -> Generator[None, None, None]:
+    """Share one reference dataset across the module instead of truncating per test."""
+    yield
+
+
+@pytest.fixture(scope="module")
+def chunk_map() -> Generator[dict[str, str], None, None]:
+    """Load the reference dataset once and map its chunks to their hypertables."""
+    with SessionLocal() as db:
+        load_reference_dataset(db)
+        yield chunk_owners(db)
+
+
+@pytest.mark.parametrize("hot_query", HOT_QUERIES, ids=lambda hot_query: hot_query.name)
+def test_hot_query_plan_keeps_expected_shape(hot_query: HotQuery, chunk_map: dict[str, str]) -> None:
+    with SessionLocal() as db:
+        summary = explain(db, hot_query, chunk_map)
+    assert check_plan(hot_query, summary) == []
@@ -0,0 +1,134 @@
+"""Integration tests for offline tile archive export and archive-backed tile serving."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.app.db.session import SessionLocal
+from backend.app.services.tile_archive import TileArchiveStore, archive_path, open_tile_archive
+from backend.app.services.tiles import render_risk_tile
+from backend.app.utils.export_tile_archive import bake_tile_archive
+
+
+def seed_scored_cell(bucket_date: date) -> None:
+    """Insert one scored cell and refresh the tile read model."""
+    with SessionLocal() as db:
+        db.execute(
+            text(
+                """
+                INSERT INTO h3_cells (h3_index, resolution, geom)
+                VALUES (
+                    613173446228049919,
+                    8,
+                    ST_GeomFromText('POLYGON((-97.2 38.2, -97.2 38.8, -96.8 38.8, -96.8 38.2, -97.2 38.2))', 4326)
+                )
+                """
+            )
+        )
+        db.execute(
+            text(
+                """
+                INSERT INTO cell_aggregates (h3_index, time_bucket, event_count, rolling_7d_avg, growth_rate)
+                VALUES (613173446228049919, :bucket_date, 10, 7.5, 0.33)
+                """
+            ),
+            {"bucket_date": bucket_date},
+        )
+        db.execute(
+            text(
+                """
+                INSERT INTO risk_scores (h3_index, time_bucket, risk_score, risk_level)
+                VALUES (613173446228049919, :bucket_date, 82.0, 'critical'::risk_level)
+                """
+            ),
+            {"bucket_date": bucket_date},
+        )
+        db.execute(text("REFRESH MATERIALIZED VIEW mv_daily_risk"))
+        db.commit()
+
+
+@pytest.mark.parametrize("archive_format", ["pmtiles", "mbtiles"])
+def test_baked_archive_matches_database_tiles(client: TestClient, tmp_path: Path, archive_format: str) -> None:
+    """Archive tiles are byte-identical to ST_AsMVT output and served without the DB path."""
+    bucket_date = date(2026, 2, 20)
+    seed_scored_cell(bucket_date)
+    output_path = archive_path(tmp_path, bucket_date, archive_format)
+
+    with SessionLocal() as db:
+        written = bake_tile_archive(db, bucket_date, output_path, min_zoom=0, max_zoom=6)
+        expected = render_risk_tile(db, 0, 0, 0, risk_date=bucket_date)
+    assert written >= 7
+
+    archive = open_tile_archive(output_path)
+    tile = archive.get_tile(0, 0, 0)
+    assert tile is not None and bytes(tile) == expected
+    assert archive.get_tile(6, 0, 0) is None
+
+    with (
+        patch("backend.app.api.v1.endpoints.tiles.tile_archives", TileArchiveStore(tmp_path)),
+        patch("backend.app.api.v1.endpoints.tiles.render_risk_tile_async") as render,
+    ):
+        response = client.get("/v1/tiles/0/0/0.mvt", params={"risk_date": bucket_date.isoformat()})
+    render.assert_not_called()
+    assert response.status_code == 200
+    assert response.content == expected
+
+
+@pytest.mark.parametrize("archive_format", ["pmtiles", "mbtiles"])
+def test_republished_archive_replaces_and_closes_the_old_handle(tmp_path: Path, archive_format: str) -> None:
+    """A rebaked date is served from the new file and the replaced archive is closed."""
+    bucket_date = date(2026, 2, 21)
+    seed_scored_cell(bucket_date)
+    output_path = archive_path(tmp_path, bucket_date, archive_format)
+    store = TileArchiveStore(tmp_path)
+    with SessionLocal() as db:
+        bake_tile_archive(db, bucket_date, output_path, min_zoom=0, max_zoom=2)
+        old = store.get(bucket_date)
+        assert old is not None and store.get(bucket_date) is old
+        bake_tile_archive(db, bucket_date, output_path, min_zoom=0, max_zoom=3)
+
+    new = store.get(bucket_date)
+    assert new is not None and new is not old and new.max_zoom == 3
+    with pytest.raises((ValueError, sqlite3.ProgrammingError)):
+        old.get_tile(0, 0, 0)
+    store.close()
+    with pytest.raises((ValueError, sqlite3.ProgrammingError)):
+        new.get_tile(0, 0, 0)
+
+
+@pytest.mark.parametrize("archive_format", ["pmtiles", "mbtiles"])
+def test_archive_republished_during_a_read_stays_open_until_the_read_ends(tmp_path: Path, archive_format: str) -> None:
+    """A read pins its archive, so a rebake landing mid-read retires it without closing it under the reader."""
+    bucket_date = date(2026, 2, 22)
+    seed_scored_cell(bucket_date)
+    output_path = archive_path(tmp_path, bucket_date, archive_format)
+    store = TileArchiveStore(tmp_path)
+    with SessionLocal() as db:
+        bake_tile_archive(db, bucket_date, output_path, min_zoom=0, max_zoom=2)
+        expected = render_risk_tile(db, 0, 0, 0, risk_date=bucket_date)
+        old = store.get(bucket_date)
+        assert old is not None
+        read_old_tile = old.get_tile
+
+        def republish_mid_read(z: int, x: int, y: int) -> bytes | memoryview | None:
+            bake_tile_archive(db, bucket_date, output_path, min_zoom=0, max_zoom=3)
+            assert store.get(bucket_date) is not old
+            return read_old_tile(z, x, y)
+
+        with patch.object(old, "get_tile", side_effect=republish_mid_read):
+            tile = store.read_tile(bucket_date, 0, 0, 0)
+    assert tile is not None and bytes(tile) == expected
+    assert store.read_tile(bucket_date, 3, 0, 0) == b""
+    assert store.read_tile(bucket_date, 4, 0, 0) is None
+
+    del tile
+    store.read_tile(bucket_date, 0, 0, 0)
+    with pytest.raises((ValueError, sqlite3.ProgrammingError)):
+        read_old_tile(0, 0, 0)
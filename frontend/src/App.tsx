@@ -1,8 +1,9 @@
 // Loading state handled by MapLibre tile fetch
 import React, { useEffect } from "react";
 
+import { subscribePipelineResults } from "./api/client";
 import { RiskMap } from "./components/RiskMap";
-import { useTimelineStore, type RiskLevel } from "./store/timelineStore";
+import { TIMELINE_WINDOW_DAYS, addDays, useTimelineStore, type RiskLevel } from "./store/timelineStore";
 
 const riskLevels: RiskLevel[] = ["low", "medium", "high", "critical"];
 
@@ -13,8 +14,27 @@ function advanceDate(date: string): string {
 }
 
 export default function App(): React.JSX.Element {
-  const { selectedDate, isPlaying, riskLevels: enabledLevels, setSelectedDate, togglePlayback, toggleRiskLevel } =
-    useTimelineStore();
+  const {
+    selectedDate,
+    windowStart,
+    isPlaying,
+    riskLevels: enabledLevels,
+    dataVersion,
+    setSelectedDate,
+    togglePlayback,
+    toggleRiskLevel,
+    setDataVersion
+  } = useTimelineStore();
+
+  // Pipeline runs are pushed by the API; tiles reload only when a run touched the visible window.
+  useEffect(() => {
+    const windowEnd = addDays(windowStart, TIMELINE_WINDOW_DAYS - 1);
+    return subscribePipelineResults((result) => {
+      if (result.dates.some((date) => date >= windowStart && date <= windowEnd)) {
+        setDataVersion(result.version);
+      }
+    });
+  }, [windowStart, setDataVersion]);
 
   useEffect(() => {
     if (!isPlaying) {
@@ -56,7 +76,7 @@ export default function App(): React.JSX.Element {
       </aside>
 
       <main className="map-panel">
-        <RiskMap selectedDate={selectedDate} riskLevels={enabledLevels} />
+        <RiskMap selectedDate={selectedDate} windowStart={windowStart} riskLevels={enabledLevels} dataVersion={dataVersion} />
       </main>
     </div>
   );
@@ -26,3 +26,26 @@ export function tileUrl(date: string, riskLevels: string[]): string {
   });
   return `${API_BASE}/tiles/{z}/{x}/{y}.mvt?${query.toString()}`;
 }
+
+export function seriesTileUrl(startDate: string, endDate: string, riskLevels: string[], dataVersion = 0): string {
+  const query = new URLSearchParams({
+    start_date: startDate,
+    end_date: endDate,
+    risk_level: riskLevels.join(","),
+    v: String(dataVersion)
+  });
+  return `${API_BASE}/tiles/series/{z}/{x}/{y}.mvt?${query.toString()}`;
+}
+
+export interface PipelineResult {
+  version: number;
+  dates: string[];
+  flagged_count: number;
+  flagged_cells: { h3_index: string; time_bucket: string }[];
+}
+
+export function subscribePipelineResults(onResult: (result: PipelineResult) => void): () => void {
+  const source = new EventSource(`${API_BASE}/stream/pipeline`);
+  source.addEventListener("pipeline", (event) => onResult(JSON.parse((event as MessageEvent).data) as PipelineResult));
+  return () => source.close();
+}
@@ -1,18 +1,74 @@
 import React, { useEffect, useMemo, useRef } from "react";
-import maplibregl, { Map } from "maplibre-gl";
+import maplibregl, { Map, type ExpressionSpecification } from "maplibre-gl";
 import "maplibre-gl/dist/maplibre-gl.css";
 
-import { tileUrl } from "../api/client";
+import { seriesTileUrl } from "../api/client";
+import { addDays, dayOffset, TIMELINE_WINDOW_DAYS } from "../store/timelineStore";
 
 interface RiskMapProps {
   selectedDate: string;
+  windowStart: string;
   riskLevels: string[];
+  dataVersion: number;
 }
 
-export function RiskMap({ selectedDate, riskLevels }: RiskMapProps): React.JSX.Element {
+// Series tiles carry one char per day in `levels` (l/m/h/c, '-' when absent).
+function levelAt(dayIndex: number): ExpressionSpecification {
+  return ["slice", ["get", "levels"], dayIndex, dayIndex + 1];
+}
+
+function fillColor(dayIndex: number): ExpressionSpecification {
+  return ["match", levelAt(dayIndex), "l", "#2E7D32", "m", "#F9A825", "h", "#EF6C00", "#B71C1C"];
+}
+
+function dayFilter(dayIndex: number): ExpressionSpecification {
+  return ["!=", levelAt(dayIndex), "-"];
+}
+
+function addRiskLayers(map: Map, tileSourceUrl: string, dayIndex: number): void {
+  map.addSource("risk_source", {
+    type: "vector",
+    tiles: [tileSourceUrl],
+    minzoom: 0,
+    maxzoom: 14
+  });
+  map.addLayer({
+    id: "risk-fill",
+    type: "fill",
+    source: "risk_source",
+    "source-layer": "risk_series",
+    filter: dayFilter(dayIndex),
+    paint: {
+      "fill-color": fillColor(dayIndex),
+      "fill-opacity": 0.6
+    }
+  });
+  map.addLayer({
+    id: "risk-outline",
+    type: "line",
+    source: "risk_source",
+    "source-layer": "risk_series",
+    filter: dayFilter(dayIndex),
+    paint: {
+      "line-color": "#0b1220",
+      "line-width": 0.8
+    }
+  });
+}
+
+export function RiskMap({ selectedDate, windowStart, riskLevels, dataVersion }: RiskMapProps): React.JSX.Element {
   const mapRef = useRef<Map | null>(null);
   const containerRef = useRef<HTMLDivElement | null>(null);
-  const tileSourceUrl = useMemo(() => tileUrl(selectedDate, riskLevels), [riskLevels, selectedDate]);
+  const dayIndexRef = useRef(0);
+  const tileSourceUrlRef = useRef("");
+  const windowEnd = addDays(windowStart, TIMELINE_WINDOW_DAYS - 1);
+  const dayIndex = dayOffset(windowStart, selectedDate);
+  const tileSourceUrl = useMemo(
+    () => seriesTileUrl(windowStart, windowEnd, riskLevels, dataVersion),
+    [dataVersion, riskLevels, windowEnd, windowStart]
+  );
+  dayIndexRef.current = dayIndex;
+  tileSourceUrlRef.current = tileSourceUrl;
 
   useEffect(() => {
     if (!containerRef.current || mapRef.current) {
@@ -40,42 +96,7 @@ export function RiskMap({ selectedDate, riskLevels }: RiskMapProps): React.JSX.E
     });
 
     map.on("load", () => {
-      map.addSource("risk_source", {
-        type: "vector",
-        tiles: [tileSourceUrl],
-        minzoom: 0,
-        maxzoom: 14
-      });
-      map.addLayer({
-        id: "risk-fill",
-        type: "fill",
-        source: "risk_source",
-        "source-layer": "risk",
-        paint: {
-          "fill-color": [
-            "match",
-            ["get", "risk_level"],
-            "low",
-            "#2E7D32",
-            "medium",
-            "#F9A825",
-            "high",
-            "#EF6C00",
-            "#B71C1C"
-          ],
-          "fill-opacity": 0.6
-        }
-      });
-      map.addLayer({
-        id: "risk-outline",
-        type: "line",
-        source: "risk_source",
-        "source-layer": "risk",
-        paint: {
-          "line-color": "#0b1220",
-          "line-width": 0.8
-        }
-      });
+      addRiskLayers(map, tileSourceUrlRef.current, dayIndexRef.current);
 
       map.on("click", "risk-fill", (event) => {
         const feature = event.features?.[0];
@@ -84,13 +105,15 @@ export function RiskMap({ selectedDate, riskLevels }: RiskMapProps): React.JSX.E
         }
         const coordinates = event.lngLat;
         const properties = feature.properties ?? {};
+        const index = dayIndexRef.current;
+        const score = String(properties.scores ?? "").split(",")[index] ?? "";
+        const flagged = String(properties.flagged ?? "").charAt(index) === "1";
         const popupHtml = `
           <strong>Risk Cell</strong><br/>
           <small>H3: ${properties.h3_index ?? "n/a"}</small><br/>
-          Event Count: ${properties.event_count ?? "n/a"}<br/>
-          Growth Rate: ${Number(properties.growth_rate ?? 0).toFixed(2)}<br/>
-          Risk Score: ${Number(properties.risk_score ?? 0).toFixed(2)}<br/>
-          Anomaly: ${properties.flagged === true || properties.flagged === "true" ? "Yes" : "No"}
+          Risk Score: ${score === "" ? "n/a" : Number(score).toFixed(2)}<br/>
+          Peak Score (window): ${Number(properties.max_score ?? 0).toFixed(2)}<br/>
+          Anomaly: ${flagged ? "Yes" : "No"}
         `;
         new maplibregl.Popup().setLngLat(coordinates).setHTML(popupHtml).addTo(map);
       });
@@ -101,58 +124,29 @@ export function RiskMap({ selectedDate, riskLevels }: RiskMapProps): React.JSX.E
       map.remove();
       mapRef.current = null;
     };
-  }, [tileSourceUrl]);
+    // The map is created once; source and day changes are applied by the effects below.
+  }, []);
 
   useEffect(() => {
     const map = mapRef.current;
-    if (!map || !map.isStyleLoaded()) {
-      return;
-    }
-
-    const source = map.getSource("risk_source");
-    if (!source) {
+    if (!map || !map.isStyleLoaded() || !map.getSource("risk_source")) {
       return;
     }
     map.removeLayer("risk-fill");
     map.removeLayer("risk-outline");
     map.removeSource("risk_source");
-    map.addSource("risk_source", {
-      type: "vector",
-      tiles: [tileSourceUrl],
-      minzoom: 0,
-      maxzoom: 14
-    });
-    map.addLayer({
-      id: "risk-fill",
-      type: "fill",
-      source: "risk_source",
-      "source-layer": "risk",
-      paint: {
-        "fill-color": [
-          "match",
-          ["get", "risk_level"],
-          "low",
-          "#2E7D32",
-          "medium",
-          "#F9A825",
-          "high",
-          "#EF6C00",
-          "#B71C1C"
-        ],
-        "fill-opacity": 0.6
-      }
-    });
-    map.addLayer({
-      id: "risk-outline",
-      type: "line",
-      source: "risk_source",
-      "source-layer": "risk",
-      paint: {
-        "line-color": "#0b1220",
-        "line-width": 0.8
-      }
-    });
+    addRiskLayers(map, tileSourceUrl, dayIndexRef.current);
   }, [tileSourceUrl]);
 
+  useEffect(() => {
+    const map = mapRef.current;
+    if (!map || !map.getLayer("risk-fill")) {
+      return;
+    }
+    map.setFilter("risk-fill", dayFilter(dayIndex));
+    map.setFilter("risk-outline", dayFilter(dayIndex));
+    map.setPaintProperty("risk-fill", "fill-color", fillColor(dayIndex));
+  }, [dayIndex]);
+
   return <div className="map-container" ref={containerRef} />;
 }
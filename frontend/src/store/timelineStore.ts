@@ -2,27 +2,56 @@ import { create } from "zustand";
 
 export type RiskLevel = "low" | "medium" | "high" | "critical";
 
+export const TIMELINE_WINDOW_DAYS = 30;
+
 interface TimelineState {
   selectedDate: string;
+  windowStart: string;
   isPlaying: boolean;
   riskLevels: RiskLevel[];
+  dataVersion: number;
   setSelectedDate: (date: string) => void;
   togglePlayback: () => void;
   toggleRiskLevel: (level: RiskLevel) => void;
+  setDataVersion: (version: number) => void;
 }
 
 const today = new Date().toISOString().slice(0, 10);
 
+export function addDays(date: string, days: number): string {
+  const current = new Date(`${date}T00:00:00Z`);
+  current.setUTCDate(current.getUTCDate() + days);
+  return current.toISOString().slice(0, 10);
+}
+
+export function dayOffset(from: string, to: string): number {
+  return Math.round((Date.parse(`${to}T00:00:00Z`) - Date.parse(`${from}T00:00:00Z`)) / 86_400_000);
+}
+
+// The series tile window only moves when the selected date leaves it, so
+// timeline playback inside the window is restyled locally without new tiles.
+function windowFor(selectedDate: string, windowStart: string): string {
+  const offset = dayOffset(windowStart, selectedDate);
+  if (offset >= 0 && offset < TIMELINE_WINDOW_DAYS) {
+    return windowStart;
+  }
+  return offset < 0 ? addDays(selectedDate, 1 - TIMELINE_WINDOW_DAYS) : selectedDate;
+}
+
 export const useTimelineStore = create<TimelineState>((set) => ({
   selectedDate: today,
+  windowStart: addDays(today, 1 - TIMELINE_WINDOW_DAYS),
   isPlaying: false,
   riskLevels: ["low", "medium", "high", "critical"],
-  setSelectedDate: (selectedDate) => set({ selectedDate }),
+  dataVersion: 0,
+  setSelectedDate: (selectedDate) =>
+    set((state) => ({ selectedDate, windowStart: windowFor(selectedDate, state.windowStart) })),
   togglePlayback: () => set((state) => ({ isPlaying: !state.isPlaying })),
   toggleRiskLevel: (level) =>
     set((state) => ({
       riskLevels: state.riskLevels.includes(level)
         ? state.riskLevels.filter((entry) => entry !== level)
         : [...state.riskLevels, level]
-    }))
+    })),
+  setDataVersion: (dataVersion) => set({ dataVersion })
 }));